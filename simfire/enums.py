@@ -221,6 +221,48 @@ FuelModelRGB13 = {
     32767: [1.0, 1.0, 1.0],
 }
 
+# Default mapping from MapBiomas (Collection 8) land cover classes to the FBFM13 fuel
+# model codes above, for use with `RasterFuelLayer`. Savanna (Cerrado) formations are
+# mapped to grass/timber understory, and crops to non-burnable agriculture.
+MapBiomasToFuelModel = {
+    0: -9999,  # No data
+    3: 8,  # Forest Formation
+    4: 2,  # Savanna Formation
+    5: 8,  # Mangrove
+    6: 8,  # Floodable Forest
+    9: 9,  # Forest Plantation
+    11: 3,  # Wetland
+    12: 1,  # Grassland
+    13: 2,  # Other non Forest Formations
+    15: 1,  # Pasture
+    18: 93,  # Agriculture
+    19: 93,  # Temporary Crop
+    20: 93,  # Sugar cane
+    21: 1,  # Mosaic of Uses
+    22: 99,  # Non vegetated area
+    23: 99,  # Beach, Dune and Sand Spot
+    24: 91,  # Urban Area
+    25: 99,  # Other non Vegetated Areas
+    26: 98,  # Water
+    27: -9999,  # Not Observed
+    29: 99,  # Rocky Outcrop
+    30: 99,  # Mining
+    31: 98,  # Aquaculture
+    32: 99,  # Hypersaline Tidal Flat
+    33: 98,  # River, Lake and Ocean
+    35: 93,  # Palm Oil
+    36: 93,  # Perennial Crop
+    39: 93,  # Soybean
+    40: 93,  # Rice
+    41: 93,  # Other Temporary Crops
+    46: 93,  # Coffee
+    47: 93,  # Citrus
+    48: 93,  # Other Perennial Crops
+    49: 6,  # Wooded Sandbank Vegetation
+    50: 1,  # Herbaceous Sandbank Vegetation
+    62: 93,  # Cotton
+}
+
 # PERIMETERS
 # Create a list of length 256 with repeating/cycled colors
 # 0 maps to black, every other index maps to a color
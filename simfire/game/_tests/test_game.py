@@ -2,6 +2,7 @@ import os
 import unittest
 from multiprocessing import get_context
 
+import numpy as np
 from PIL import Image
 
 from ...enums import GameStatus
@@ -125,6 +126,42 @@ class TestGame(unittest.TestCase):
             f"{rgb} when {returned_rgb} was returned",
         )
 
+    def test__get_wind_direction_colors(self) -> None:
+        """
+        Test that the colors of an array of directions are interpolated within each
+        segment, and that directions outside of 0-360 are white
+        """
+        directions = np.array([[0.0, 45.0, 90.0], [315.0, 360.0, -1.0]])
+        colors = self.game._get_wind_direction_colors(directions)
+        self.assertEqual(colors.dtype, np.uint8)
+        expected = [
+            [(255, 0, 0), (191, 127, 0), (128, 255, 0)],
+            [(191, 0, 127), (255, 0, 255), (255, 255, 255)],
+        ]
+        np.testing.assert_array_equal(colors, expected)
+
+    def test_wind_surf_cache(self) -> None:
+        """
+        Test that the wind overlay pixels match the wind maps, and that the surfaces
+        are only re-computed when the wind maps change
+        """
+        height, width = self.screen_size
+        magnitudes = np.tile(np.linspace(0, 10, width), (height, 1))
+        surface = self.game._get_wind_mag_surf(magnitudes)
+        self.assertEqual(tuple(surface.get_at((0, 0)))[:3], (0, 0, 0))
+        self.assertEqual(tuple(surface.get_at((width - 1, 0)))[:3], (0, 255, 0))
+        self.assertIs(self.game._get_wind_mag_surf(magnitudes.copy()), surface)
+        magnitudes[0, 0] = 5
+        self.assertIsNot(self.game._get_wind_mag_surf(magnitudes), surface)
+
+        directions = np.full(self.screen_size, 180.0)
+        directions[0, 1] = 90.0
+        surface = self.game._get_wind_dir_surf(directions)
+        self.assertEqual(tuple(surface.get_at((0, 0)))[:3], (0, 255, 255))
+        self.assertEqual(tuple(surface.get_at((1, 0)))[:3], (128, 255, 0))
+        self.assertIs(self.game._get_wind_dir_surf(directions), surface)
+        self.assertIsNot(self.game._get_wind_dir_surf(directions + 1), surface)
+
     def test__get_wind_mag_surf(self) -> None:
         """
         Test getting the wind magnitude PyGame surface
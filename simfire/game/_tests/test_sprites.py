@@ -5,7 +5,14 @@ import pygame
 
 from ...enums import BURNED_RGB_COLOR, BurnStatus, SpriteLayer
 from ...utils.config import Config
-from ..sprites import Fire, FireLine, ScratchLine, Terrain, WetLine
+from ..sprites import (
+    Fire,
+    FireLine,
+    ScratchLine,
+    Terrain,
+    WetLine,
+    _terrain_image_cache,
+)
 from . import DummyFuelLayer, DummyTopographyLayer
 
 
@@ -73,6 +80,46 @@ class TestTerrain(unittest.TestCase):
             ),
         )
 
+    def test_image_size_and_cache(self) -> None:
+        """
+        Test that the terrain image has exactly the screen size and that re-creating
+        the same terrain uses the cached image.
+        """
+        screen_size = (24, 40)
+        fuel_layer = DummyFuelLayer(screen_size)
+        topo_layer = DummyTopographyLayer(screen_size)
+        topo_layer.data = np.random.rand(*topo_layer.shape)
+        terrain = Terrain(fuel_layer, topo_layer, screen_size, headless=True)
+
+        image = terrain._make_terrain_image()
+        self.assertTupleEqual(image.shape, screen_size + (3,))
+
+        key = terrain._terrain_image_key(
+            fuel_layer.image.astype(np.uint8), topo_layer.data.squeeze()
+        )
+        self.assertIn(key, _terrain_image_cache)
+        np.testing.assert_array_equal(
+            terrain._make_terrain_image(),
+            image,
+            err_msg="The cached terrain image should match the rendered one",
+        )
+
+    def test_image_fuel_transparent(self) -> None:
+        """
+        Test that the fuel image is not visible in the terrain image, which only shows
+        the contour lines on white.
+        """
+        screen_size = (24, 40)
+        topo_layer = DummyTopographyLayer(screen_size)
+        topo_layer.data = np.random.rand(*topo_layer.shape)
+        images = []
+        for color in (0, 255):
+            fuel_layer = DummyFuelLayer(screen_size)
+            fuel_layer.image = np.full(screen_size + (3,), color)
+            terrain = Terrain(fuel_layer, topo_layer, screen_size, headless=True)
+            images.append(terrain._make_terrain_image())
+        np.testing.assert_array_equal(images[0], images[1])
+
     def test_update(self) -> None:
         """
         Test that the terrain updates the correct pixels/tiles to burned.
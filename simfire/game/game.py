@@ -1,4 +1,3 @@
-import math
 import pathlib
 from importlib import resources
 from typing import List, Optional, Sequence, Tuple, Union
@@ -16,6 +15,19 @@ from .sprites import Agent, Fire, FireLine, ScratchLine, Terrain, WetLine
 log = create_logger(__name__)
 
 
+# The (R, G, B) colors at the start and end of each 90 degree segment of wind
+# directions, clockwise from North
+WIND_DIRECTION_COLORS = np.array(
+    [
+        [(255, 0, 0), (128, 255, 0)],  # North to East, Red to Green
+        [(128, 255, 0), (0, 255, 255)],  # East to South, Green to Teal
+        [(0, 255, 255), (128, 0, 255)],  # South to West, Teal to Purple
+        [(128, 0, 0), (255, 0, 255)],  # West to North, Purple to Red
+    ],
+    dtype=np.float64,
+)
+
+
 class Game:
     """
     Class that controls the game. This class will initalize the game and allow for
@@ -64,6 +76,10 @@ class Game:
         # Map to track which pixels are on fire or have burned
         self.fire_map = np.full(screen_size, BurnStatus.UNBURNED)
 
+        # The last wind maps that were rendered and their overlay surfaces
+        self._wind_mag_cache: Optional[Tuple[np.ndarray, pygame.Surface]] = None
+        self._wind_dir_cache: Optional[Tuple[np.ndarray, pygame.Surface]] = None
+
         self.background: Optional[pygame.surface.Surface] = None
         if not self.headless:
             pygame.init()
@@ -133,107 +149,46 @@ class Game:
         """
         Get the color and intensity representing direction based on wind direction.
 
-        0/360: Black, 90: Red, 180: White, Blue: 270
-
-        Returns tuple of RGBa where a is alpha channel or transparency of the color
+        0/360: Red, 90: Green, 180: Teal, 270: Purple
 
         Arguments:
             direction: Float value of the angle 0-360.
-            ws_min: Minimum wind speed.
-            ws_max: Maximum wind speed.
+
+        Returns:
+            The (R, G, B) color of the direction
         """
-        north_min = 0.0
-        north_max = 360.0
-        east = 90.0
-        south = 180.0
-        west = 270.0
-
-        colorRGB = (255.0, 255.0, 255.0)  # Default white
-
-        # North to East, Red to Green
-        if direction >= north_min and direction < east:
-            angleRange = east - north_min
-
-            # Red
-            redMin = 255.0
-            redMax = 128.0
-            redRange = redMax - redMin  # 255 - 128 red range from north to east
-            red = (((direction - north_min) * redRange) / angleRange) + redMin
-
-            # Green
-            greenMin = 0.0
-            greenMax = 255.0
-            greenRange = greenMax - greenMin  # 0 - 255 red range from north to east
-            green = (((direction - north_min) * greenRange) / angleRange) + greenMin
-
-            colorRGB = (red, green, 0.0)
-
-        # East to South, Green to Teal
-        if direction >= east and direction < south:
-            angleRange = south - east
-
-            # Red
-            redMin = 128.0
-            redMax = 0.0
-            redRange = redMax - redMin  # 128 - 0 red range from east to south
-            red = (((direction - east) * redRange) / angleRange) + redMin
-
-            # Blue
-            blueMin = 0
-            blueMax = 255
-            blueRange = blueMax - blueMin  # 0 - 255 blue range from east to south
-            blue = (((direction - east) * blueRange) / angleRange) + blueMin
-
-            colorRGB = (red, 255, blue)
-
-        # South to West, Teal to Purple
-        if direction >= south and direction < west:
-            angleRange = west - south
-
-            # Red
-            redMin = 0
-            redMax = 128
-            redRange = redMax - redMin  # 0 - 128 red range from south to west
-            red = (((direction - south) * redRange) / angleRange) + redMin
-
-            # Green
-            greenMin = 255
-            greenMax = 0
-            greenRange = greenMax - greenMin  # 0 - 255 green range from south to west
-            green = (((direction - south) * greenRange) / angleRange) + greenMin
-
-            colorRGB = (red, green, 255)
-
-        # West to North, Purple to Red
-        if direction <= north_max and direction >= west:
-            angleRange = north_max - west
-
-            # Red
-            redMin = 128.0
-            redMax = 255.0
-            redRange = redMax - redMin  # 128 - 255 red range from east to south
-            red = (((direction - west) * redRange) / angleRange) + redMin
-
-            # Blue
-            blueMin = 0
-            blueMax = 255
-            blueRange = blueMax - blueMin  # 0 - 255 blue range from east to south
-            blue = (((direction - west) * blueRange) / angleRange) + blueMin
-
-            colorRGB = (red, 0, blue)
-
-        floorColorRGB = (
-            int(math.floor(colorRGB[0])),
-            int(math.floor(colorRGB[1])),
-            int(math.floor(colorRGB[2])),
-        )
-        return floorColorRGB
+        red, green, blue = self._get_wind_direction_colors(np.array([direction]))[0]
+        return int(red), int(green), int(blue)
+
+    def _get_wind_direction_colors(self, directions: np.ndarray) -> np.ndarray:
+        """
+        Get the colors representing an array of wind directions. The colors are
+        interpolated linearly between the start and end colors of the 90 degree
+        segment each direction is in. Directions outside of 0-360 are white.
+
+        Arguments:
+            directions: The wind directions in degrees
+
+        Returns:
+            A uint8 array of (R, G, B) colors with a trailing dimension of 3
+        """
+        directions = np.asarray(directions, dtype=np.float64)
+        valid = (directions >= 0) & (directions <= 360)
+        # A direction of 360 is the end of the West to North segment
+        segment = np.minimum(np.where(valid, directions, 0) // 90, 3).astype(np.intp)
+        start_color = WIND_DIRECTION_COLORS[segment, 0]
+        end_color = WIND_DIRECTION_COLORS[segment, 1]
+        offset = (directions - segment * 90.0)[..., None]
+        colors = (offset * (end_color - start_color)) / 90.0 + start_color
+        colors = np.where(valid[..., None], np.floor(colors), 255)
+        return colors.astype(np.uint8)
 
     def _get_wind_mag_surf(
         self, wind_magnitude_map: Union[Sequence[Sequence[float]], np.ndarray]
     ) -> pygame.surface.Surface:
         """
-        Compute the wind magnitude surface for display.
+        Compute the wind magnitude surface for display. The surface is cached and
+        re-used until the wind magnitudes change.
 
         Arguments:
             wind_magnitude_map: The map/array containing wind magnitudes at each pixel
@@ -242,28 +197,35 @@ class Game:
         Returns:
             The PyGame Surface for the wind magnitude
         """
+        wind_magnitude_map = np.asarray(wind_magnitude_map, dtype=np.float64)
+        if self._wind_mag_cache is not None and np.array_equal(
+            self._wind_mag_cache[0], wind_magnitude_map
+        ):
+            return self._wind_mag_cache[1]
+
         w_max = np.amax(wind_magnitude_map)
         w_min = np.amin(wind_magnitude_map)
         wind_speed_range = w_max - w_min
+        # Green, with the intensity scaled by the range of wind magnitudes
+        color_arr = np.zeros(wind_magnitude_map.shape + (3,), dtype=np.uint8)
         # Constant value wind at all locations. Set everything to middle value
         if wind_speed_range == 0:
-            color_arr = np.full(self.screen.get_size(), 127, dtype=np.uint8)
-            wind_mag_surf = pygame.surfarray.make_surface(color_arr.swapaxes(0, 1))
+            color_arr[..., 1] = 127
         else:
-            wind_mag_surf = pygame.Surface(self.screen.get_size())
-            for y_idx, y in enumerate(wind_magnitude_map):
-                for x_idx, x in enumerate(y):
-                    w_mag = x
-                    gradient = 255 - 0
-                    color_mag = int(((w_mag - w_min) * gradient) / (wind_speed_range) + 0)
-                    wind_mag_surf.set_at((x_idx, y_idx), pygame.Color(0, color_mag, 0))
+            gradient = 255 - 0
+            color_arr[..., 1] = ((wind_magnitude_map - w_min) * gradient) / (
+                wind_speed_range
+            )
+        wind_mag_surf = self._make_wind_surf(color_arr)
+        self._wind_mag_cache = (wind_magnitude_map.copy(), wind_mag_surf)
         return wind_mag_surf
 
     def _get_wind_dir_surf(
         self, wind_direction_map: Union[Sequence[Sequence[float]], np.ndarray]
     ) -> pygame.Surface:
         """
-        Compute the wind direction surface for display.
+        Compute the wind direction surface for display. The surface is cached and
+        re-used until the wind directions change.
 
         Arguments:
             wind_direction_map: The map/array containing wind directions at each pixel
@@ -272,16 +234,33 @@ class Game:
         Returns:
             The PyGame Surface for the wind direction
         """
-        wind_dir_surf = pygame.Surface(self.screen.get_size())
-        for y_idx, y in enumerate(wind_direction_map):
-            for x_idx, x in enumerate(y):
-                w_dir = x
-                color = self._get_wind_direction_color(w_dir)
-                pyColor = pygame.Color(color[0], color[1], color[2], a=191)
-                wind_dir_surf.set_at((x_idx, y_idx), pyColor)
-
+        wind_direction_map = np.asarray(wind_direction_map, dtype=np.float64)
+        if self._wind_dir_cache is not None and np.array_equal(
+            self._wind_dir_cache[0], wind_direction_map
+        ):
+            return self._wind_dir_cache[1]
+
+        color_arr = self._get_wind_direction_colors(wind_direction_map)
+        wind_dir_surf = self._make_wind_surf(color_arr)
+        self._wind_dir_cache = (wind_direction_map.copy(), wind_dir_surf)
         return wind_dir_surf
 
+    def _make_wind_surf(self, color_arr: np.ndarray) -> pygame.Surface:
+        """
+        Create a wind overlay surface the size of the screen from an array of colors.
+
+        Arguments:
+            color_arr: The (height, width, 3) array of (R, G, B) colors
+
+        Returns:
+            The PyGame Surface with the colors
+        """
+        width, height = self.screen.get_size()
+        # A single wind value is used everywhere on the screen
+        color_arr = np.broadcast_to(color_arr, (height, width, 3))
+        # PyGame arrays are indexed as (x, y)
+        return pygame.surfarray.make_surface(color_arr.swapaxes(0, 1))
+
     def quit(self) -> None:
         """
         Close the PyGame window and stop the `Game`
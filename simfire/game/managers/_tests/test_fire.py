@@ -1,4 +1,6 @@
+import tempfile
 import unittest
+from pathlib import Path
 
 import numpy as np
 
@@ -6,7 +8,13 @@ from ....enums import BurnStatus, GameStatus
 from ....game._tests import DummyFuelLayer, DummyTopographyLayer
 from ....game.managers.mitigation import FireLineManager
 from ....utils.config import Config
-from ....world.parameters import Environment, FuelParticle
+from ....world.parameters import (
+    CoarseWindGrid,
+    Environment,
+    FuelParticle,
+    WindSchedule,
+    WindStream,
+)
 from ...sprites import Fire, Terrain
 from ..fire import ConstantSpreadFireManager, FireManager, RothermelFireManager
 
@@ -393,7 +401,552 @@ class TestRothermelFireManager(unittest.TestCase):
 
         # Output the draw graph for QA
         fig = self.fire_manager.draw_spread_graph()
-        fig.savefig("./assets/fire_spread_graph.png")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fig.savefig(Path(tmpdir) / "fire_spread_graph.png")
+
+    def test_precision(self) -> None:
+        """
+        Test that a float32 RothermelFireManager keeps its arrays in float32 and
+        produces the same fire spread as float64 within tolerance.
+        """
+        fire_maps = {}
+        burn_amounts = {}
+        for precision in ("float64", "float32"):
+            terrain = Terrain(
+                self.terrain.fuel_layer,
+                self.terrain.topo_layer,
+                self.screen_size,
+                headless=True,
+                precision=precision,
+            )
+            fire_manager = RothermelFireManager(
+                self.fire_init_pos,
+                self.config.display.fire_size,
+                self.config.fire.max_fire_duration,
+                self.config.area.pixel_scale,
+                self.config.simulation.update_rate,
+                self.fuel_particle,
+                terrain,
+                self.environment,
+                max_time=self.config.simulation.runtime,
+                headless=True,
+                precision=precision,
+            )
+            for arr in (
+                terrain.elevations,
+                fire_manager.U,
+                fire_manager.U_dir,
+                fire_manager.slope_mag,
+                fire_manager.slope_dir,
+                fire_manager.burn_amounts,
+            ):
+                self.assertEqual(arr.dtype, np.dtype(precision))
+
+            fire_map = np.full(self.screen_size, BurnStatus.UNBURNED)
+            for _ in range(5):
+                fire_map, _ = fire_manager.update(fire_map)
+            fire_maps[precision] = fire_map
+            burn_amounts[precision] = fire_manager.burn_amounts
+
+        np.testing.assert_array_equal(fire_maps["float32"], fire_maps["float64"])
+        np.testing.assert_allclose(
+            burn_amounts["float32"], burn_amounts["float64"], rtol=1e-4
+        )
+
+        with self.assertRaises(ValueError):
+            RothermelFireManager(
+                self.fire_init_pos,
+                self.config.display.fire_size,
+                self.config.fire.max_fire_duration,
+                self.config.area.pixel_scale,
+                self.config.simulation.update_rate,
+                self.fuel_particle,
+                self.terrain,
+                self.environment,
+                headless=True,
+                precision="float16",
+            )
+
+    def test_moisture_stack(self) -> None:
+        """
+        Test that a time-indexed fuel moisture stack is sampled by the elapsed time and
+        that the moisture coefficients are only re-computed when the slice changes.
+        """
+        dry = np.full(self.screen_size, self.config.environment.moisture)
+        # Fuel moisture at the moisture of extinction will not burn
+        wet = np.full(self.screen_size, 1.0)
+        environment = Environment(
+            np.stack([dry, dry, wet]),
+            self.config.wind.speed,
+            self.config.wind.direction,
+            M_f_interval=2 * self.config.simulation.update_rate,
+        )
+        fire_manager = RothermelFireManager(
+            self.fire_init_pos,
+            self.config.display.fire_size,
+            self.config.fire.max_fire_duration,
+            self.config.area.pixel_scale,
+            self.config.simulation.update_rate,
+            self.fuel_particle,
+            self.terrain,
+            environment,
+            max_time=self.config.simulation.runtime,
+            headless=True,
+        )
+        self.assertTupleEqual(fire_manager.M_f_stack.shape, (3, *self.screen_size))
+
+        fire_map = np.full(self.screen_size, BurnStatus.UNBURNED)
+        eta_M = fire_manager.eta_M
+        # The first slice covers the first two updates
+        for _ in range(2):
+            fire_map, _ = fire_manager.update(fire_map)
+            self.assertEqual(fire_manager._moisture_idx, 0)
+            self.assertIs(fire_manager.eta_M, eta_M)
+            self.assertGreater(fire_manager.rate_of_spread.max(), 0)
+
+        # The third slice is held past the end of the stack
+        for _ in range(3):
+            fire_map, _ = fire_manager.update(fire_map)
+        self.assertEqual(fire_manager._moisture_idx, 2)
+        np.testing.assert_array_equal(fire_manager.M_f, wet)
+        # The default float32 precision leaves a rounding residual
+        self.assertAlmostEqual(fire_manager.rate_of_spread.max(), 0, places=5)
+
+        with self.assertRaises(ValueError):
+            environment = Environment(
+                np.stack([dry[1:], dry[1:]]),
+                self.config.wind.speed,
+                self.config.wind.direction,
+            )
+            RothermelFireManager(
+                self.fire_init_pos,
+                self.config.display.fire_size,
+                self.config.fire.max_fire_duration,
+                self.config.area.pixel_scale,
+                self.config.simulation.update_rate,
+                self.fuel_particle,
+                self.terrain,
+                environment,
+                headless=True,
+            )
+
+    def test_wind_schedule(self) -> None:
+        """
+        Test that a wind schedule is interpolated by the elapsed time, loaded lazily
+        from memory-mapped files, and held after the last keyframe.
+        """
+        speeds = np.stack(
+            [np.full(self.screen_size, 100.0), np.full(self.screen_size, 300.0)]
+        )
+        directions = np.stack(
+            [np.full(self.screen_size, 350.0), np.full(self.screen_size, 10.0)]
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            speed_path = Path(tmpdir) / "speed.npy"
+            direction_path = Path(tmpdir) / "direction.npy"
+            np.save(speed_path, speeds)
+            np.save(direction_path, directions)
+            schedules = {
+                "keyframes": WindSchedule.from_keyframes(
+                    [(0, speeds[0], directions[0]), (10, speeds[1], directions[1])]
+                ),
+                "memory-mapped": WindSchedule.from_npy(
+                    [0, 10], speed_path, direction_path
+                ),
+            }
+            for name, schedule in schedules.items():
+                with self.subTest(f"Checking for {name} wind schedule"):
+                    environment = Environment(
+                        self.config.environment.moisture,
+                        0.0,
+                        0.0,
+                        wind_schedule=schedule,
+                    )
+                    fire_manager = RothermelFireManager(
+                        self.fire_init_pos,
+                        self.config.display.fire_size,
+                        self.config.fire.max_fire_duration,
+                        self.config.area.pixel_scale,
+                        1,
+                        self.fuel_particle,
+                        self.terrain,
+                        environment,
+                        headless=True,
+                    )
+                    np.testing.assert_allclose(fire_manager.U, 100)
+                    np.testing.assert_allclose(fire_manager.U_dir, 350)
+                    self.assertListEqual(list(fire_manager._wind_keyframes), [0])
+
+                    fire_manager.elapsed_time = 5
+                    fire_manager._update_wind()
+                    np.testing.assert_allclose(fire_manager.U, 200)
+                    # The direction should turn through North, not back through South
+                    np.testing.assert_allclose(fire_manager.U_dir % 360, 0, atol=1e-6)
+                    self.assertListEqual(list(fire_manager._wind_keyframes), [0, 1])
+
+                    fire_map = np.full(self.screen_size, BurnStatus.UNBURNED)
+                    for _ in range(10):
+                        fire_map, _ = fire_manager.update(fire_map)
+                    np.testing.assert_allclose(fire_manager.U, 300)
+                    np.testing.assert_allclose(fire_manager.U_dir, 10)
+                    self.assertListEqual(list(fire_manager._wind_keyframes), [1])
+
+        with self.assertRaises(ValueError):
+            WindSchedule([10, 0], list(speeds), list(directions))
+
+    def test_wind_stream(self) -> None:
+        """
+        Test that wind stream frames are pulled only when the elapsed time reaches
+        them, and that the last frame is held once the stream runs out.
+        """
+        pulled = []
+
+        def frames():
+            for i in range(3):
+                pulled.append(i)
+                yield (
+                    np.full(self.screen_size, 100.0 * (i + 1)),
+                    np.full(self.screen_size, 90.0 * i),
+                )
+
+        environment = Environment(
+            self.config.environment.moisture,
+            0.0,
+            0.0,
+            wind_stream=WindStream(frames(), interval=5),
+        )
+        fire_manager = RothermelFireManager(
+            self.fire_init_pos,
+            self.config.display.fire_size,
+            self.config.fire.max_fire_duration,
+            self.config.area.pixel_scale,
+            1,
+            self.fuel_particle,
+            self.terrain,
+            environment,
+            headless=True,
+        )
+        np.testing.assert_allclose(fire_manager.U, 100)
+        np.testing.assert_allclose(fire_manager.U_dir, 0)
+        self.assertListEqual(pulled, [0])
+
+        fire_manager.elapsed_time = 4.9
+        fire_manager._update_wind()
+        self.assertListEqual(pulled, [0])
+        # Skipping ahead pulls the skipped frames but only keeps the current one
+        fire_manager.elapsed_time = 10
+        fire_manager._update_wind()
+        self.assertListEqual(pulled, [0, 1, 2])
+        np.testing.assert_allclose(fire_manager.U, 300)
+        np.testing.assert_allclose(fire_manager.U_dir, 180)
+
+        fire_map = np.full(self.screen_size, BurnStatus.UNBURNED)
+        for _ in range(10):
+            fire_map, _ = fire_manager.update(fire_map)
+        np.testing.assert_allclose(fire_manager.U, 300)
+
+        with self.assertRaises(ValueError):
+            WindStream(frames(), interval=0)
+        environment.wind_stream = WindStream(iter([]), interval=1)
+        with self.assertRaises(ValueError):
+            RothermelFireManager(
+                self.fire_init_pos,
+                self.config.display.fire_size,
+                self.config.fire.max_fire_duration,
+                self.config.area.pixel_scale,
+                1,
+                self.fuel_particle,
+                self.terrain,
+                environment,
+                headless=True,
+            )
+
+    def test_wind_grid(self) -> None:
+        """
+        Test that a coarse wind grid is interpolated at the pixels the fire spreads
+        to, and spreads the fire the same as the full resolution wind.
+        """
+        height, width = self.screen_size
+        # A 3x3 grid with cells 1/2 the size of the terrain, centered on the terrain
+        U = np.array([[100.0, 200.0, 300.0], [200.0, 300.0, 400.0], [300.0, 400.0, 500]])
+        U_dir = np.array([[350.0, 10.0, 30.0], [350.0, 10.0, 30.0], [350.0, 10.0, 30.0]])
+        geotransform = (-width / 4, width / 2, 0.0, -height / 4, 0.0, height / 2)
+        wind_grid = CoarseWindGrid(U, U_dir, geotransform)
+
+        # The centers of the cells are at the edges and center of the terrain
+        U_sample, U_dir_sample = wind_grid.sample(
+            np.array([-0.5, width / 2 - 0.5, width - 0.5, width / 4 - 0.5]),
+            np.array([-0.5, height / 2 - 0.5, height - 0.5, -0.5]),
+        )
+        np.testing.assert_allclose(U_sample, [100, 300, 500, 150])
+        # The direction is interpolated through North, not back through South
+        np.testing.assert_allclose(
+            np.mod(U_dir_sample + 180, 360) - 180, [-10, 10, 30, 0]
+        )
+
+        y, x = np.indices(self.screen_size)
+        U_full, U_dir_full = wind_grid.sample(x, y)
+        fire_maps = []
+        for environment in (
+            Environment(self.config.environment.moisture, U_full, U_dir_full),
+            Environment(self.config.environment.moisture, 0.0, 0.0, wind_grid=wind_grid),
+        ):
+            fire_manager = RothermelFireManager(
+                self.fire_init_pos,
+                self.config.display.fire_size,
+                self.config.fire.max_fire_duration,
+                self.config.area.pixel_scale,
+                1,
+                self.fuel_particle,
+                self.terrain,
+                environment,
+                headless=True,
+            )
+            fire_map = np.full(self.screen_size, BurnStatus.UNBURNED)
+            for _ in range(20):
+                fire_map, _ = fire_manager.update(fire_map)
+            fire_maps.append(fire_map)
+        np.testing.assert_array_equal(fire_maps[0], fire_maps[1])
+        self.assertGreater(len(fire_manager._wind_cache), 0)
+        self.assertLess(len(fire_manager._wind_cache), height * width)
+
+        with self.assertRaises(ValueError):
+            CoarseWindGrid(U, U_dir, (0.0, 1.0, 0.5, 0.0, 0.0, 1.0))
+        with self.assertRaises(ValueError):
+            RothermelFireManager(
+                self.fire_init_pos,
+                self.config.display.fire_size,
+                self.config.fire.max_fire_duration,
+                self.config.area.pixel_scale,
+                1,
+                self.fuel_particle,
+                self.terrain,
+                Environment(
+                    self.config.environment.moisture,
+                    0.0,
+                    0.0,
+                    wind_grid=CoarseWindGrid(U, U_dir, (0.0, 1.0, 0.0, 0.0, 0.0, 1.0)),
+                ),
+                headless=True,
+            )
+
+    def test_adaptive_step(self) -> None:
+        """
+        Test that adaptive steps keep every location from burning more than `cfl`
+        pixels in a single update and never take longer than `update_rate`.
+        """
+        update_rate = 1000.0
+        cfl = 0.5
+        fire_manager = RothermelFireManager(
+            self.fire_init_pos,
+            self.config.display.fire_size,
+            self.config.fire.max_fire_duration,
+            self.config.area.pixel_scale,
+            update_rate,
+            self.fuel_particle,
+            self.terrain,
+            self.environment,
+            headless=True,
+            adaptive_step=True,
+            cfl=cfl,
+        )
+        fire_map = np.full(self.screen_size, BurnStatus.UNBURNED)
+        for _ in range(5):
+            fire_map, _ = fire_manager.update(fire_map)
+            max_burn = fire_manager.rate_of_spread.max()
+            self.assertLessEqual(max_burn, cfl * fire_manager.pixel_scale * (1 + 1e-6))
+            self.assertLessEqual(fire_manager.step_times[-1], update_rate)
+
+        self.assertEqual(len(fire_manager.step_times), 5)
+        self.assertAlmostEqual(sum(fire_manager.step_times), fire_manager.elapsed_time)
+        # The fixed step manager always uses the update rate
+        self.assertTrue(
+            all(t == self.fire_manager.update_rate for t in self.fire_manager.step_times)
+        )
+
+    def test_adaptive_step_slow_fire(self) -> None:
+        """
+        Test that adaptive steps grow past `update_rate` up to `max_step` for a slow
+        fire, so it reaches the same time in fewer updates than fixed steps.
+        """
+        environment = Environment(self.config.environment.moisture, 0.0, 0.0)
+        end_time = 40.0
+        num_updates = []
+        for adaptive_step in (False, True):
+            fire_manager = RothermelFireManager(
+                self.fire_init_pos,
+                self.config.display.fire_size,
+                1000,
+                self.config.area.pixel_scale,
+                1,
+                self.fuel_particle,
+                self.terrain,
+                environment,
+                headless=True,
+                adaptive_step=adaptive_step,
+                max_step=60.0,
+            )
+            fire_map = np.full(self.screen_size, BurnStatus.UNBURNED)
+            while fire_manager.elapsed_time < end_time:
+                fire_map, _ = fire_manager.update(fire_map)
+            num_updates.append(len(fire_manager.step_times))
+            self.assertLessEqual(max(fire_manager.step_times), 60.0)
+        self.assertEqual(num_updates[0], end_time)
+        self.assertLess(num_updates[1], num_updates[0])
+
+        with self.assertRaises(ValueError):
+            RothermelFireManager(
+                self.fire_init_pos,
+                self.config.display.fire_size,
+                self.config.fire.max_fire_duration,
+                self.config.area.pixel_scale,
+                1,
+                self.fuel_particle,
+                self.terrain,
+                environment,
+                headless=True,
+                adaptive_step=True,
+                max_step=0,
+            )
+
+    def test_adaptive_step_control_line(self) -> None:
+        """
+        Test that a control line is crossed at about the same time with fixed steps and
+        with (much shorter) adaptive steps, since the attenuation is scaled by the
+        length of each step.
+        """
+        screen_size = (5, 7)
+        terrain = Terrain(
+            DummyFuelLayer(screen_size),
+            DummyTopographyLayer(screen_size),
+            screen_size,
+            headless=True,
+        )
+        environment = Environment(self.config.environment.moisture, 10.0, 90.0)
+        update_rate = 20.0
+        x, y = 2, 2
+        cross_times = []
+        for adaptive_step in (False, True):
+            fire_manager = RothermelFireManager(
+                (x, y),
+                self.config.display.fire_size,
+                1000,
+                500,
+                update_rate,
+                self.fuel_particle,
+                terrain,
+                environment,
+                headless=True,
+                adaptive_step=adaptive_step,
+                cfl=0.1,
+            )
+            fire_map = np.full(screen_size, BurnStatus.UNBURNED)
+            fire_map[y, x] = BurnStatus.BURNING
+            fire_map[:, x + 1] = BurnStatus.WETLINE
+            while fire_manager.elapsed_time < 400:
+                fire_map, _ = fire_manager.update(fire_map)
+                if fire_map[y, x + 1] == BurnStatus.BURNING:
+                    cross_times.append(fire_manager.elapsed_time)
+                    break
+            if adaptive_step:
+                self.assertLess(max(fire_manager.step_times), update_rate / 2)
+
+        self.assertEqual(len(cross_times), 2, msg="The fire should cross the wetline")
+        self.assertAlmostEqual(cross_times[0], cross_times[1], delta=update_rate)
+
+    def test_adaptive_step_fire_duration(self) -> None:
+        """
+        Test that with adaptive steps a fire burns for `max_fire_duration` updates of
+        `update_rate` minutes, not for `max_fire_duration` (shorter) steps.
+        """
+        screen_size = (9, 9)
+        terrain = Terrain(
+            DummyFuelLayer(screen_size),
+            DummyTopographyLayer(screen_size),
+            screen_size,
+            headless=True,
+        )
+        environment = Environment(self.config.environment.moisture, 10.0, 90.0)
+        max_fire_duration = 3
+        update_rate = 5.0
+        x, y = 4, 4
+        fire_manager = RothermelFireManager(
+            (x, y),
+            self.config.display.fire_size,
+            max_fire_duration,
+            self.config.area.pixel_scale,
+            update_rate,
+            self.fuel_particle,
+            terrain,
+            environment,
+            headless=True,
+            adaptive_step=True,
+            cfl=0.1,
+        )
+        fire_map = np.full(screen_size, BurnStatus.UNBURNED)
+        fire_map[y, x] = BurnStatus.BURNING
+        while fire_map[y, x] != BurnStatus.BURNED:
+            burn_time = fire_manager.elapsed_time
+            fire_map, _ = fire_manager.update(fire_map)
+        self.assertGreater(len(fire_manager.step_times), max_fire_duration + 1)
+        self.assertGreaterEqual(burn_time, max_fire_duration * update_rate - 1e-6)
+        self.assertLess(
+            burn_time, max_fire_duration * update_rate + max(fire_manager.step_times)
+        )
+
+    def test_ignitions(self) -> None:
+        """
+        Test that bulk ignitions start burning at their ignition time and that
+        ignitions off the map (including at time 0) or on already burning locations
+        are dropped.
+        """
+        x, y = self.fire_init_pos
+        ignitions = np.array(
+            [
+                [x, y, 0],
+                [-1, 5, 0],
+                [self.screen_size[1], 5, 0],
+                [10, 10, 2],
+                [20, 30, 2],
+                [x, y, 2],
+                [-1, 5, 2],
+                [200, 200, 1000],
+            ]
+        )
+        fire_manager = RothermelFireManager(
+            ignitions,
+            self.config.display.fire_size,
+            self.config.fire.max_fire_duration,
+            self.config.area.pixel_scale,
+            1,
+            self.fuel_particle,
+            self.terrain,
+            self.environment,
+            headless=True,
+        )
+        self.assertEqual(len(fire_manager.sprites), 1)
+        self.assertEqual(fire_manager.pending_ignitions.shape, (5, 3))
+
+        fire_map = np.full(self.screen_size, BurnStatus.UNBURNED)
+        fire_map[y, x] = BurnStatus.BURNING
+        for _ in range(3):
+            fire_map, _ = fire_manager.update(fire_map)
+        self.assertEqual(fire_map[10, 10], BurnStatus.BURNING)
+        self.assertEqual(fire_map[30, 20], BurnStatus.BURNING)
+        sprite_locs = [(sprite.rect.x, sprite.rect.y) for sprite in fire_manager.sprites]
+        self.assertIn((10, 10), sprite_locs)
+        self.assertIn((20, 30), sprite_locs)
+        # The already burning location should not get a second sprite
+        self.assertEqual(sprite_locs.count((x, y)), 1)
+        self.assertEqual(fire_manager.pending_ignitions.shape, (1, 3))
+
+        # More ignitions can be added after the manager is created
+        fire_manager.add_ignitions([[100, 100, fire_manager.elapsed_time]])
+        fire_map, _ = fire_manager.update(fire_map)
+        self.assertEqual(fire_map[100, 100], BurnStatus.BURNING)
+
+        with self.assertRaises(ValueError):
+            fire_manager.add_ignitions(np.zeros((2, 4)))
 
 
 class TestConstantSpreadFireManager(unittest.TestCase):
@@ -462,3 +1015,29 @@ class TestConstantSpreadFireManager(unittest.TestCase):
                 f"{sprite_locs}, but they should be: {new_locs}"
             ),
         )
+
+    def test_timed_ignitions(self) -> None:
+        """
+        Test that the ConstantSpreadFireManager starts timed ignitions when their time
+        is reached
+        """
+        screen_size = self.config.area.screen_size
+        fire_manager = ConstantSpreadFireManager(
+            [[1, 1, 0], [8, 6, 2]],
+            self.fire_size,
+            self.max_fire_duration,
+            self.rate_of_spread,
+        )
+        # Ignitions at time 0 start right away
+        self.assertEqual(len(fire_manager.sprites), 1)
+        fire_map = np.full(screen_size, BurnStatus.UNBURNED)
+        fire_map[1, 1] = BurnStatus.BURNING
+        fire_map = fire_manager.update(fire_map)
+        self.assertEqual(fire_map[6, 8], BurnStatus.UNBURNED)
+        self.assertEqual(fire_manager.pending_ignitions.shape, (1, 3))
+
+        for _ in range(2):
+            fire_map = fire_manager.update(fire_map)
+        self.assertEqual(fire_map[6, 8], BurnStatus.BURNING)
+        self.assertEqual(fire_manager.pending_ignitions.shape, (0, 3))
+        self.assertEqual(fire_manager.elapsed_time, 3)
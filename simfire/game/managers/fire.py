@@ -8,7 +8,7 @@ Defines the different `FireManager`s (`ConstantSpreadFireManager` and
 
 import collections
 from dataclasses import astuple
-from typing import Any, List, Optional, Sequence, Tuple, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -18,13 +18,19 @@ from ...enums import BurnStatus, GameStatus, RoSAttenuation
 from ...utils.graph import FireSpreadGraph
 from ...utils.log import create_logger
 from ...world.parameters import Environment, FuelParticle
-from ...world.rothermel import compute_rate_of_spread
+from ...world.rothermel import compute_moisture_coefficients, compute_rate_of_spread
 from ..sprites import Fire, Terrain
 
 log = create_logger(__name__)
 
+# The number of terrain pixels to keep the interpolated wind for with a coarse wind grid
+WIND_GRID_CACHE_SIZE = 2**16
+
 NewLocsType = Tuple[Tuple[int, int], ...]
 
+# Ignitions as an array of (x, y) or (x, y, time) rows
+IgnitionsType = Union[np.ndarray, Sequence[Sequence[float]]]
+
 SpriteParamsType = Tuple[
     List[int],
     List[int],
@@ -55,12 +61,13 @@ class FireManager:
 
     def __init__(
         self,
-        init_pos: Tuple[int, int],
+        init_pos: Union[Tuple[int, int], IgnitionsType],
         fire_size: int,
         max_fire_duration: int,
         attenuate_line_ros: bool = True,
         headless: bool = False,
         diagonal_spread: bool = True,
+        screen_size: Optional[Tuple[int, int]] = None,
     ) -> None:
         """
         Initialize the class by recording the initial fire location and size.
@@ -69,7 +76,8 @@ class FireManager:
         initial fire.
 
         Arguments:
-            init_pos: The (x,y) location of the initial fire
+            init_pos: The (x,y) location of the initial fire, or an array of (x, y) or
+                      (x, y, time) ignitions. See `FireManager.add_ignitions()`.
             fire_size: The (n,n) pixel size of the fire sprite. Note that
                        the sprite pixel size does not affect which tiles/pixels
                        are actually burning. This is for display purposes only.
@@ -88,6 +96,9 @@ class FireManager:
             diagonal_spread: Whether or not to have the fire spread calculation apply to
                              diagonal pixels. If this is `True`, the fire may spread past
                              firelines that don't take this into account.
+            screen_size: The (height, width) of the `fire_map`. If given, ignitions at
+                         time 0 that are outside of the map are dropped, like later
+                         ignitions are.
         Returns:
             None
         """
@@ -97,10 +108,114 @@ class FireManager:
         self.attenuate_line_ros = attenuate_line_ros
         self.headless = headless
         self.diagonal_spread = diagonal_spread
+        self.screen_size = screen_size
+
+        self.sprites: List[Fire] = []
+        # The number of updates each fire has burned for
+        self.durations: List[float] = []
+
+        # Ignitions that have not started burning yet as an (N, 3) array of
+        # (x, y, time), sorted by time
+        self.pending_ignitions = np.empty((0, 3))
+        self.add_ignitions(self.init_pos)
+        # Ignitions at time 0 start burning right away. The fire_map does not exist
+        # yet, so they can only be checked against the screen size.
+        x, y = self._pop_ignitions(0)
+        if self.screen_size is not None:
+            in_bounds = self._in_bounds(x, y, self.screen_size)
+            x, y = x[in_bounds], y[in_bounds]
+        self._create_fires(x, y)
+
+    def add_ignitions(self, ignitions: Union[Tuple[int, int], IgnitionsType]) -> None:
+        """
+        Schedule new ignitions. Each ignition starts burning in bulk during the first
+        update where the elapsed time has reached its ignition time.
+
+        Arguments:
+            ignitions: A single (x, y) location, or an array with shape (N, 2) of
+                       (x, y) locations or shape (N, 3) of (x, y, time) ignitions. The
+                       time is the number of minutes into the simulation and defaults
+                       to 0 if not specified.
+        """
+        ignitions = np.atleast_2d(np.asarray(ignitions, dtype=float))
+        if ignitions.ndim != 2 or ignitions.shape[1] not in (2, 3):
+            raise ValueError(
+                "The ignitions should have shape (N, 2) or (N, 3), but got shape "
+                f"{ignitions.shape}"
+            )
+        if ignitions.shape[1] == 2:
+            ignitions = np.hstack((ignitions, np.zeros((ignitions.shape[0], 1))))
+        pending = np.vstack((self.pending_ignitions, ignitions))
+        self.pending_ignitions = pending[np.argsort(pending[:, 2], kind="stable")]
+
+    def _pop_ignitions(self, time: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Remove and return all pending ignitions whose ignition time has been reached.
+
+        Arguments:
+            time: The current simulation time in minutes
+
+        Returns:
+            The unique x and y coordinates of the ignitions
+        """
+        num_ready = int(np.searchsorted(self.pending_ignitions[:, 2], time, "right"))
+        ready = self.pending_ignitions[:num_ready]
+        self.pending_ignitions = self.pending_ignitions[num_ready:]
+        locs = np.unique(ready[:, :2].astype(int), axis=0)
+        return locs[:, 0], locs[:, 1]
+
+    @staticmethod
+    def _in_bounds(x: np.ndarray, y: np.ndarray, shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        Check which locations are inside of a map.
 
-        init_fire = Fire(self.init_pos, self.fire_size, headless=self.headless)
-        self.sprites: List[Fire] = [init_fire]
-        self.durations: List[int] = [0]
+        Arguments:
+            x: The x coordinates of the locations
+            y: The y coordinates of the locations
+            shape: The (height, width) of the map
+
+        Returns:
+            A boolean array that is True for the locations inside of the map
+        """
+        return (x >= 0) & (x < shape[1]) & (y >= 0) & (y < shape[0])
+
+    def _create_fires(self, x: np.ndarray, y: np.ndarray) -> None:
+        """
+        Create new Fire sprites and durations for the input locations.
+
+        Arguments:
+            x: The x coordinates of the new fires
+            y: The y coordinates of the new fires
+        """
+        self.sprites += [
+            Fire((x_i, y_i), self.fire_size, headless=self.headless)
+            for x_i, y_i in zip(x.tolist(), y.tolist())
+        ]
+        self.durations += [0] * len(x)
+
+    def _ignite(self, fire_map: np.ndarray, time: float) -> np.ndarray:
+        """
+        Start burning all pending ignitions whose ignition time has been reached.
+        Ignitions outside of the map or on locations that are not `UNBURNED` are
+        dropped.
+
+        Arguments:
+            fire_map: The numpy array that tracks the fire's burn status for
+                      each pixel in the simulation
+            time: The current simulation time in minutes
+
+        Returns:
+            A NumPy array of the updated `fire_map`
+        """
+        x, y = self._pop_ignitions(time)
+        in_bounds = self._in_bounds(x, y, fire_map.shape)
+        x, y = x[in_bounds], y[in_bounds]
+        can_burn = fire_map[y, x] == BurnStatus.UNBURNED
+        x, y = x[can_burn], y[can_burn]
+        fire_map[y, x] = BurnStatus.BURNING
+        self._create_fires(x, y)
+
+        return fire_map
 
     def update(self, fire_map: np.ndarray) -> Any:
         """
@@ -234,7 +349,7 @@ class FireManager:
         return new_locs
 
     def _update_rate_of_spread(
-        self, rate_of_spread: np.ndarray, fire_map: np.ndarray
+        self, rate_of_spread: np.ndarray, fire_map: np.ndarray, step_scale: float = 1.0
     ) -> np.ndarray:
         """Update the burn amounts based on control line status.
 
@@ -245,11 +360,15 @@ class FireManager:
         located, and `RosAttenuation.FIRELINE` was set to 6, it would become 4 as a
         result of this function.
 
+        The attenuation is the amount for an update of the full update rate, so it is
+        scaled by `step_scale` for shorter or longer (adaptive) update steps.
+
         Arguments:
             rate_of_spread: The array that keeps track of the rate of spread for
                             all pixel locations.
             fire_map: The array that maintains information about the status of the fire
                       at each pixel location (`BURNED`, `UNBURNED`, `FIRELINE`, etc.)
+            step_scale: The length of the update step as a fraction of the update rate
 
         Returns:
             An updated `rate_of_spread` array, taking into account the control lines
@@ -275,7 +394,7 @@ class FireManager:
                 RoSAttenuation.SCRATCHLINE
             )
             factor[np.where(fire_map == BurnStatus.WETLINE)] = RoSAttenuation.WETLINE
-            rate_of_spread = rate_of_spread - factor
+            rate_of_spread = rate_of_spread - factor * step_scale
         else:
             rate_of_spread[np.where(fire_map == BurnStatus.FIRELINE)] = 0
             rate_of_spread[np.where(fire_map == BurnStatus.SCRATCHLINE)] = 0
@@ -292,7 +411,7 @@ class RothermelFireManager(FireManager):
 
     def __init__(
         self,
-        init_pos: Tuple[int, int],
+        init_pos: Union[Tuple[int, int], IgnitionsType],
         fire_size: int,
         max_fire_duration: int,
         pixel_scale: float,
@@ -304,6 +423,10 @@ class RothermelFireManager(FireManager):
         attenuate_line_ros: bool = True,
         headless: bool = False,
         diagonal_spread: bool = True,
+        precision: str = "float32",
+        adaptive_step: bool = False,
+        cfl: float = 1.0,
+        max_step: Optional[float] = None,
     ) -> None:
         """
         Initialize the class by recording the initial fire location and size.
@@ -311,7 +434,8 @@ class RothermelFireManager(FireManager):
         initial fire.
 
         Arguments:
-            init_pos: The (x,y) location of the initial fire
+            init_pos: The (x,y) location of the initial fire, or an array of (x, y) or
+                      (x, y, time) ignitions. See `FireManager.add_ignitions()`.
             fire_size: The (n,n) pixel size of the fire sprite. Note that
                        the sprite pixel size does not affect which tiles/pixels
                        are actually burning. This is for display purposes only.
@@ -320,13 +444,18 @@ class RothermelFireManager(FireManager):
                                for before going out. This is moslty useful so
                                that fires that have spread and are now on the
                                interior do not have to keep being rendered.
+                               With adaptive steps, fires burn for
+                               `max_fire_duration * update_rate` minutes, however
+                               many steps that takes.
             pixel_scale: The amount of ft each pixel represents. This is needed
                          to track how much a fire has burned at a certain
                          location since it may take more than one update for
                          a pixel/location to catch on fire depending on the
                          rate of spread.
             update_rate: The amount of time in minutes that passes for each simulation
-                         update step
+                         update step. If `adaptive_step` is `True`, this is only used
+                         for steps without a fire frontier, and as the default
+                         `max_step`
             fuel_particle: The parameters that describe the fuel particle
             terrain: The Terrain that describes the simulation/game
             environment: The Environment that describes the simulation/game
@@ -342,6 +471,20 @@ class RothermelFireManager(FireManager):
             diagonal_spread: Whether or not to have the fire spread calculation apply to
                              diagonal pixels. If this is `True`, the fire may spread past
                              firelines that don't take this into account.
+            precision: The floating point precision used for all fire spread arrays and
+                       the Rothermel calculation. One of "float32" or "float64".
+                       Defaults to "float32".
+            adaptive_step: Whether or not to pick the amount of time for each update
+                           step from the fastest rate of spread on the fire frontier
+                           instead of always using `update_rate`.
+            cfl: The largest fraction of a pixel that any location can burn in a
+                 single adaptive update step. Only used when `adaptive_step` is
+                 `True`. A value of 1 means no location can advance more than one
+                 pixel per update.
+            max_step: The largest amount of time in minutes that a single adaptive
+                      update step can take. Only used when `adaptive_step` is `True`.
+                      Slow fires take steps longer than `update_rate` up to this
+                      limit. Defaults to `update_rate`.
         """
         super().__init__(
             init_pos,
@@ -350,9 +493,27 @@ class RothermelFireManager(FireManager):
             attenuate_line_ros,
             headless,
             diagonal_spread,
+            terrain.screen_size,
         )
+        if precision not in ("float32", "float64"):
+            raise ValueError(
+                f"The input precision of {precision} should be one of "
+                "('float32', 'float64')"
+            )
+        if cfl <= 0:
+            raise ValueError(f"The CFL number should be greater than 0, but got {cfl}")
+        if max_step is None:
+            max_step = update_rate
+        if max_step <= 0:
+            raise ValueError(f"The max step should be greater than 0, but got {max_step}")
+        self.dtype = np.dtype(precision)
         self.pixel_scale = pixel_scale
         self.update_rate = update_rate
+        self.adaptive_step = adaptive_step
+        self.cfl = cfl
+        self.max_step = max_step
+        # The amount of time in minutes that each update step took
+        self.step_times: List[float] = []
         self.max_time = max_time
         self.elapsed_time = 0.0
         self.fuel_particle = fuel_particle
@@ -362,15 +523,52 @@ class RothermelFireManager(FireManager):
         # Convert potential constant or nested sequence wind magnitude
         # and directions to numpy arrays with values at each game/terrain
         # pixel. This will allow for easier computation
-        self.U, self.U_dir = self._get_environment_parameters(environment)
+        # A wind schedule is instead sampled by the elapsed time in self._update_wind()
+        # and only the keyframes around the elapsed time are kept in memory
+        # A wind stream is read one frame at a time as the elapsed time reaches it
+        # A coarse wind grid is only interpolated at the pixels the fire spreads to in
+        # self._get_wind(), and the most recent values are cached
+        self.wind_schedule = environment.wind_schedule
+        self.wind_stream = environment.wind_stream
+        self.wind_grid = environment.wind_grid
+        self._wind_cache: Dict[Tuple[int, int], Tuple[float, float]] = {}
+        self._wind_keyframes: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._wind_key: Optional[Tuple[int, float]] = None
+        self._wind_frame_idx = -1
+        if self.wind_stream is not None:
+            self._update_wind()
+            if self._wind_frame_idx < 0:
+                raise ValueError("The wind stream does not have any frames")
+        elif self.wind_schedule is not None:
+            self._update_wind()
+        elif self.wind_grid is not None:
+            if not self.wind_grid.covers(self.terrain.screen_size):
+                raise ValueError(
+                    f"The wind grid with geotransform {self.wind_grid.geotransform} "
+                    f"and shape {self.wind_grid.U.shape} should cover the terrain "
+                    f"shape of {self.terrain.screen_size}"
+                )
+        else:
+            self.U, self.U_dir = self._get_environment_parameters(environment)
+
+        # Convert the constant, (H, W), or (T, H, W) fuel moisture to a (T, H, W) stack
+        # that is sampled by the elapsed time in self._update_moisture()
+        self.M_f_stack = self._get_moisture_parameters(environment)
+        # The dead fuel moisture of extinction at each pixel is needed to pre-compute
+        # the moisture-dependent Rothermel coefficients for the whole terrain
+        self.M_x = np.vectorize(lambda fuel: fuel.M_x, otypes=[self.dtype])(
+            self.terrain.fuels
+        )
+        self._moisture_idx: Optional[int] = None
+        self._update_moisture()
 
         # Keep track of how much each pixel has burned.
         # This is needed since each pixel represents a specific number of feet
         # and it might take more than one update to burn
-        self.burn_amounts = np.zeros_like(self.terrain.fuels)
+        self.burn_amounts = np.zeros(self.terrain.screen_size, dtype=self.dtype)
 
         # Keep track of how much each pixel is currently burning
-        self.rate_of_spread = np.zeros_like(self.terrain.fuels)
+        self.rate_of_spread = np.zeros(self.terrain.screen_size, dtype=self.dtype)
 
         # Pre-compute the slope magnitudes and directions for use with
         # Rothermel calculation
@@ -384,7 +582,8 @@ class RothermelFireManager(FireManager):
     ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Convert the input Environment U and U_dir (wind and wind-direction) parameters
-        to numpy arrays with shape self.terrain.data.shape for use with the class.
+        to numpy arrays with shape self.terrain.data.shape and dtype self.dtype for use
+        with the class.
 
         Arguments:
             environment: The input environment to convert
@@ -394,14 +593,14 @@ class RothermelFireManager(FireManager):
         """
 
         def convert_param_to_numpy(
-            param: Union[float, Sequence[Sequence[float]], np.ndarray]
+            param: Union[float, Sequence[Sequence[float]], np.ndarray],
         ) -> np.ndarray:
             """
             Convert the input paramter from float or nested sequence of floats
             to a numpy array.
             """
             if isinstance(param, float):
-                param = np.full(self.terrain.screen_size, param, dtype=np.float32)
+                param = np.full(self.terrain.screen_size, param, dtype=self.dtype)
             elif isinstance(param, np.ndarray):
                 if param.shape != self.terrain.screen_size:
                     raise ValueError(
@@ -409,6 +608,7 @@ class RothermelFireManager(FireManager):
                         "should match the terrain shape "
                         f"of {self.terrain.screen_size}"
                     )
+                param = param.astype(self.dtype, copy=False)
             else:
                 # Should be a Sequence[Sequence[float]], but check all sub-elements
                 if not all(
@@ -419,7 +619,7 @@ class RothermelFireManager(FireManager):
                         "one of (float | Sequence[Sequence[float]] | "
                         f"np.ndarray), but got {type(param)}"
                     )
-                param = np.asarray(param)
+                param = np.asarray(param, dtype=self.dtype)
                 if param.shape != self.terrain.screen_size:
                     raise ValueError(
                         f"The input parameter shape of {param.shape} "
@@ -433,6 +633,229 @@ class RothermelFireManager(FireManager):
 
         return U, U_dir
 
+    def _load_wind_keyframe(self, idx: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Read a wind schedule keyframe into memory with dtype self.dtype.
+
+        Arguments:
+            idx: The index of the keyframe in self.wind_schedule
+
+        Returns:
+            The wind speed and wind direction grids of the keyframe
+        """
+        if self.wind_schedule is None:
+            raise ValueError("There is no wind schedule to load keyframes from")
+        keyframe = self.wind_schedule.keyframe(idx)
+        return self._convert_wind_grids(keyframe, f"wind schedule keyframe {idx}")
+
+    def _convert_wind_grids(
+        self, grids: Tuple[np.ndarray, np.ndarray], name: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert wind speed and direction grids to dtype self.dtype and check that they
+        match the terrain shape.
+
+        Arguments:
+            grids: The wind speed and wind direction grids
+            name: The name of the grids to use in the error message
+
+        Returns:
+            The wind speed and wind direction grids with dtype self.dtype
+        """
+        U, U_dir = (np.asarray(grid, dtype=self.dtype) for grid in grids)
+        for grid in (U, U_dir):
+            if grid.shape != self.terrain.screen_size:
+                raise ValueError(
+                    f"The {name} has shape {grid.shape}, but "
+                    f"should match the terrain shape of {self.terrain.screen_size}"
+                )
+        return U, U_dir
+
+    def _update_wind_stream(self) -> None:
+        """
+        Pull frames from the wind stream until the frame for the current elapsed time
+        is reached. Only the current frame is kept, and the last frame is held once
+        the stream runs out.
+        """
+        if self.wind_stream is None:
+            return
+        idx = int(self.elapsed_time // self.wind_stream.interval)
+        frame = None
+        while self._wind_frame_idx < idx:
+            next_frame = self.wind_stream.next_frame()
+            if next_frame is None:
+                break
+            frame = next_frame
+            self._wind_frame_idx += 1
+        if frame is not None:
+            self.U, self.U_dir = self._convert_wind_grids(
+                frame, f"wind stream frame {self._wind_frame_idx}"
+            )
+
+    def _update_wind(self) -> None:
+        """
+        Sample the wind schedule at the current elapsed time. The wind speed is
+        linearly interpolated between the surrounding keyframes, and the wind direction
+        is interpolated along the shortest arc. The first and last keyframes are held
+        before and after the schedule. The wind is only re-computed when the sampled
+        keyframes or interpolation weight change.
+        """
+        if self.wind_stream is not None:
+            self._update_wind_stream()
+            return
+        if self.wind_schedule is None:
+            return
+        times = self.wind_schedule.times
+        idx = int(np.searchsorted(times, self.elapsed_time, side="right")) - 1
+        if idx < 0:
+            idx, weight = 0, 0.0
+        elif idx == len(times) - 1 or not self.wind_schedule.interpolate:
+            weight = 0.0
+        else:
+            weight = (self.elapsed_time - times[idx]) / (times[idx + 1] - times[idx])
+        if (idx, weight) == self._wind_key:
+            return
+        self._wind_key = (idx, weight)
+
+        # Drop keyframes that are no longer needed and lazily load any new ones
+        needed = [idx] if weight == 0 else [idx, idx + 1]
+        keyframes = {}
+        for i in needed:
+            if i in self._wind_keyframes:
+                keyframes[i] = self._wind_keyframes[i]
+            else:
+                keyframes[i] = self._load_wind_keyframe(i)
+        self._wind_keyframes = keyframes
+
+        U_0, U_dir_0 = self._wind_keyframes[idx]
+        if weight == 0:
+            self.U, self.U_dir = U_0, U_dir_0
+        else:
+            U_1, U_dir_1 = self._wind_keyframes[idx + 1]
+            self.U = U_0 + weight * (U_1 - U_0)
+            # Wrap the direction difference to [-180, 180) to turn the shortest way
+            U_dir_diff = (U_dir_1 - U_dir_0 + 180) % 360 - 180
+            self.U_dir = (U_dir_0 + weight * U_dir_diff) % 360
+
+    def _get_wind(self, y: List[int], x: List[int]) -> Tuple[List[float], List[float]]:
+        """
+        Get the wind speed and direction at terrain pixels. With a coarse wind grid,
+        the wind is interpolated at the pixels that are not cached yet, and the oldest
+        cached pixels are dropped once there are `WIND_GRID_CACHE_SIZE` of them.
+
+        Arguments:
+            y: The y (row) coordinates of the pixels
+            x: The x (column) coordinates of the pixels
+
+        Returns:
+            The wind speed and wind direction at each pixel
+        """
+        if self.wind_grid is None:
+            return self.U[y, x].tolist(), self.U_dir[y, x].tolist()
+
+        locs = list(zip(y, x))
+        winds = {loc: self._wind_cache.get(loc) for loc in locs}
+        missing = [loc for loc, wind in winds.items() if wind is None]
+        if len(missing) > 0:
+            missing_y, missing_x = zip(*missing)
+            U, U_dir = self.wind_grid.sample(np.array(missing_x), np.array(missing_y))
+            for loc, wind in zip(missing, zip(U.tolist(), U_dir.tolist())):
+                winds[loc] = wind
+                if len(self._wind_cache) >= WIND_GRID_CACHE_SIZE:
+                    # Dicts keep insertion order, so this is the oldest pixel
+                    del self._wind_cache[next(iter(self._wind_cache))]
+                self._wind_cache[loc] = wind
+        U_list, U_dir_list = zip(*(winds[loc] for loc in locs))
+        return list(U_list), list(U_dir_list)
+
+    def _get_moisture_parameters(self, environment: Environment) -> np.ndarray:
+        """
+        Convert the input Environment M_f (fuel moisture) parameter to a time-indexed
+        numpy array with shape (T, self.terrain.screen_size[0],
+        self.terrain.screen_size[1]). Constant and (H, W) fuel moistures become a stack
+        with a single slice.
+
+        Arguments:
+            environment: The input environment to convert
+
+        Returns:
+            The fuel moisture as a (T, H, W) numpy array
+        """
+        if environment.M_f_interval <= 0:
+            raise ValueError(
+                "The fuel moisture interval should be greater than 0, but got "
+                f"{environment.M_f_interval}"
+            )
+        # np.asarray will not copy memory-mapped stacks that already have self.dtype
+        M_f = np.asarray(environment.M_f, dtype=self.dtype)
+        if M_f.ndim == 0:
+            M_f = np.full(self.terrain.screen_size, M_f, dtype=self.dtype)
+        if M_f.ndim == 2:
+            M_f = M_f[np.newaxis]
+        if M_f.ndim != 3 or M_f.shape[1:] != self.terrain.screen_size:
+            raise ValueError(
+                f"The input fuel moisture shape of {M_f.shape} should be (H, W) or "
+                f"(T, H, W) with (H, W) matching the terrain shape of "
+                f"{self.terrain.screen_size}"
+            )
+        return M_f
+
+    def _update_moisture(self) -> None:
+        """
+        Sample the fuel moisture stack at the current elapsed time. The
+        moisture-dependent Rothermel coefficients are only re-computed when the
+        sampled moisture slice changes.
+        """
+        idx = min(
+            int(self.elapsed_time // self.environment.M_f_interval),
+            self.M_f_stack.shape[0] - 1,
+        )
+        if idx == self._moisture_idx:
+            return
+        self._moisture_idx = idx
+        self.M_f = np.asarray(self.M_f_stack[idx])
+        self.eta_M, self.Q_ig = compute_moisture_coefficients(self.M_f, self.M_x)
+
+    def _get_step_time(
+        self, R: np.ndarray, max_step_time: Optional[float] = None
+    ) -> float:
+        """
+        Get the amount of time for the current update step. With adaptive steps, this
+        is a CFL-like bound so that the fastest location on the fire frontier burns at
+        most `self.cfl` pixels, capped at `self.max_step` and `max_step_time`.
+
+        Arguments:
+            R: The rate of spread (ft/min) for each new location on the fire frontier
+            max_step_time: The longest the update step can take (minutes)
+
+        Returns:
+            The amount of time in minutes for the current update step
+        """
+        if not self.adaptive_step:
+            return self.update_rate
+        max_step = self.max_step
+        if max_step_time is not None:
+            max_step = min(max_step, max_step_time)
+        max_R = float(R.max()) if R.size > 0 else 0.0
+        if max_R <= 0:
+            return max_step
+        return min(self.cfl * self.pixel_scale / max_R, max_step)
+
+    def _get_idle_step_time(self, max_step_time: Optional[float] = None) -> float:
+        """
+        Get the amount of time for an update step in which the fire does not spread.
+
+        Arguments:
+            max_step_time: The longest the update step can take (minutes). Only used
+                           with adaptive steps.
+
+        Returns:
+            The amount of time in minutes for the update step
+        """
+        if self.adaptive_step and max_step_time is not None:
+            return min(self.update_rate, max_step_time)
+        return self.update_rate
+
     def _compute_slopes(self) -> Tuple[np.ndarray, np.ndarray]:
         """
         Compute the gradient/slope magnitude and direction for every point for use
@@ -446,7 +869,9 @@ class RothermelFireManager(FireManager):
         grad_y, grad_x = np.gradient(self.terrain.elevations, self.pixel_scale)
         grad_mag = np.sqrt(grad_x**2 + grad_y**2)
         grad_dir = np.arctan2(grad_y, grad_x + 0.000001)
-        return grad_mag, grad_dir
+        return grad_mag.astype(self.dtype, copy=False), grad_dir.astype(
+            self.dtype, copy=False
+        )
 
     def _accrue_sprites(
         self, sprite_idx: int, fire_map: np.ndarray
@@ -487,11 +912,8 @@ class RothermelFireManager(FireManager):
         S_e = [self.fuel_particle.S_e] * num_locs
         p_p = [self.fuel_particle.p_p] * num_locs
         # Set the Environment parameters into arrays
-        M_f = [self.environment.M_f] * num_locs
-        U = []
-        U.extend(list(self.U[new_locs_uzip[::-1]]))
-        U_dir = []
-        U_dir.extend(list(self.U_dir[new_locs_uzip[::-1]]))
+        M_f = self.M_f[new_locs_uzip[::-1]].tolist()
+        U, U_dir = self._get_wind(new_loc_y, new_loc_x)
         # Set the slope parameters into arrays
         slope_mag = self.slope_mag[new_locs_uzip[::-1]].tolist()
         slope_dir = self.slope_dir[new_locs_uzip[::-1]].tolist()
@@ -534,7 +956,7 @@ class RothermelFireManager(FireManager):
             containing the information in a vectorized/multiprocessing format
         """
         if len(self.sprites) == 1:  # single burning pixel case (first sim step typically)
-            arr = np.asarray(all_params, dtype=np.float32)
+            arr = np.asarray(all_params, dtype=self.dtype)
             arr = np.reshape(arr, (arr.shape[1], arr.shape[0] * arr.shape[2]))
         else:  # Multiple burning pixels
             num_params_per_example = len(all_params[0])
@@ -543,7 +965,7 @@ class RothermelFireManager(FireManager):
                 np.hstack([x[i] for x in all_params])  # type: ignore
                 for i in range(num_params_per_example)
             ]
-            arr = np.asarray(list_arr, dtype=np.float32)
+            arr = np.asarray(list_arr, dtype=self.dtype)
 
         return [arr[i, :] for i in range(arr.shape[0])]
 
@@ -613,7 +1035,9 @@ class RothermelFireManager(FireManager):
 
         return fig
 
-    def update(self, fire_map: np.ndarray) -> Tuple[np.ndarray, GameStatus]:
+    def update(
+        self, fire_map: np.ndarray, max_step_time: Optional[float] = None
+    ) -> Tuple[np.ndarray, GameStatus]:
         """
         Update the spreading of the fires. This function will remove
         any fires that have exceded their duration and will spread fires
@@ -623,32 +1047,51 @@ class RothermelFireManager(FireManager):
         Arguments:
             fire_map: The numpy array that tracks the fire's burn status for
                       each pixel in the simulation
+            max_step_time: The longest this update can take in minutes (e.g. the
+                           time left until the end of a run). Only used with
+                           adaptive steps.
 
         Returns:
             A NumPy array of the updated `fire_map` and the current `GameStatus`
         """
+        # Start any ignitions that are scheduled for the current time
+        fire_map = self._ignite(fire_map, self.elapsed_time)
         # Remove all fires that are past the max duration
         self._prune_sprites(fire_map)
-        # Increment the durations
-        self.durations = list(map(lambda x: x + 1, self.durations))
         num_sprites = len(self.sprites)
 
-        # If the number of sprites is 0, quit the sim
+        # If the number of sprites is 0, quit the sim unless there are still
+        # ignitions scheduled for later
         if num_sprites == 0:
-            return fire_map, GameStatus.QUIT
+            if self.pending_ignitions.shape[0] == 0:
+                return fire_map, GameStatus.QUIT
+            step_time = self._get_idle_step_time(max_step_time)
+            self.elapsed_time += step_time
+            self.step_times.append(step_time)
+            return fire_map, GameStatus.RUNNING
 
         # If we've reached the end time, quit the sim
         if self.max_time is not None:
             if self.update_rate > self.max_time or self.elapsed_time > self.max_time:
                 return fire_map, GameStatus.QUIT
 
+        # Sample the fuel moisture and wind for the current time
+        self._update_moisture()
+        self._update_wind()
+
         sprite_idxs = list(range(num_sprites))
 
         all_params = [self._accrue_sprites(idx, fire_map) for idx in sprite_idxs]
         all_params = list(filter(None, all_params))
 
-        # Sprites exist, but there are no new locations to spread to
+        # Sprites exist, but there are no new locations to spread to, so the fires
+        # only burn for an update
         if len(all_params) == 0:
+            step_time = self._get_idle_step_time(max_step_time)
+            step_updates = step_time / self.update_rate
+            self.durations = list(map(lambda x: x + step_updates, self.durations))
+            self.elapsed_time += step_time
+            self.step_times.append(step_time)
             return fire_map, GameStatus.RUNNING
 
         [
@@ -671,6 +1114,10 @@ class RothermelFireManager(FireManager):
             slope_dir,
         ] = self._flatten_params(all_params)
 
+        # Create integer y_coords and x_coords
+        y_coords = new_loc_y.astype(int)
+        x_coords = new_loc_x.astype(int)
+
         # Compute the rate of spread with vectorized function
         R = compute_rate_of_spread(
             loc_x,
@@ -690,14 +1137,18 @@ class RothermelFireManager(FireManager):
             U_dir,
             slope_mag,
             slope_dir,
+            eta_M=self.eta_M[y_coords, x_coords],
+            Q_ig=self.Q_ig[y_coords, x_coords],
         )
 
-        # Scale the rate of spread by the update rate
-        R *= self.update_rate
+        # Scale the rate of spread by the amount of time for this update
+        step_time = self._get_step_time(R, max_step_time)
+        R *= step_time
 
-        # Create integer y_coords and x_coords
-        y_coords = new_loc_y.astype(int)
-        x_coords = new_loc_x.astype(int)
+        # Increment the durations by the fraction of an update this step takes, so
+        # fires burn for the same amount of time whatever the length of the steps
+        step_updates = step_time / self.update_rate
+        self.durations = list(map(lambda x: x + step_updates, self.durations))
 
         # Create a rate_of_spread variable that takes the same shape as self.burn_amounts
         # and fire_map
@@ -706,7 +1157,9 @@ class RothermelFireManager(FireManager):
 
         # Update the burn_amounts dependent on if there are control lines there
         # And only update if specified in the class
-        self.rate_of_spread = self._update_rate_of_spread(rate_of_spread, fire_map)
+        self.rate_of_spread = self._update_rate_of_spread(
+            rate_of_spread, fire_map, step_time / self.update_rate
+        )
         self.burn_amounts += self.rate_of_spread
 
         # Update the fire_map with new burning locations and update self.sprites and
@@ -714,7 +1167,8 @@ class RothermelFireManager(FireManager):
         fire_map = self._update_with_new_locs(y_coords, x_coords, fire_map)
 
         # Save the new elapsed_time value
-        self.elapsed_time += self.update_rate
+        self.elapsed_time += step_time
+        self.step_times.append(step_time)
 
         return fire_map, GameStatus.RUNNING
 
@@ -726,10 +1180,12 @@ class ConstantSpreadFireManager(FireManager):
 
     def __init__(
         self,
-        init_pos: Tuple[int, int],
+        init_pos: Union[Tuple[int, int], IgnitionsType],
         fire_size: int,
         max_fire_duration: int,
         rate_of_spread: int,
+        update_rate: float = 1.0,
+        screen_size: Optional[Tuple[int, int]] = None,
     ) -> None:
         """
         Initialize the class by recording the initial fire location and size.
@@ -737,7 +1193,8 @@ class ConstantSpreadFireManager(FireManager):
         initial fire.
 
         Arguments:
-            init_pos: The (x,y) location of the initial fire
+            init_pos: The (x,y) location of the initial fire, or an array of (x, y) or
+                      (x, y, time) ignitions. See `FireManager.add_ignitions()`.
             fire_size: The (n,n) pixel size of the fire sprite. Note that
                        the sprite pixel size does not affect which tiles/pixels
                        are actually burning. This is for display purposes only.
@@ -748,9 +1205,15 @@ class ConstantSpreadFireManager(FireManager):
                                interior do not have to keep being rendered.
             rate_of_spread: The number of frames that must pass before a fire
                             can spread to adjacent pixels.
+            update_rate: The amount of time in minutes that passes for each update.
+                         This is used to start timed ignitions.
+            screen_size: The (height, width) of the `fire_map`. If given, ignitions at
+                         time 0 that are outside of the map are dropped.
         """
-        super().__init__(init_pos, fire_size, max_fire_duration)
+        super().__init__(init_pos, fire_size, max_fire_duration, screen_size=screen_size)
         self.rate_of_spread = rate_of_spread
+        self.update_rate = update_rate
+        self.elapsed_time = 0.0
 
     def update(self, fire_map: np.ndarray) -> np.ndarray:
         """
@@ -765,6 +1228,8 @@ class ConstantSpreadFireManager(FireManager):
         Returns:
             An updated NumPy array of the current `fire_map`
         """
+        # Start any ignitions that are scheduled for the current time
+        fire_map = self._ignite(fire_map, self.elapsed_time)
         self._prune_sprites(fire_map)
         for sprite, duration in zip(self.sprites, self.durations):
             x, y = sprite.rect.x, sprite.rect.y
@@ -783,5 +1248,6 @@ class ConstantSpreadFireManager(FireManager):
 
         # Increment the durations
         self.durations = list(map(lambda x: x + 1, self.durations))
+        self.elapsed_time += self.update_rate
 
         return fire_map
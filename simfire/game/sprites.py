@@ -1,21 +1,25 @@
-import os
-import sys
-import tempfile
+import hashlib
+from collections import OrderedDict
 from typing import Any, Optional, Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pygame
-from reportlab.graphics import renderPM
-from svglib.svglib import svg2rlg
-from wurlitzer import pipes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
 from ..enums import BURNED_RGB_COLOR, BurnStatus, SpriteLayer
+from ..utils.cache import LayerCache, cache_version
 from ..utils.layers import FuelLayer, HistoricalLayer, TopographyLayer
 from ..utils.log import create_logger
 
 log = create_logger(__name__)
 
+# Terrain images keyed by a hash of the elevation data, fuel image, and screen size.
+# Rendering the contours is by far the slowest part of creating a Terrain, and the
+# same terrain is re-created on every simulation reset
+TERRAIN_IMAGE_CACHE_SIZE = 8
+_terrain_image_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
 
 class Terrain(pygame.sprite.Sprite):
     """
@@ -32,6 +36,8 @@ class Terrain(pygame.sprite.Sprite):
         screen_size: Tuple[int, int],
         headless: bool = False,
         historical_layer: Optional[HistoricalLayer] = None,
+        precision: str = "float32",
+        cache: Optional[LayerCache] = None,
     ) -> None:
 
         super().__init__()
@@ -42,8 +48,12 @@ class Terrain(pygame.sprite.Sprite):
 
         self.screen_size = screen_size
         self.headless = headless
+        # The on-disk cache for the terrain image, in addition to the in-memory cache
+        self.cache = cache
 
-        self.elevations = self.topo_layer.data.squeeze()
+        # Store the elevations in the simulation precision so that the slopes computed
+        # from them by the fire manager do not up-cast the Rothermel calculation
+        self.elevations = self.topo_layer.data.squeeze().astype(precision, copy=False)
         self.fuels = self.fuel_layer.data.squeeze()
 
         self.image: Optional[pygame.surface.Surface]
@@ -127,22 +137,44 @@ class Terrain(pygame.sprite.Sprite):
         terrain background image. This will show the FuelLayer as the landscape/overhead
         view, with the contour lines overlaid on top.
 
+        The image is rendered directly into a buffer of exactly `screen_size` pixels
+        with the Agg backend. Images are cached by the terrain data in memory and in
+        `self.cache` (if given), so re-creating the same terrain does not render it
+        again. The on-disk cache is bounded by the size limit of `self.cache`.
+
         Arguments:
             None
 
         Returns:
             out_image: The input image with the contour lines drawn on it
         """
-        image = self.fuel_layer.image.squeeze()
-
-        # Create a figure with axes
-        fig, ax = plt.subplots()
-
-        # the decimal points look messy)
-        contours = ax.contour(
-            self.topo_layer.data.squeeze(), origin="upper", colors="black"
-        )
-
+        image = self.fuel_layer.image.squeeze().astype(np.uint8)
+        elevations = self.topo_layer.data.squeeze()
+
+        key = self._terrain_image_key(image, elevations)
+        if key in _terrain_image_cache:
+            _terrain_image_cache.move_to_end(key)
+            return _terrain_image_cache[key].copy()
+        if self.cache is not None:
+            cached_img = self.cache.load(key, "terrain_image")
+            if cached_img is not None and cached_img.shape == image.shape:
+                out_img = np.array(cached_img, dtype=np.uint8)
+                self._cache_terrain_image(key, out_img)
+                return out_img.copy()
+
+        height, width = self.screen_size
+        dpi = 100
+        # Use a Figure directly instead of pyplot so that no global figure state is
+        # created, and have the axes fill the entire figure
+        fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_axes((0, 0, 1, 1))
+        ax.set_axis_off()
+        # The fuel image is drawn fully transparent, so the terrain background is the
+        # contour lines on white
+        ax.imshow(image, interpolation="nearest", aspect="auto", alpha=0.0)
+
+        contours = ax.contour(elevations, origin="upper", colors="black")
         # The fmt argument will display the levels as whole numbers (otherwise
         # the decimal points look messy)
         ax.clabel(
@@ -152,7 +184,8 @@ class Terrain(pygame.sprite.Sprite):
             fmt=lambda x: f"{x:.0f}",
             fontsize="small",
         )
-        ax.imshow(image.astype(np.uint8), alpha=np.zeros(image.shape[:2]))
+        ax.set_xlim(-0.5, width - 0.5)
+        ax.set_ylim(height - 0.5, -0.5)
 
         # plot the historical perimeters
         # TODO: Not plotting in the correct order
@@ -162,37 +195,49 @@ class Terrain(pygame.sprite.Sprite):
         #     ax.imshow(perimeter_image[...,:3].astype(np.uint8),
         #               alpha=np.uint8(perimeter_image[...,3]/255))
 
-        plt.axis("off")
-
-        # Save the figure as a vector graphic to get just the image (no axes,
-        # ticks, figure edges, etc.)
-        # Then load it, resize, and convert to numpy
-        # Added `with pipes():` to get rid of 'colinear!' message output by C library
-        # in svglib:
-        # https://github.com/Distrotech/reportlab/search?q=colinear%21
-        with pipes():
-            with tempfile.NamedTemporaryFile(suffix=".svg") as out_img_path:
-                fig.savefig(out_img_path.name, bbox_inches="tight", pad_inches=0)
-
-                drawing = svg2rlg(out_img_path.name)
-
-                # Resize the SVG drawing
-                scale_x = image.shape[1] / drawing.width
-                scale_y = image.shape[0] / drawing.height
-                drawing.width = drawing.width * scale_x
-                drawing.height = drawing.height * scale_y
-                drawing.scale(scale_x, scale_y)
-                # Convert to Pillow
-                # The fmt argument will display the levels as whole numbers (otherwise
-                # sending stdout to devnull to avoid the annoying `x_order_1: collinear!`
-                sys.stdout = open(os.devnull, "w")
-                out_img_pil = renderPM.drawToPIL(drawing)
-                sys.stdout = sys.__stdout__
-        plt.close(fig)
+        canvas.draw()
         # Slice the alpha channel off
-        out_img = np.array(out_img_pil, dtype=np.uint8)[..., :3]
+        out_img = np.array(canvas.buffer_rgba(), dtype=np.uint8)[..., :3]
+
+        self._cache_terrain_image(key, out_img)
+        if self.cache is not None:
+            self.cache.save(key, "terrain_image", out_img)
+
+        return out_img.copy()
+
+    def _cache_terrain_image(self, key: str, image: np.ndarray) -> None:
+        """
+        Add a terrain image to the in-memory cache, removing the least recently used
+        image if the cache is full.
+
+        Arguments:
+            key: The terrain image key from `_terrain_image_key()`
+            image: The rendered terrain image
+        """
+        _terrain_image_cache[key] = image
+        if len(_terrain_image_cache) > TERRAIN_IMAGE_CACHE_SIZE:
+            _terrain_image_cache.popitem(last=False)
+
+    def _terrain_image_key(self, image: np.ndarray, elevations: np.ndarray) -> str:
+        """
+        Hash the terrain data used to render the terrain image, and the version of the
+        code that renders it.
+
+        Arguments:
+            image: The fuel layer image
+            elevations: The topography layer elevations
 
-        return out_img
+        Returns:
+            A hex digest that identifies the terrain image
+        """
+        terrain_hash = hashlib.sha1()
+        terrain_hash.update(cache_version("terrain_image").encode())
+        terrain_hash.update(str(self.screen_size).encode())
+        for arr in (image, elevations):
+            arr = np.ascontiguousarray(arr)
+            terrain_hash.update(f"{arr.shape}{arr.dtype}".encode())
+            terrain_hash.update(arr.data)
+        return terrain_hash.hexdigest()
 
 
 class Fire(pygame.sprite.Sprite):
@@ -120,6 +120,23 @@ class FireSimulationTest(unittest.TestCase):
             "passed.",
         )
 
+    def test_run_adaptive_step(self) -> None:
+        """
+        Test that running for a length of time with adaptive steps runs until that much
+        simulation time has passed and reports the time of each step.
+        """
+        self.config_flat_simple.simulation.adaptive_step = True
+        self.config_flat_simple.simulation.update_rate = 10
+        simulation = FireSimulation(self.config_flat_simple)
+
+        _, active = simulation.run(time="25m")
+        self.assertGreater(len(simulation.step_times), 0)
+        self.assertTrue(all(t <= 10 for t in simulation.step_times))
+        self.assertAlmostEqual(sum(simulation.step_times), simulation.elapsed_time)
+        if active:
+            # The last step is shortened so the run ends at exactly 25 minutes
+            self.assertAlmostEqual(simulation.elapsed_time, 25)
+
     def test_agent_settings_reset(self) -> None:
         """
         Test that the call to `_reset_agents` which will check if self.agents
@@ -169,6 +186,29 @@ class FireSimulationTest(unittest.TestCase):
                 is currently populated",
         )
 
+    def test_set_fire_initial_position(self) -> None:
+        """
+        Test that several ignitions can be set at once and that later ignitions start
+        burning once their ignition time is reached. Ignitions off the map are dropped.
+        """
+        ignitions = np.array([[1, 1, 0], [7, 7, 0], [1, 7, 3], [-1, 7, 0]])
+        self.simulation_flat.set_fire_initial_position(ignitions)
+        self.simulation_flat.reset()
+
+        self.assertTupleEqual(self.config_flat_simple.fire.fire_initial_position, (1, 1))
+        self.assertEqual(self.simulation_flat.fire_map[1, 1], BurnStatus.BURNING)
+        self.assertEqual(self.simulation_flat.fire_map[7, 7], BurnStatus.BURNING)
+        self.assertEqual(self.simulation_flat.fire_map[7, 1], BurnStatus.UNBURNED)
+        # The ignition off the map does not wrap around to the last column
+        self.assertEqual(self.simulation_flat.fire_map[7, -1], BurnStatus.UNBURNED)
+        self.assertEqual(len(self.simulation_flat.fire_manager.sprites), 2)
+
+        fire_map, _ = self.simulation_flat.run(time=4)
+        self.assertNotEqual(fire_map[7, 1], BurnStatus.UNBURNED)
+
+        with self.assertRaises(ConfigError):
+            self.simulation_flat.set_fire_initial_position([[1, 1, 0, 0]])
+
     def test_get_seeds(self) -> None:
         """
         Test the get_seeds method and ensure it returns all available seeds
@@ -26,7 +26,7 @@ from ..game.managers.mitigation import (
     WetLineManager,
 )
 from ..game.sprites import Agent, Terrain
-from ..utils.config import Config
+from ..utils.config import Config, FirePositionType
 from ..utils.log import create_logger
 from ..utils.units import str_to_minutes
 from ..world.parameters import Environment, FuelParticle
@@ -210,6 +210,7 @@ class FireSimulation(Simulation):
         self._create_fire()
         self._create_mitigations()
         self.elapsed_steps = 0
+        self.step_times: List[float] = []
         self.fire_status: GameStatus = GameStatus.RUNNING
         self.active = True
 
@@ -231,6 +232,8 @@ class FireSimulation(Simulation):
             self.config.terrain.topography_layer,
             self.config.area.screen_size,
             headless=self.config.simulation.headless,
+            precision=self.config.simulation.precision,
+            cache=self.config.layer_cache,
         )
 
         self.environment = Environment(
@@ -275,7 +278,7 @@ class FireSimulation(Simulation):
         This function will initialize the fire strategies.
         """
         self.fire_manager = RothermelFireManager(
-            self.config.fire.fire_initial_position,
+            self.config.fire.ignitions,
             self.config.display.fire_size,
             self.config.fire.max_fire_duration,
             self.config.area.pixel_scale,
@@ -287,6 +290,10 @@ class FireSimulation(Simulation):
             attenuate_line_ros=self.config.mitigation.ros_attenuation,
             headless=self.config.simulation.headless,
             diagonal_spread=self.config.fire.diagonal_spread,
+            precision=self.config.simulation.precision,
+            adaptive_step=self.config.simulation.adaptive_step,
+            cfl=self.config.simulation.cfl,
+            max_step=self.config.simulation.max_step,
         )
         self.fire_sprites = self.fire_manager.sprites
 
@@ -512,6 +519,9 @@ class FireSimulation(Simulation):
             time: Either how many updates to run the simulation, based on the config
                   value, `config.simulation.update_rate`, or a length of time expressed
                   as a string (e.g. `120m`, `2h`, `2hour`, `2hours`, `1h 60m`, etc.)
+                  If `config.simulation.adaptive_step` is set, a length of time will
+                  run as many updates as are needed to reach that much simulation
+                  time.
 
         Returns:
             A tuple of the following:
@@ -519,20 +529,35 @@ class FireSimulation(Simulation):
                   range from [0, 6] (see simfire/enums.py:BurnStatus).
                 - A boolean indicating whether the simulation has reached the end.
         """
+        end_time: Optional[float] = None
+        total_updates: Union[int, float]
         if isinstance(time, str):
             # Convert the string to a number of minutes
             time = str_to_minutes(time)
-            # Then determine how many times to step through the loop
-            total_updates = round(time / self.config.simulation.update_rate)
+            if self.config.simulation.adaptive_step:
+                # The number of updates depends on the fire, so run until the
+                # requested amount of simulation time has passed
+                end_time = self.fire_manager.elapsed_time + time
+                total_updates = float("inf")
+            else:
+                # Then determine how many times to step through the loop
+                total_updates = round(time / self.config.simulation.update_rate)
         elif isinstance(time, int):
             total_updates = time
 
         num_updates = 0
         self.elapsed_time = self.fire_manager.elapsed_time
+        num_step_times = len(self.fire_manager.step_times)
 
         while self.fire_status == GameStatus.RUNNING and num_updates < total_updates:
+            if end_time is not None and self.elapsed_time >= end_time:
+                break
             self.fire_sprites = self.fire_manager.sprites
-            self.fire_map, self.fire_status = self.fire_manager.update(self.fire_map)
+            # Don't let the last adaptive step run past the end time
+            max_step_time = None if end_time is None else end_time - self.elapsed_time
+            self.fire_map, self.fire_status = self.fire_manager.update(
+                self.fire_map, max_step_time
+            )
             if self._rendering:
                 self._render()
             num_updates += 1
@@ -550,20 +575,32 @@ class FireSimulation(Simulation):
 
         self.active = True if self.fire_status == GameStatus.RUNNING else False
 
+        # The amount of simulation time (minutes) of each update in this run
+        self.step_times = self.fire_manager.step_times[num_step_times:]
+        if len(self.step_times) > 0:
+            log.info(
+                f"Ran {len(self.step_times)} updates with step times between "
+                f"{min(self.step_times):.3f} and {max(self.step_times):.3f} minutes"
+            )
+
         return self.fire_map, self.active
 
     def _create_fire_map(self) -> None:
         """
         Resets the `self.fire_map` attribute to entirely `BurnStatus.UNBURNED`,
-        except for self.config.fire.fire_initial_position, which is set to
-        `BurnStatus.BURNING`.
+        except for the ignitions in self.config.fire.ignitions that start at time 0,
+        which are set to `BurnStatus.BURNING`. Ignitions outside of the map are
+        dropped. Later ignitions are started by the fire manager.
         """
         self.fire_map = np.full(
             self.config.area.screen_size,
             BurnStatus.UNBURNED,
         )
-        x, y = self.config.fire.fire_initial_position
-        self.fire_map[y, x] = BurnStatus.BURNING
+        ignitions = self.config.fire.ignitions
+        x, y = ignitions[ignitions[:, 2] <= 0, :2].astype(int).T
+        height, width = self.fire_map.shape
+        in_bounds = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+        self.fire_map[y[in_bounds], x[in_bounds]] = BurnStatus.BURNING
 
     def _create_agent_positions(self) -> None:
         """
@@ -758,12 +795,14 @@ class FireSimulation(Simulation):
                 success = False
         return success
 
-    def set_fire_initial_position(self, pos: Tuple[int, int]) -> None:
+    def set_fire_initial_position(self, pos: FirePositionType) -> None:
         """
         Manually set the fire intial position for a static fire.
 
         Arguments:
-            pos: The (x, y) coordinates to start the fire at
+            pos: The (x, y) coordinates to start the fire at, or an array of (x, y) or
+                 (x, y, time) ignitions to start several fires at once. The time is
+                 the number of minutes into the simulation to start each fire.
         """
         self.config.reset_fire(pos=pos)
 
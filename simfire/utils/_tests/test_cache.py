@@ -0,0 +1,166 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from ...world.elevation_functions import gaussian
+from ...world.fuel_array_functions import chaparral_fn
+from ..cache import CACHE_VERSIONS, LayerCache, array_digest, layer_cache_key
+from ..layers import FunctionalFuelLayer, FunctionalTopographyLayer
+
+
+class TestLayerCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = LayerCache(self.tmp_dir.name)
+        self.screen_size = (16, 24)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+        return super().tearDown()
+
+    def test_layer_cache_key(self) -> None:
+        """
+        Test that the key depends on the function, kwargs, and screen size, and that
+        randomly seeded layers are not cached
+        """
+        kwargs = {"seed": 1, "range_min": 100}
+        key = layer_cache_key("topography", "perlin", kwargs, self.screen_size)
+        self.assertEqual(
+            key, layer_cache_key("topography", "perlin", dict(kwargs), self.screen_size)
+        )
+        self.assertNotEqual(
+            key, layer_cache_key("topography", "perlin", {"seed": 2}, self.screen_size)
+        )
+        self.assertNotEqual(key, layer_cache_key("topography", "perlin", kwargs, (8, 8)))
+        self.assertNotEqual(
+            key, layer_cache_key("fuel", "perlin", kwargs, self.screen_size)
+        )
+        self.assertIsNone(
+            layer_cache_key("fuel", "chaparral", {"seed": None}, self.screen_size)
+        )
+
+    def test_layer_cache_key_defaults(self) -> None:
+        """
+        Test that missing kwargs take the defaults of the layer function, so a layer
+        without a seed is not cached when the seed defaults to None
+        """
+        self.assertIsNone(
+            layer_cache_key("fuel", "chaparral", {}, self.screen_size, chaparral_fn)
+        )
+        key = layer_cache_key(
+            "fuel", "chaparral", {"seed": 3}, self.screen_size, chaparral_fn
+        )
+        self.assertIsNotNone(key)
+        self.assertEqual(
+            key,
+            layer_cache_key(
+                "fuel",
+                "chaparral",
+                {"seed": 3, "per_pixel": False},
+                self.screen_size,
+                chaparral_fn,
+            ),
+        )
+
+    def test_layer_cache_key_version(self) -> None:
+        """
+        Test that the key changes with the simfire version and the version of the
+        layer generator
+        """
+        key = layer_cache_key("topography", "perlin", {"seed": 1}, self.screen_size)
+        version_patch = mock.patch("simfire.utils.cache.SIMFIRE_VERSION", "0.0.0")
+        with version_patch:
+            self.assertNotEqual(
+                key,
+                layer_cache_key("topography", "perlin", {"seed": 1}, self.screen_size),
+            )
+        versions = dict(CACHE_VERSIONS, topography=CACHE_VERSIONS["topography"] + 1)
+        versions_patch = mock.patch.dict("simfire.utils.cache.CACHE_VERSIONS", versions)
+        with versions_patch:
+            self.assertNotEqual(
+                key,
+                layer_cache_key("topography", "perlin", {"seed": 1}, self.screen_size),
+            )
+
+    def test_array_digest(self) -> None:
+        """
+        Test that the digest depends on the data, shape and dtype of an array
+        """
+        arr = np.arange(24, dtype=np.float32).reshape(4, 6)
+        self.assertEqual(array_digest(arr), array_digest(arr.copy()))
+        self.assertNotEqual(array_digest(arr), array_digest(arr + 1))
+        self.assertNotEqual(array_digest(arr), array_digest(arr.reshape(1, -1)))
+        self.assertNotEqual(array_digest(arr), array_digest(arr.astype(np.float64)))
+
+    def test_save_load(self) -> None:
+        """
+        Test that saved arrays are loaded as read-only memory maps
+        """
+        arr = np.random.rand(*self.screen_size)
+        self.assertIsNone(self.cache.load("key", "arr"))
+        self.cache.save("key", "arr", arr)
+        loaded = self.cache.load("key", "arr")
+        self.assertIsInstance(loaded, np.memmap)
+        self.assertFalse(loaded.flags.writeable)
+        np.testing.assert_array_equal(loaded, arr)
+
+    def test_max_size(self) -> None:
+        """
+        Test that the least recently used entries are removed when the cache is larger
+        than its maximum size
+        """
+        arr = np.zeros(1000)
+        cache = LayerCache(self.tmp_dir.name, max_size=int(2.5 * arr.nbytes))
+        for key in ("a", "b"):
+            cache.save(key, "arr", arr)
+        # Make "b" the least recently used entry, whatever the timestamp resolution
+        os.utime(cache.path / "b", (0, 0))
+        cache.save("c", "arr", arr)
+        self.assertIsNotNone(cache.load("a", "arr"))
+        self.assertIsNone(cache.load("b", "arr"))
+        self.assertIsNotNone(cache.load("c", "arr"))
+
+    def test_topography_layer(self) -> None:
+        """
+        Test that a FunctionalTopographyLayer is loaded from the cache
+        """
+        fn = gaussian(100, 8, 8, 4, 4)
+        key = layer_cache_key("topography", "gaussian", {}, self.screen_size)
+        layer = FunctionalTopographyLayer(
+            *self.screen_size, fn, "gaussian", cache=self.cache, cache_key=key
+        )
+
+        def fail_fn(x, y):
+            raise AssertionError("The elevation function should not be called")
+
+        cached_layer = FunctionalTopographyLayer(
+            *self.screen_size, fail_fn, "gaussian", cache=self.cache, cache_key=key
+        )
+        np.testing.assert_array_equal(cached_layer.data, layer.data)
+
+    def test_fuel_layer(self) -> None:
+        """
+        Test that a FunctionalFuelLayer is loaded from the cache
+        """
+        key = layer_cache_key("fuel", "chaparral", {"seed": 3}, self.screen_size)
+        layer = FunctionalFuelLayer(
+            *self.screen_size,
+            chaparral_fn(3),
+            "chaparral",
+            cache=self.cache,
+            cache_key=key,
+        )
+
+        def fail_fn(x, y):
+            raise AssertionError("The fuel function should not be called")
+
+        cached_layer = FunctionalFuelLayer(
+            *self.screen_size, fail_fn, "chaparral", cache=self.cache, cache_key=key
+        )
+        np.testing.assert_array_equal(cached_layer.image, layer.image)
+        np.testing.assert_array_equal(cached_layer.fuel_grid.w_0, layer.fuel_grid.w_0)
+        self.assertEqual(cached_layer.data[2, 5, 0], layer.data[2, 5, 0])
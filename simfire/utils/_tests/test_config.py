@@ -1,9 +1,15 @@
+import tempfile
 import unittest
+from copy import deepcopy
 from pathlib import Path
+from unittest import mock
 
+import numpy as np
 import yaml
 
-from ..config import Config
+from ..config import Config, ConfigError
+from ...world.wind_mechanics.wind_library import REFERENCE_WIND_SPEED
+from ..units import mph_to_ftpm, scale_ms_to_ftpm
 
 
 class ConfigTest(unittest.TestCase):
@@ -48,6 +54,138 @@ class ConfigTest(unittest.TestCase):
             f"not match the test seed of {new_topo_seed}",
         )
 
+    def test_lazy_sections(self) -> None:
+        """
+        Test that the expensive sections are only loaded on first access, and are
+        loaded again after being reset
+        """
+        lazy_sections = ["landfire_lat_long_box", "area", "terrain", "fire", "wind"]
+        for name in lazy_sections:
+            self.assertNotIn(name, self.cfg.__dict__)
+
+        terrain = self.cfg.terrain
+        self.assertIn("area", self.cfg.__dict__)
+        self.assertIs(self.cfg.terrain, terrain)
+        wind = self.cfg.wind
+
+        self.cfg.reset_terrain(topography_seed=1234)
+        self.assertNotIn("terrain", self.cfg.__dict__)
+        self.assertIsNot(self.cfg.terrain, terrain)
+        self.assertEqual(self.cfg.terrain.topography_function.kwargs["seed"], 1234)
+        # The perlin wind does not depend on the topography, and the screen size is
+        # the same, so it is kept
+        self.assertIs(self.cfg.wind, wind)
+
+        self.cfg.reset_wind(speed_seed=1234)
+        self.assertNotIn("wind", self.cfg.__dict__)
+        self.assertIsNot(self.cfg.wind, wind)
+
+    def test_cfd_wind_cache(self) -> None:
+        """
+        Test that the trained CFD wind is loaded from the cache for the same terrain and
+        inflow, and is trained again when the inflow changes
+        """
+        screen_size = tuple(self.true_yaml_data["area"]["screen_size"])
+        trained = (np.full(screen_size, 5.0), np.full(screen_size, 180.0))
+        train_patch = mock.patch(
+            "simfire.utils.config.train_cfd_wind", return_value=trained
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir, train_patch as train:
+            yaml_data = deepcopy(self.true_yaml_data)
+            yaml_data["simulation"]["sf_home"] = tmp_dir
+            yaml_data["wind"]["function"] = "cfd"
+            yaml_data["wind"]["cfd"]["result_accuracy"] = 1
+
+            wind = Config(config_dict=deepcopy(yaml_data)).wind
+            cached_wind = Config(config_dict=deepcopy(yaml_data)).wind
+            self.assertEqual(train.call_count, 1)
+            np.testing.assert_array_equal(cached_wind.speed, wind.speed)
+            np.testing.assert_array_equal(cached_wind.direction, 180.0)
+
+            yaml_data["wind"]["cfd"]["direction"] = "east"
+            Config(config_dict=deepcopy(yaml_data)).wind
+            self.assertEqual(train.call_count, 2)
+
+            # The north and east sectors around a 45 degree inflow are trained at the
+            # reference speed, and scaled to the inflow speed
+            yaml_data["wind"]["cfd"]["direction"] = 45.0
+            yaml_data["wind"]["cfd"]["sector_size"] = 90
+            sector_wind = Config(config_dict=deepcopy(yaml_data)).wind
+            self.assertEqual(train.call_count, 4)
+            np.testing.assert_allclose(sector_wind.direction, 180.0)
+            speed = yaml_data["wind"]["cfd"]["speed"]
+            np.testing.assert_allclose(
+                sector_wind.speed,
+                scale_ms_to_ftpm(
+                    np.full(screen_size, 5.0 * speed / REFERENCE_WIND_SPEED)
+                ),
+            )
+
+            # Changing the speed only scales the trained sectors
+            yaml_data["wind"]["cfd"]["speed"] = 2 * speed
+            faster_wind = Config(config_dict=deepcopy(yaml_data)).wind
+            self.assertEqual(train.call_count, 4)
+            np.testing.assert_allclose(faster_wind.speed, 2 * sector_wind.speed)
+
+            # The wind is trained again when the wind cache is turned off
+            yaml_data["simulation"]["cache_wind"] = False
+            yaml_data["wind"]["cfd"]["direction"] = "east"
+            del yaml_data["wind"]["cfd"]["sector_size"]
+            Config(config_dict=deepcopy(yaml_data)).wind
+            self.assertEqual(train.call_count, 5)
+
+    def test_diagnostic_wind(self) -> None:
+        """
+        Test that the diagnostic wind is adjusted to the terrain and keeps the
+        domain-average speed
+        """
+        yaml_data = deepcopy(self.true_yaml_data)
+        yaml_data["wind"]["function"] = "diagnostic"
+        wind = Config(config_dict=deepcopy(yaml_data)).wind
+        screen_size = tuple(yaml_data["area"]["screen_size"])
+        self.assertEqual(wind.speed.shape, screen_size)
+        self.assertEqual(wind.direction.shape, screen_size)
+        self.assertAlmostEqual(float(wind.speed.mean()), mph_to_ftpm(7), places=3)
+        self.assertGreater(float(wind.speed.std()), 0)
+        assert wind.speed_function is not None
+        self.assertEqual(wind.speed_function.name, "diagnostic")
+
+        # The wind is adjusted to the new topography after the terrain is reset
+        cfg = Config(config_dict=deepcopy(yaml_data))
+        speed = cfg.wind.speed
+        cfg.reset_terrain(topography_seed=1234)
+        self.assertFalse(np.array_equal(cfg.wind.speed, speed))
+        self.assertAlmostEqual(float(cfg.wind.speed.mean()), mph_to_ftpm(7), places=3)
+
+        yaml_data["wind"]["diagnostic"]["slope_factor"] = 2.0
+        with self.assertRaises(ConfigError):
+            Config(config_dict=deepcopy(yaml_data)).wind
+
+    def test_reset_terrain_cfd_wind(self) -> None:
+        """
+        Test that the CFD wind is trained again for the new topography after the
+        terrain is reset
+        """
+        screen_size = tuple(self.true_yaml_data["area"]["screen_size"])
+        trained = [
+            (np.full(screen_size, 5.0), np.full(screen_size, 180.0)),
+            (np.full(screen_size, 6.0), np.full(screen_size, 90.0)),
+        ]
+        train_patch = mock.patch(
+            "simfire.utils.config.train_cfd_wind", side_effect=trained
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir, train_patch as train:
+            yaml_data = deepcopy(self.true_yaml_data)
+            yaml_data["simulation"]["sf_home"] = tmp_dir
+            yaml_data["wind"]["function"] = "cfd"
+            yaml_data["wind"]["cfd"]["result_accuracy"] = 1
+            cfg = Config(config_dict=yaml_data)
+            np.testing.assert_array_equal(cfg.wind.direction, 180.0)
+
+            cfg.reset_terrain(topography_seed=1234)
+            np.testing.assert_array_equal(cfg.wind.direction, 90.0)
+            self.assertEqual(train.call_count, 2)
+
     def test_dict_argument(self) -> None:
         """
         Test using the dictionary as an argument to the Config class
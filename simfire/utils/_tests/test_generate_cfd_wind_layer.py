@@ -0,0 +1,43 @@
+import unittest
+
+import numpy as np
+
+from ...world.wind_mechanics.wind_controller import WindControllerCFD
+from ..generate_cfd_wind_layer import (
+    generate_direction_array,
+    generate_magnitude_array,
+    train_cfd_wind,
+)
+
+
+class TestGenerateCFDWindLayer(unittest.TestCase):
+    def test_conversion(self) -> None:
+        """
+        Test that velocities on a non-square grid are converted to the speed and the
+        direction the wind blows toward
+        """
+        velocity_x = np.array([[3.0, 0.0, -2.0], [0.0, 1.0, 0.0]])
+        velocity_y = np.array([[4.0, -5.0, 0.0], [2.0, -1.0, 0.0]])
+        magnitude = generate_magnitude_array(velocity_x, velocity_y)
+        np.testing.assert_allclose(magnitude, [[5, 5, 2], [2, np.sqrt(2), 0]])
+
+        direction = generate_direction_array(velocity_x, velocity_y)
+        self.assertEqual(direction.shape, (2, 3))
+        # The first axis (rows) points south and the second axis (columns) east
+        expected = [
+            [90 + np.degrees(np.arctan2(3, 4)), 270, 0],
+            [90, 225, 0],
+        ]
+        np.testing.assert_allclose(direction, expected)
+
+    def test_train_cfd_wind_headless(self) -> None:
+        """
+        Test that the CFD wind trains on a non-square grid without a display
+        """
+        cfd_setup = WindControllerCFD(screen_size=(12, 20), wind_speed=2.0)
+        with self.assertLogs("simfire.utils.generate_cfd_wind_layer", "INFO") as logs:
+            magnitude, direction = train_cfd_wind(1, cfd_setup, progress_interval=0.2)
+        self.assertEqual(magnitude.shape, (12, 20))
+        self.assertEqual(direction.shape, (12, 20))
+        self.assertGreater(magnitude.max(), 0)
+        self.assertTrue(any("ms per step" in message for message in logs.output))
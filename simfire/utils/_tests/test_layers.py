@@ -1,18 +1,37 @@
 import shutil
+import tempfile
 import unittest
+from pathlib import Path
+from types import SimpleNamespace
 
+import geopandas
 import matplotlib as mpl
 import numpy as np
-
+import tifffile
+from PIL import Image
+from shapely.geometry import box
+
+from ...enums import (
+    COLORS,
+    DRY_TERRAIN_BROWN_IMG,
+    BurnStatus,
+    FuelModelRGB13,
+    FuelModelToFuel,
+)
 from ...utils.log import create_logger
 from ...world.fuel_array_functions import chaparral_fn
+from ...world.parameters import Fuel
 from ..layers import (
     DataLayer,
     FunctionalBurnProbabilityLayer,
     FunctionalFuelLayer,
     FunctionalTopographyLayer,
+    HistoricalLayer,
     LandFireLatLongBox,
+    OperationalFuelLayer,
     TopographyLayer,
+    get_closest_indice,
+    get_closest_indices,
 )
 
 log = create_logger(__name__)
@@ -55,6 +74,40 @@ class TestLandFireLatLongBox(unittest.TestCase):
             shutil.rmtree(f"{self.lat_long_box.output_path}")
 
 
+class TestLandFireWindowedRead(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(42)
+        fuel = rng.choice([1, 4, 91], size=(40, 50)).astype(np.int16)
+        topography = rng.integers(0, 1000, size=(40, 50)).astype(np.int16)
+        self.data = np.stack([fuel, topography], axis=-1)
+        tifffile.imwrite(Path(self.tmp_dir.name) / "data.tif", self.data)
+        # Only the data loading is tested, so the LandFire query is skipped
+        self.lat_long_box = LandFireLatLongBox.__new__(LandFireLatLongBox)
+        self.lat_long_box.output_path = Path(self.tmp_dir.name)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+        return super().tearDown()
+
+    def test__make_data_window(self) -> None:
+        """
+        Test that reading a window of the tif matches cropping the full tif
+        """
+        self.lat_long_box._make_data()
+        full_fuel = self.lat_long_box.fuel
+        full_topography = self.lat_long_box.topography
+
+        self.lat_long_box._make_data((20, 30))
+        np.testing.assert_array_equal(self.lat_long_box.fuel, full_fuel[:20, :30])
+        np.testing.assert_array_equal(
+            self.lat_long_box.topography, full_topography[:20, :30]
+        )
+        # The roads/urban fuel should be expanded
+        self.assertGreater((full_fuel == 91).sum(), (self.data[..., 0] == 91).sum())
+
+
 class TestDataLayer(unittest.TestCase):
     def setUp(self) -> None:
         self.layer = DataLayer()
@@ -125,6 +178,39 @@ class TestFunctionalTopograpyLayer(unittest.TestCase):
             f"but should have shape {correct_data_shape}",
         )
 
+    def test_data_scalar_fn(self) -> None:
+        """
+        Test that a function that only accepts scalar inputs is computed per point
+        """
+
+        def scalar_fn(x: int, y: int) -> float:
+            return float(max(x, y))
+
+        height = self.screen_size[0]
+        width = self.screen_size[1]
+        layer = FunctionalTopographyLayer(height, width, scalar_fn, name="test")
+        X, Y = np.meshgrid(np.arange(width), np.arange(height))
+        np.testing.assert_array_equal(layer.data[..., 0], np.maximum(X, Y))
+
+    def test_data_fn_errors(self) -> None:
+        """
+        Test that errors from the elevation function are raised instead of falling
+        back to calling it for each point
+        """
+
+        def broken_fn(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+            raise ValueError("broken")
+
+        def wrong_shape_fn(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+            return np.zeros(3)
+
+        height = self.screen_size[0]
+        width = self.screen_size[1]
+        for fn in (broken_fn, wrong_shape_fn):
+            with self.subTest(fn=fn.__name__):
+                with self.assertRaises(ValueError):
+                    FunctionalTopographyLayer(height, width, fn, name="test")
+
 
 class TestFuelLayer(unittest.TestCase):
     def setUp(self) -> None:
@@ -139,6 +225,24 @@ class TestOperationalFuelLayer(unittest.TestCase):
         As long as LatLongBox tests run, This layer will be accurate.
         """
 
+    def test_lookup_tables(self) -> None:
+        """
+        Test that the fuel model codes are mapped to the correct fuels and colors
+        """
+        codes = np.array([[1, 4, 91], [-9999, 13, 32767]], dtype=np.int16)
+        lat_long_box = SimpleNamespace(fuel=codes, layers=("fuel", "topographic"))
+        layer = OperationalFuelLayer(lat_long_box)
+
+        for (i, j), code in np.ndenumerate(codes):
+            self.assertIs(layer.data[i, j], FuelModelToFuel[code])
+            np.testing.assert_array_equal(
+                layer.image[i, j], np.array(FuelModelRGB13[code]) * 255.0
+            )
+
+        lat_long_box.fuel = np.array([[1, 50]])
+        with self.assertRaises(ValueError):
+            OperationalFuelLayer(lat_long_box)
+
 
 class TestFunctionalFuelLayer(unittest.TestCase):
     def setUp(self) -> None:
@@ -186,6 +290,59 @@ class TestFunctionalFuelLayer(unittest.TestCase):
             ),
         )
 
+    def test_image_matches_blend(self) -> None:
+        """
+        Test that the vectorized dryness tint matches blending each pixel with PIL.
+        """
+        for i, j in ((0, 0), (5, 17), (self.height - 1, self.width - 1)):
+            fuel = self.FunctionalFuel.data[i, j, 0]
+            color_change_pct = (
+                fuel.w_0 / 0.2296 + fuel.delta / 7 + (0.2 - fuel.M_x) / 0.2
+            ) / 3
+            texture_img = Image.fromarray(self.FunctionalFuel.texture)
+            brown_img = DRY_TERRAIN_BROWN_IMG.resize(texture_img.size)
+            blended = np.array(Image.blend(texture_img, brown_img, color_change_pct / 2))
+            np.testing.assert_array_equal(
+                self.FunctionalFuel.image[i, j], blended.reshape(-1, 3)[0]
+            )
+
+    def test_data_scalar_fn(self) -> None:
+        """
+        Test that a fuel function that only accepts scalar inputs is computed per point
+        """
+        fuel = Fuel(w_0=0.5, delta=6.0, M_x=0.2, sigma=1739)
+        layer = FunctionalFuelLayer(
+            self.height, self.width, lambda x, y: fuel, name="test"
+        )
+        self.assertEqual(layer.data[3, 4, 0], fuel)
+        np.testing.assert_array_equal(
+            layer.fuel_grid.w_0, np.full((self.height, self.width), fuel.w_0)
+        )
+
+    def test_chaparral_seed(self) -> None:
+        """
+        Test that a seeded chaparral layer has the same fuel as the scalar function
+        at every pixel, and that per-pixel fuels are re-createable
+        """
+        fuel_fn = chaparral_fn(seed=3)
+        layer = FunctionalFuelLayer(self.height, self.width, fuel_fn, name="test")
+        fuel = fuel_fn(0, 0)
+        for param in ("w_0", "delta", "M_x", "sigma"):
+            with self.subTest(param=param):
+                np.testing.assert_array_equal(
+                    getattr(layer.fuel_grid, param),
+                    np.full((self.height, self.width), getattr(fuel, param)),
+                )
+
+        per_pixel_fn = chaparral_fn(seed=3, per_pixel=True)
+        layer = FunctionalFuelLayer(self.height, self.width, per_pixel_fn, name="test")
+        other_layer = FunctionalFuelLayer(
+            self.height, self.width, chaparral_fn(seed=3, per_pixel=True), name="test"
+        )
+        self.assertGreater(np.unique(layer.fuel_grid.w_0).size, 1)
+        np.testing.assert_array_equal(layer.fuel_grid.w_0, other_layer.fuel_grid.w_0)
+        self.assertEqual(per_pixel_fn(0, 0), per_pixel_fn(5, 7))
+
 
 class TestBurnProbabilityLayer(unittest.TestCase):
     def setUp(self) -> None:
@@ -263,3 +420,102 @@ class TestFunctionalBurnProbabilityLayer(unittest.TestCase):
             msg=f"The layer data has shape {layer.data.shape}, "
             f"but should have shape {correct_data_shape}",
         )
+
+
+class TestGetClosestIndices(unittest.TestCase):
+    def test_matches_argmin(self) -> None:
+        """
+        Test that the affine lookup gives the same indices as the full-grid search,
+        including for points outside of the grid and exactly between grid points
+        """
+        lat_long_box = SimpleNamespace(
+            points=((37.45, -120.44), (37.35, -120.22)), fuel=np.zeros((37, 53))
+        )
+        lat_lon_data = LandFireLatLongBox.create_lat_lon_array(lat_long_box)
+        rng = np.random.default_rng(0)
+        lats = np.concatenate(
+            [rng.uniform(37.3, 37.5, 200), lat_lon_data[:2, 0, 0].mean(keepdims=True)]
+        )
+        lons = np.concatenate(
+            [rng.uniform(-120.5, -120.2, 200), lat_lon_data[0, :2, 1].mean(keepdims=True)]
+        )
+        ys, xs = get_closest_indices(lat_lon_data, lats, lons)
+        for lat, lon, y, x in zip(lats, lons, ys, xs):
+            dists = np.sqrt(
+                np.square(lat_lon_data[..., 0] - lat)
+                + np.square(lat_lon_data[..., 1] - lon)
+            )
+            row, col = np.unravel_index(np.argmin(dists), dists.shape)
+            self.assertEqual((y, x), (col, row))
+            self.assertEqual(get_closest_indice(lat_lon_data, (lat, lon)), (col, row))
+
+
+class TestHistoricalPerimeters(unittest.TestCase):
+    def setUp(self) -> None:
+        lat_long_box = SimpleNamespace(
+            points=((37.45, -120.45), (37.35, -120.35)), fuel=np.zeros((11, 11))
+        )
+        # Each pixel is 0.01 degrees, so pixel (row, col) is at
+        # (37.45 - 0.01 * row, -120.45 + 0.01 * col)
+        self.lat_lon_array = LandFireLatLongBox.create_lat_lon_array(lat_long_box)
+        # A square from rows/cols 2 to 8 with a hole from rows/cols 4 to 6, and a
+        # larger square from rows/cols 1 to 9. The edges are between pixel centers.
+        square = box(-120.435, 37.365, -120.365, 37.435)
+        hole = box(-120.415, 37.385, -120.385, 37.415)
+        polygons = geopandas.GeoDataFrame(
+            {
+                "FeatureCat": ["Wildfire Daily Fire Perimeter"] * 2 + ["Other"],
+                "geometry": [
+                    square.difference(hole),
+                    box(-120.445, 37.355, -120.355, 37.445),
+                    square,
+                ],
+            }
+        )
+        self.layer = HistoricalLayer.__new__(HistoricalLayer)
+        self.layer.polygons_df = polygons
+        self.layer.lat_lon_array = self.lat_lon_array
+        self.layer.screen_size = self.lat_lon_array.shape[:2]
+        self.layer._perimeter_masks = None
+        return super().setUp()
+
+    def test_perimeter_masks(self) -> None:
+        """
+        Test that the perimeters are filled without their holes
+        """
+        masks = self.layer.perimeter_masks
+        self.assertEqual(masks.shape, (2, 11, 11))
+        expected = np.zeros((11, 11), dtype=bool)
+        expected[2:9, 2:9] = True
+        expected[4:7, 4:7] = False
+        np.testing.assert_array_equal(masks[0], expected)
+        self.assertEqual(masks[1].sum(), 81)
+        image = self.layer._make_perimeters_image()
+        self.assertEqual(image.shape, (11, 11, 4))
+        # Only the outlines are drawn, with the color of the perimeter index
+        np.testing.assert_array_equal(image[5, 5], COLORS[0])
+        np.testing.assert_array_equal(image[2, 2], COLORS[1])
+        np.testing.assert_array_equal(image[1, 1], COLORS[2])
+
+    def test_compare_to_perimeters(self) -> None:
+        """
+        Test that the scores are computed for every perimeter and run at once
+        """
+        fire_map = np.zeros((11, 11), dtype=np.uint8)
+        fire_map[1:10, 1:10] = BurnStatus.BURNED
+        fire_map[5, 5] = BurnStatus.BURNING
+        scores = self.layer.compare_to_perimeters(fire_map)
+        np.testing.assert_allclose(scores["iou"], [40 / 81, 1])
+        np.testing.assert_allclose(scores["precision"], [40 / 81, 1])
+        np.testing.assert_allclose(scores["recall"], [1, 1])
+
+        history = np.zeros((3, 2, 11, 11), dtype=np.uint8)
+        history[1] = fire_map
+        history[2, 0] = self.layer.perimeter_masks[0] * BurnStatus.BURNED
+        scores = self.layer.compare_to_perimeters(history)
+        self.assertEqual(scores["iou"].shape, (3, 2))
+        np.testing.assert_allclose(scores["iou"][0], [0, 0])
+        np.testing.assert_allclose(scores["iou"][2], [1, 0])
+        np.testing.assert_allclose(scores["recall"][2], [1, 0])
+        with self.assertRaises(ValueError):
+            self.layer.compare_to_perimeters(np.zeros((10, 11)))
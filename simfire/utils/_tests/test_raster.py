@@ -0,0 +1,115 @@
+import math
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ...enums import FuelModelToFuel
+from ...utils.units import meters_to_feet
+from ..cache import LayerCache
+from ..layers import RasterFuelLayer, RasterTopographyLayer
+from ..raster import read_raster, read_raster_cached, utm_crs
+from .test_tile_index import write_geotiff
+
+RESOLUTION = 1 / 3600
+WEST = -49.2
+NORTH = -16.5
+
+
+class TestRaster(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name)
+        # Elevations that increase by 1m per source pixel to the east
+        self.elevation_path = self.path / "elevation.tif"
+        elevations = 500 + np.tile(np.arange(360, dtype=np.float32), (360, 1))
+        write_geotiff(self.elevation_path, elevations, WEST, NORTH, RESOLUTION)
+        # MapBiomas classes: forest in the north half, savanna in the south half
+        self.classes_path = self.path / "classes.tif"
+        classes = np.full((360, 360), 4, dtype=np.uint8)
+        classes[:180] = 3
+        write_geotiff(self.classes_path, classes, WEST, NORTH, RESOLUTION)
+        self.lat = NORTH - 0.01
+        self.lon = WEST + 0.01
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+        return super().tearDown()
+
+    def test_utm_crs(self) -> None:
+        """
+        Test that the correct UTM zone is found in each hemisphere
+        """
+        self.assertEqual(utm_crs(-16.57, -49.18).to_epsg(), 32722)
+        self.assertEqual(utm_crs(37.45, -120.44).to_epsg(), 32610)
+
+    def test_read_raster_bilinear(self) -> None:
+        """
+        Test that the elevations are resampled to the grid pixel size
+        """
+        data = read_raster(
+            self.elevation_path, self.lat, self.lon, (50, 80), 30.0, method="bilinear"
+        )
+        self.assertEqual(data.shape, (50, 80))
+        # Each 30m grid pixel is about one source pixel to the east
+        meters_per_degree = 111320 * math.cos(math.radians(self.lat))
+        col = (self.lon - WEST) / RESOLUTION + 40.5 * 30 / meters_per_degree / RESOLUTION
+        self.assertAlmostEqual(data[25, 40], 500 + col - 0.5, delta=1.5)
+        self.assertTrue((np.diff(data, axis=1) > 0).all())
+
+    def test_read_raster_nearest(self) -> None:
+        """
+        Test that classes are resampled without mixing them
+        """
+        data = read_raster(self.classes_path, self.lat, self.lon, (300, 100), 30.0)
+        self.assertEqual(set(np.unique(data).tolist()), {3, 4})
+        # The boundary is 0.05 degrees (about 5.5km) south of the top edge
+        boundary = (0.05 - 0.01) * 110_600 / 30
+        self.assertEqual(data[int(boundary) - 3, 50], 3)
+        self.assertEqual(data[int(boundary) + 3, 50], 4)
+
+    def test_read_raster_out_of_bounds(self) -> None:
+        """
+        Test that an error is raised if the raster does not cover the grid
+        """
+        with self.assertRaises(ValueError):
+            read_raster(self.classes_path, self.lat, self.lon, (1000, 100), 30.0)
+        with self.assertRaises(ValueError):
+            read_raster(self.classes_path, self.lat, self.lon, (10, 10), 30.0, "cubic")
+
+    def test_read_raster_cached(self) -> None:
+        """
+        Test that the resampled raster is loaded from the cache
+        """
+        cache = LayerCache(self.path / "cache")
+        args = (self.classes_path, self.lat, self.lon, (40, 60), 30.0)
+        data = read_raster_cached(*args, cache=cache)
+        cached = read_raster_cached(*args, cache=cache)
+        self.assertIsInstance(cached, np.memmap)
+        np.testing.assert_array_equal(cached, data)
+
+    def test_raster_layers(self) -> None:
+        """
+        Test that the raster layers convert elevations to feet and classes to fuels
+        """
+        args = (self.lat, self.lon, 40, 60, 30 / 0.3048)
+        topo_layer = RasterTopographyLayer(self.elevation_path, *args)
+        elevations = read_raster(
+            self.elevation_path, self.lat, self.lon, (40, 60), 30.0, "bilinear"
+        )
+        np.testing.assert_allclose(topo_layer.data[..., 0], meters_to_feet(elevations))
+
+        fuel_layer = RasterFuelLayer(self.classes_path, *args)
+        self.assertEqual(fuel_layer.data.shape, (40, 60, 1))
+        self.assertEqual(fuel_layer.data[0, 0, 0], FuelModelToFuel[8])
+        self.assertEqual(fuel_layer.image.shape, (40, 60, 3))
+
+        fuel_layer = RasterFuelLayer(self.classes_path, *args, mapping={3: 10, 4: 1})
+        self.assertEqual(fuel_layer.data[0, 0, 0], FuelModelToFuel[10])
+        # The savanna class is not mapped
+        with self.assertRaises(ValueError):
+            RasterFuelLayer(
+                self.classes_path, self.lat, self.lon, 200, 60, 30 / 0.3048, {3: 10}
+            )
@@ -0,0 +1,68 @@
+import unittest
+
+import noise
+import numpy as np
+
+from ..simplex import snoise2, snoise3
+
+
+class TestSimplex(unittest.TestCase):
+    def setUp(self) -> None:
+        """Create random points to compute noise values at"""
+        rng = np.random.default_rng(1234)
+        self.x = rng.uniform(-500, 500, size=(40, 50))
+        self.y = rng.uniform(-500, 500, size=(40, 50))
+        return super().setUp()
+
+    def test_snoise2_matches_noise(self) -> None:
+        """Test that the vectorized noise matches `noise.snoise2` at every point"""
+        for octaves, persistence, lacunarity, base in (
+            (1, 0.5, 2.0, 0),
+            (3, 0.5, 2.0, 827),
+            (5, 0.7, 1.8, 12),
+        ):
+            z = snoise2(
+                self.x,
+                self.y,
+                octaves,
+                persistence,
+                lacunarity,
+                base=base,
+                chunk_size=333,
+            )
+            z_valid = np.vectorize(noise.snoise2)(
+                self.x, self.y, octaves, persistence, lacunarity, base=base
+            )
+            self.assertEqual(z.shape, self.x.shape)
+            np.testing.assert_array_equal(
+                z,
+                z_valid.astype(np.float32),
+                err_msg=f"The noise values for octaves={octaves}, "
+                f"persistence={persistence}, lacunarity={lacunarity}, base={base} "
+                "do not match noise.snoise2",
+            )
+
+    def test_snoise2_invalid_octaves(self) -> None:
+        """Test that a non-positive number of octaves raises a ValueError"""
+        with self.assertRaises(ValueError):
+            snoise2(self.x, self.y, octaves=0)
+
+    def test_snoise3_matches_noise(self) -> None:
+        """Test that the vectorized 3D noise matches `noise.snoise3` at every point"""
+        rng = np.random.default_rng(4321)
+        z = rng.uniform(-500, 500, size=self.x.shape)
+        for octaves, persistence, lacunarity in ((1, 0.5, 2.0), (4, 0.6, 2.2)):
+            values = snoise3(
+                self.x, self.y, z, octaves, persistence, lacunarity, chunk_size=333
+            )
+            valid = np.vectorize(noise.snoise3)(
+                self.x, self.y, z, octaves, persistence, lacunarity
+            )
+            self.assertEqual(values.shape, self.x.shape)
+            np.testing.assert_array_equal(
+                values,
+                valid.astype(np.float32),
+                err_msg=f"The noise values for octaves={octaves}, "
+                f"persistence={persistence}, lacunarity={lacunarity} "
+                "do not match noise.snoise3",
+            )
@@ -7,6 +7,7 @@ from ...world.parameters import Fuel
 from ..config import Config
 from ..terrain import (
     chaparral,
+    chaparral_grid,
     delta_seed,
     m_x_seed,
     random_seed_list,
@@ -57,6 +58,34 @@ class TerrainTest(unittest.TestCase):
             msg="The seed value should produce a " "different Fuel map.",
         )
 
+    def test_chaparral_grid(self) -> None:
+        """
+        Test that a seeded chaparral grid is reproducible, within the fuel bounds, and
+        does not change the global random state.
+        """
+        seed = 1111
+        shape = (20, 30)
+        np.random.seed(seed)
+        global_state = np.random.get_state()[1].copy()
+        grid = chaparral_grid(shape, seed=seed)
+        np.testing.assert_array_equal(
+            global_state,
+            np.random.get_state()[1],
+            err_msg="The global random state should not be changed",
+        )
+
+        self.assertTupleEqual(grid.shape, shape)
+        np.testing.assert_array_equal(grid.w_0, chaparral_grid(shape, seed=seed).w_0)
+        self.assertGreater(
+            np.unique(grid.w_0).size,
+            1,
+            msg="The fuels should vary across the grid",
+        )
+        self.assertGreaterEqual(grid.w_0.min(), FuelConstants.W_0_MIN)
+        self.assertLessEqual(grid.w_0.max(), FuelConstants.W_0_MAX)
+        self.assertGreaterEqual(grid.sigma.min(), FuelConstants.SIGMA_MIN)
+        self.assertLessEqual(grid.sigma.max(), FuelConstants.SIGMA_MAX)
+
     def test_w_0_seed(self) -> None:
         """
         Test creating a random float value for w_0 (moisture content)
@@ -0,0 +1,128 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import tifffile
+
+from ..layers import LandFireLatLongBox
+from ..tile_index import (
+    MODEL_PIXEL_SCALE_TAG,
+    MODEL_TIEPOINT_TAG,
+    Tile,
+    TileIndex,
+)
+
+RESOLUTION = 0.00027777777803598015
+
+
+def write_geotiff(
+    path: Path,
+    data: np.ndarray,
+    west: float,
+    north: float,
+    resolution: float = RESOLUTION,
+) -> None:
+    """
+    Write a lat/long GeoTIFF with its top-left corner at (north, west). The resolution
+    defaults to 30m.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tifffile.imwrite(
+        path,
+        data,
+        photometric="minisblack",
+        planarconfig="contig",
+        extratags=[
+            (MODEL_PIXEL_SCALE_TAG, "d", 3, (resolution, resolution, 0.0), True),
+            (MODEL_TIEPOINT_TAG, "d", 6, (0.0, 0.0, 0.0, west, north, 0.0), True),
+        ],
+    )
+
+
+class TestTileIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name)
+        self.data = np.zeros((200, 300, 2), dtype=np.int16)
+        write_geotiff(self.path / "large" / "data.tif", self.data, -120.5, 37.5)
+        write_geotiff(self.path / "small" / "data.tif", self.data[:50], -120.5, 37.5)
+        (self.path / "empty.tif").write_bytes(b"")
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+        return super().tearDown()
+
+    def test_from_file(self) -> None:
+        """
+        Test that the bounds of a tile are read from the GeoTIFF tags
+        """
+        tile = Tile.from_file(self.path / "large" / "data.tif")
+        assert tile is not None
+        self.assertEqual((tile.height, tile.width), (200, 300))
+        np.testing.assert_allclose(
+            tile.bounds,
+            (-120.5, 37.5 - 200 * RESOLUTION, -120.5 + 300 * RESOLUTION, 37.5),
+        )
+        self.assertEqual(tile.index(37.5 - 10.5 * RESOLUTION, -120.5), (10, 0))
+        self.assertIsNone(Tile.from_file(self.path / "empty.tif"))
+
+    def test_find(self) -> None:
+        """
+        Test that the smallest tile that contains a window is found
+        """
+        index = TileIndex.from_dir(self.path)
+        self.assertEqual(len(index.tiles), 2)
+        lat = 37.5 - 10.5 * RESOLUTION
+        lon = -120.5 + 20.5 * RESOLUTION
+        tile = index.find(lat, lon, (20, 30))
+        assert tile is not None
+        self.assertEqual(tile.path.parent.name, "small")
+        tile = index.find(lat, lon, (100, 30))
+        assert tile is not None
+        self.assertEqual(tile.path.parent.name, "large")
+        self.assertIsNone(index.find(lat, lon, (100, 300)))
+        self.assertIsNone(index.find(37.6, lon, (10, 10)))
+
+
+class TestLandFireTileCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(7)
+        fuel = rng.choice([1, 4, 91], size=(200, 300)).astype(np.int16)
+        topography = rng.integers(0, 1000, size=(200, 300)).astype(np.int16)
+        self.data = np.stack([fuel, topography], axis=-1)
+        write_geotiff(
+            Path(self.tmp_dir.name) / "landfire" / "2020" / "lf_area" / "data.tif",
+            self.data,
+            -120.5,
+            37.5,
+        )
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+        return super().tearDown()
+
+    def test_contained_box(self) -> None:
+        """
+        Test that a box contained in a cached tile is cropped from it without pulling
+        any data
+        """
+        lat = 37.5 - 10.5 * RESOLUTION
+        lon = -120.5 + 20.5 * RESOLUTION
+        query = mock.patch.object(
+            LandFireLatLongBox, "query_lat_lon_layer_data", side_effect=AssertionError
+        )
+        with mock.patch.dict(os.environ, {"SF_HOME": self.tmp_dir.name}), query:
+            lat_long_box = LandFireLatLongBox(
+                ((lat, lon), (lat - 0.01, lon + 0.01)), height=30 * 40, width=30 * 50
+            )
+        np.testing.assert_array_equal(lat_long_box.topography, self.data[10:50, 20:70, 1])
+        # The fuel should match expanding the roads/urban fuel in the whole tile
+        full_box = LandFireLatLongBox.__new__(LandFireLatLongBox)
+        full_box._make_data(tif_path=lat_long_box.geotiff_data.filename)
+        np.testing.assert_array_equal(lat_long_box.fuel, full_box.fuel[10:50, 20:70])
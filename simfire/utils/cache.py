@@ -0,0 +1,218 @@
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from .log import create_logger
+
+log = create_logger(__name__)
+
+# The version of the code that generates each kind of cached array. Bump the version
+# of a kind whenever the way it is generated changes, so that arrays generated by the
+# old code are not loaded. All cached arrays are also invalidated by a new simfire
+# version.
+SIMFIRE_VERSION = version("simfire")
+CACHE_VERSIONS: Dict[str, int] = {
+    "topography": 1,
+    "fuel": 1,
+    "wind": 2,
+    "raster": 1,
+    "terrain_image": 1,
+}
+
+# The default maximum size of the on-disk cache. The least recently used entries are
+# removed when it is exceeded.
+DEFAULT_MAX_CACHE_SIZE = 2 * 1024**3
+
+
+def cache_version(kind: str) -> str:
+    """
+    Get the version of the code that generates a kind of cached array.
+
+    Arguments:
+        kind: The kind of array (e.g. 'topography' or 'terrain_image'). Must be in
+              `CACHE_VERSIONS`.
+
+    Returns:
+        The simfire version and the version of the generator of the kind of array
+    """
+    return f"{SIMFIRE_VERSION}-{CACHE_VERSIONS[kind]}"
+
+
+def layer_cache_key(
+    kind: str,
+    fn_name: str,
+    kwargs: Dict[str, Any],
+    screen_size: Tuple[int, int],
+    fn: Optional[Callable[..., Any]] = None,
+) -> Optional[str]:
+    """
+    Create the cache key for a functional layer from the name and keyword arguments of
+    the function that generates it, the screen size, and the version of the code that
+    generates it (see `cache_version()`).
+
+    Layers generated with a random seed (`seed=None`) are different every time, so they
+    are not cached. When `fn` is given, the arguments that are missing from `kwargs`
+    take its default values, so a seed that defaults to None is also not cached.
+
+    Arguments:
+        kind: The kind of layer (e.g. 'topography' or 'fuel')
+        fn_name: The name of the function used to generate the layer
+        kwargs: The keyword arguments passed to the function
+        screen_size: The (height, width) of the layer
+        fn: The function used to generate the layer
+
+    Returns:
+        A hex digest that identifies the layer, or None if the layer should not be
+        cached
+    """
+    if fn is not None:
+        defaults = {
+            name: param.default
+            for name, param in inspect.signature(fn).parameters.items()
+            if param.default is not inspect.Parameter.empty
+        }
+        kwargs = {**defaults, **kwargs}
+    if "seed" in kwargs and kwargs["seed"] is None:
+        return None
+    payload = json.dumps(
+        {
+            "kind": kind,
+            "function": fn_name,
+            "kwargs": kwargs,
+            "screen_size": [int(size) for size in screen_size],
+            "version": cache_version(kind),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def array_digest(arr: np.ndarray) -> str:
+    """
+    Hash the contents of an array so it can be part of a cache key.
+
+    Arguments:
+        arr: The array to hash
+
+    Returns:
+        A hex digest of the shape, dtype and data of the array
+    """
+    arr = np.ascontiguousarray(arr)
+    digest = hashlib.sha1(f"{arr.shape}{arr.dtype.str}".encode())
+    digest.update(arr.data)
+    return digest.hexdigest()
+
+
+class LayerCache:
+    """
+    Content-addressed on-disk cache of generated layer arrays. Each entry is a
+    directory named by its key that contains one `.npy` file per array. Arrays are
+    memory-mapped when loaded, so only the parts that are used are read from disk.
+
+    The size of the cache is bounded: when an array is saved and the cache is larger
+    than `max_size`, the least recently used entries are removed.
+    """
+
+    def __init__(
+        self, path: Union[str, Path], max_size: Optional[int] = DEFAULT_MAX_CACHE_SIZE
+    ) -> None:
+        """
+        Arguments:
+            path: The directory to store the cached arrays in (e.g. `SF_HOME/cache`)
+            max_size: The maximum size of the cache in bytes, or None to not bound
+                      the size of the cache
+        """
+        self.path = Path(path).expanduser()
+        self.max_size = max_size
+
+    def load(self, key: str, name: str) -> Optional[np.ndarray]:
+        """
+        Load a cached array.
+
+        Arguments:
+            key: The cache key of the entry
+            name: The name of the array in the entry
+
+        Returns:
+            The read-only memory-mapped array, or None if it is not cached
+        """
+        filename = self.path / key / f"{name}.npy"
+        if not filename.is_file():
+            return None
+        try:
+            arr = np.load(filename, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            log.warning(f"Could not load cached array {filename}: {e}")
+            return None
+        # Mark the entry as recently used so it is removed last
+        try:
+            os.utime(self.path / key)
+        except OSError:
+            pass
+        return arr
+
+    def save(self, key: str, name: str, arr: np.ndarray) -> None:
+        """
+        Save an array to the cache. The array is written to a temporary file first, so
+        a partially written file is never loaded. Failing to write to the cache is not
+        an error, since the array can always be generated again.
+
+        Arguments:
+            key: The cache key of the entry
+            name: The name of the array in the entry
+            arr: The array to save. Object arrays cannot be cached.
+        """
+        entry_path = self.path / key
+        tmp_name = None
+        try:
+            entry_path.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(suffix=".npy", dir=entry_path)
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.asarray(arr), allow_pickle=False)
+            os.replace(tmp_name, entry_path / f"{name}.npy")
+        except (OSError, ValueError) as e:
+            log.warning(f"Could not save array {name} to the cache {entry_path}: {e}")
+            if tmp_name is not None and os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            return
+        self._prune(keep=key)
+
+    def _prune(self, keep: str) -> None:
+        """
+        Remove the least recently used entries until the cache is no larger than
+        `self.max_size`.
+
+        Arguments:
+            keep: The key of an entry that is never removed (the entry just saved)
+        """
+        if self.max_size is None:
+            return
+        entries = []
+        total_size = 0
+        for entry_path in self.path.iterdir():
+            if not entry_path.is_dir():
+                continue
+            try:
+                entry_size = sum(f.stat().st_size for f in entry_path.iterdir())
+                last_used = entry_path.stat().st_mtime
+            except OSError:
+                continue
+            entries.append((last_used, entry_size, entry_path))
+            total_size += entry_size
+        for _, entry_size, entry_path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            if entry_path.name == keep:
+                continue
+            log.debug(f"Removing the least recently used cache entry {entry_path}")
+            shutil.rmtree(entry_path, ignore_errors=True)
+            total_size -= entry_size
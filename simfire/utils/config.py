@@ -3,20 +3,28 @@ Module containing all config parsing and dataclass logic.
 """
 
 import dataclasses
-import os
 import random
 from copy import deepcopy
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import yaml  # type: ignore
 from yaml.parser import ParserError  # type: ignore
 
-from ..utils.generate_cfd_wind_layer import generate_cfd_wind_layer
+from ..utils.generate_cfd_wind_layer import train_cfd_wind
 from ..world.elevation_functions import flat, gaussian, perlin
 from ..world.fuel_array_functions import chaparral_fn
-from ..world.wind_mechanics.wind_controller import WindController, WindControllerCFD
+from ..world.wind_mechanics.cfd_wind import PRESSURE_SOLVERS
+from ..world.wind_mechanics.diagnostic_wind import diagnostic_wind
+from ..world.wind_mechanics.wind_controller import (
+    WindController,
+    WindControllerCFD,
+    direction_degrees,
+)
+from ..world.wind_mechanics.wind_library import REFERENCE_WIND_SPEED, CFDWindLibrary
+from .cache import LayerCache, array_digest, layer_cache_key
 from .layers import (
     BurnProbabilityLayer,
     FuelLayer,
@@ -29,6 +37,8 @@ from .layers import (
     OperationalBurnProbabilityLayer,
     OperationalFuelLayer,
     OperationalTopographyLayer,
+    RasterFuelLayer,
+    RasterTopographyLayer,
     TopographyLayer,
 )
 from .log import create_logger
@@ -36,6 +46,9 @@ from .units import mph_to_ftpm, scale_ms_to_ftpm, str_to_minutes
 
 log = create_logger(__name__)
 
+# A single (x, y) fire position or a list of (x, y) or (x, y, time) ignitions
+FirePositionType = Union[Tuple[int, int], np.ndarray, Sequence[Sequence[float]]]
+
 
 class ConfigError(Exception):
     """
@@ -100,6 +113,12 @@ class SimulationConfig:
         save_data: bool,
         data_type: str,
         sf_home: str,
+        precision: str = "float32",
+        adaptive_step: bool = False,
+        cfl: float = 1.0,
+        max_step: Optional[float] = None,
+        cache_layers: bool = False,
+        cache_wind: bool = True,
     ) -> None:
         self.update_rate = float(update_rate)
         self.runtime = str_to_minutes(runtime)
@@ -115,6 +134,26 @@ class SimulationConfig:
             )
         self.data_type = data_type
         self.sf_home = Path(sf_home)
+        precision = precision.lower()
+        if precision not in ["float32", "float64"]:
+            raise ConfigError(
+                f"Specified precision {precision} is not valid. "
+                "Specify either 'float32' or 'float64'."
+            )
+        self.precision = precision
+        self.dtype = np.dtype(precision)
+        self.adaptive_step = bool(adaptive_step)
+        self.cfl = float(cfl)
+        if self.cfl <= 0:
+            raise ConfigError(f"Specified cfl {self.cfl} should be greater than 0.")
+        # The longest adaptive update step, which defaults to the update rate
+        self.max_step = self.update_rate if max_step is None else float(max_step)
+        if self.max_step <= 0:
+            raise ConfigError(
+                f"Specified max_step {self.max_step} should be greater than 0."
+            )
+        self.cache_layers = bool(cache_layers)
+        self.cache_wind = bool(cache_wind)
 
 
 @dataclasses.dataclass
@@ -186,6 +225,14 @@ class FireConfig:
     diagonal_spread: bool
     max_fire_duration: int
     seed: Optional[int] = None
+    # (N, 3) array of (x, y, time) ignitions sorted by time
+    ignitions: np.ndarray = dataclasses.field(default_factory=lambda: np.empty((0, 3)))
+
+    def __post_init__(self) -> None:
+        # Default to a single ignition at the initial position at the start
+        if self.ignitions.shape[0] == 0:
+            x, y = self.fire_initial_position
+            self.ignitions = np.array([[x, y, 0]], dtype=float)
 
 
 @dataclasses.dataclass
@@ -248,27 +295,80 @@ class Config:
                 "also be 'historical'!"
             )
 
-        # Load the historical data layers, if necessary.
+        # Load the historical data config, if necessary. The historical data layers
+        # are loaded on first access.
         if topo_type == "historical" and fuel_type == "historical":
             self.historical = self._load_historical()
-            self.historical_layer = self._create_historical_layer()
 
-        # This can take up to 30 seconds to pull LandFire data directly from source
-        self.landfire_lat_long_box = self._make_lat_long_box()
+        # temporarily instantiate LatLongBox for the BurnProbabiltyLayer
+        self.lat_long_box = LatLongBox()
 
-        self.area = self._load_area()
+        # The cheap sections are loaded now. The expensive sections (the historical
+        # layer, the LandFire data, the area that depends on it, the terrain layers,
+        # the fire, and the wind) are `cached_property`s that are loaded on first
+        # access, so the config can be read and modified without generating them.
         self.display = self._load_display()
         self.simulation = self._load_simulation()
+        self.layer_cache = self._load_layer_cache()
+        self.wind_cache = self._load_wind_cache()
         self.mitigation = self._load_mitigation()
         self.operational = self._load_operational()
-        self.terrain = self._load_terrain()
-        self.fire = self._load_fire()
         self.environment = self._load_environment()
-        if cfd_precompute is False:
-            self.wind = self._load_wind()
-        else:
+        if cfd_precompute is True:
             self.cfd_setup = self._cfd_wind_setup()
 
+    @cached_property
+    def historical_layer(self) -> HistoricalLayer:
+        """The historical data layers, loaded on first access"""
+        return self._create_historical_layer()
+
+    @cached_property
+    def landfire_lat_long_box(self) -> Optional[LandFireLatLongBox]:
+        """
+        The LandFire data used by the operational layers, loaded on first access. This
+        can take up to 30 seconds to pull LandFire data directly from source.
+        """
+        return self._make_lat_long_box()
+
+    @cached_property
+    def area(self) -> AreaConfig:
+        """The AreaConfig, loaded on first access"""
+        return self._load_area()
+
+    @cached_property
+    def terrain(self) -> TerrainConfig:
+        """The TerrainConfig and its data layers, loaded on first access"""
+        return self._load_terrain()
+
+    @cached_property
+    def fire(self) -> FireConfig:
+        """The FireConfig, loaded on first access"""
+        return self._load_fire()
+
+    @cached_property
+    def wind(self) -> WindConfig:
+        """The WindConfig and its wind arrays, loaded on first access"""
+        return self._load_wind()
+
+    def _invalidate(self, *names: str) -> None:
+        """
+        Clear loaded `cached_property` sections so that they are loaded again with
+        the current YAML data on next access.
+
+        Arguments:
+            names: The names of the sections to clear
+        """
+        for name in names:
+            self.__dict__.pop(name, None)
+
+    def _ensure_area(self) -> None:
+        """
+        Load the area if it has not been loaded yet. Loading operational data sets the
+        screen size in the YAML data, so this must be done before the screen size is
+        read.
+        """
+        _ = self.area
+
     def _load_yaml(self) -> Dict[str, Any]:
         """
         Loads the YAML file specified in self.path and returns the data as a dictionary.
@@ -318,7 +418,9 @@ class Config:
                 )
                 valid = self._check_lat_long(points)
                 if not valid:
-                    if self.landfire_lat_long_box is None:
+                    # Only check a previously loaded box, since this is called to
+                    # load the box
+                    if self.__dict__.get("landfire_lat_long_box") is None:
                         message = (
                             "Lat/Long box is not valid and was not created successfully."
                         )
@@ -506,6 +608,32 @@ class Config:
         # No processing needed for the SimulationConfig
         return SimulationConfig(**self.yaml_data["simulation"])
 
+    def _load_layer_cache(self) -> Optional[LayerCache]:
+        """
+        Create the on-disk cache for generated layers under `SF_HOME`.
+
+        Returns:
+            The LayerCache, or None if `simulation.cache_layers` is False
+        """
+        if not self.simulation.cache_layers:
+            return None
+        return LayerCache(self.simulation.sf_home / "cache")
+
+    def _load_wind_cache(self) -> Optional[LayerCache]:
+        """
+        Create the on-disk cache for trained CFD wind fields under `SF_HOME`. Training
+        takes much longer than loading a field, so this is separate from (and shared
+        with) the layer cache.
+
+        Returns:
+            The LayerCache, or None if `simulation.cache_wind` is False
+        """
+        if not self.simulation.cache_wind:
+            return None
+        if self.layer_cache is not None:
+            return self.layer_cache
+        return LayerCache(self.simulation.sf_home / "cache")
+
     def _load_mitigation(self) -> MitigationConfig:
         """
         Load the MitigationConfig from the YAML data.
@@ -533,6 +661,7 @@ class Config:
         returns:
             The YAML data converted to a TerrainConfig dataclass
         """
+        self._ensure_area()
         topo_type = self.yaml_data["terrain"]["topography"]["type"]
         fuel_type = self.yaml_data["terrain"]["fuel"]["type"]
 
@@ -597,21 +726,33 @@ class Config:
             if "seed" in kwargs and not init:
                 kwargs["seed"] = seed
             if fn_name == "perlin":
+                generator: Callable[..., Any] = perlin
                 fn = perlin(**kwargs)
             elif fn_name == "gaussian":
+                generator = gaussian
                 fn = gaussian(**kwargs)
             elif fn_name == "flat":
+                generator = flat
                 fn = flat()
             else:
                 raise ConfigError(
                     f"The specified topography function ({fn_name}) " "is not valid."
                 )
+            screen_size = self.yaml_data["area"]["screen_size"]
             topo_layer = FunctionalTopographyLayer(
-                self.yaml_data["area"]["screen_size"][0],
-                self.yaml_data["area"]["screen_size"][1],
+                screen_size[0],
+                screen_size[1],
                 fn,
                 fn_name,
+                cache=self.layer_cache,
+                cache_key=layer_cache_key(
+                    "topography", fn_name, kwargs, screen_size, generator
+                ),
             )
+        elif topo_type == "raster":
+            topo_layer = RasterTopographyLayer(**self._raster_layer_kwargs("topography"))
+            fn_name = None
+            kwargs = None
         elif topo_type == "historical":
             topo_layer = self.historical_layer.topography
             fn_name = None
@@ -623,6 +764,41 @@ class Config:
 
         return topo_type, topo_layer, fn_name, kwargs
 
+    def _raster_layer_kwargs(self, layer: str) -> Dict[str, Any]:
+        """
+        Get the keyword arguments for a raster layer from the config. The layer covers
+        the area `screen_size` with its top-left corner at the `operational` latitude
+        and longitude, and is resampled to the area `pixel_scale`.
+
+        Arguments:
+            layer: The terrain layer (`topography` or `fuel`)
+
+        Returns:
+            The keyword arguments shared by RasterTopographyLayer and RasterFuelLayer
+        """
+        raster = self.yaml_data["terrain"][layer].get("raster")
+        if raster is None or "path" not in raster:
+            message = f"The {layer} layer type is `raster`, but no raster path is given"
+            log.error(message)
+            raise ConfigError(message)
+        screen_size = self.yaml_data["area"]["screen_size"]
+        try:
+            return {
+                "path": raster["path"],
+                "latitude": float(self.yaml_data["operational"]["latitude"]),
+                "longitude": float(self.yaml_data["operational"]["longitude"]),
+                "height": screen_size[0],
+                "width": screen_size[1],
+                "pixel_scale": float(self.yaml_data["area"]["pixel_scale"]),
+                "band": int(raster.get("band", 0)),
+                "crs": str(raster.get("crs", "EPSG:4326")),
+                "cache": self.layer_cache,
+            }
+        except KeyError as e:
+            message = f"The {layer} layer type is `raster`, but {e} is not specified"
+            log.error(message)
+            raise ConfigError(message)
+
     def _create_burn_probability_layer(
         self, init: bool = False, seed: Optional[int] = None
     ) -> Tuple[
@@ -673,10 +849,13 @@ class Config:
             if "seed" in kwargs and not init:
                 kwargs["seed"] = seed
             if fn_name == "perlin":
+                generator: Callable[..., Any] = perlin
                 fn = perlin(**kwargs)
             elif fn_name == "gaussian":
+                generator = gaussian
                 fn = gaussian(**kwargs)
             elif fn_name == "flat":
+                generator = flat
                 fn = flat()
             else:
                 raise ConfigError(
@@ -738,12 +917,25 @@ class Config:
                 raise ConfigError(
                     f"The specified fuel function ({fn_name}) " "is not valid."
                 )
+            screen_size = self.yaml_data["area"]["screen_size"]
             fuel_layer = FunctionalFuelLayer(
-                self.yaml_data["area"]["screen_size"][0],
-                self.yaml_data["area"]["screen_size"][1],
+                screen_size[0],
+                screen_size[1],
                 fn,
                 fn_name,
+                cache=self.layer_cache,
+                cache_key=layer_cache_key(
+                    "fuel", fn_name, kwargs, screen_size, chaparral_fn
+                ),
             )
+        elif fuel_type == "raster":
+            raster_kwargs = self._raster_layer_kwargs("fuel")
+            mapping = self.yaml_data["terrain"]["fuel"]["raster"].get("mapping")
+            if mapping is not None:
+                raster_kwargs["mapping"] = {int(k): int(v) for k, v in mapping.items()}
+            fuel_layer = RasterFuelLayer(**raster_kwargs)
+            fn_name = None
+            kwargs = None
         elif fuel_type == "historical":
             fuel_layer = self.historical_layer.fuel
             fn_name = None
@@ -772,13 +964,51 @@ class Config:
         )
         return historical_layer
 
-    def _load_fire(self, pos: Optional[Tuple[int, int]] = None) -> FireConfig:
+    def _load_ignitions(self, pos: FirePositionType) -> np.ndarray:
+        """
+        Convert a static fire position or list of ignitions to an array of ignitions.
+
+        Arguments:
+            pos: A single (x, y) position, or a list of (x, y) or (x, y, time)
+                 ignitions. The time is in minutes and defaults to 0.
+
+        Returns:
+            An (N, 3) array of (x, y, time) ignitions sorted by time
+        """
+        try:
+            ignitions = np.atleast_2d(np.asarray(pos, dtype=float))
+        except ValueError:
+            ignitions = np.empty((0, 0))
+        if (
+            ignitions.ndim != 2
+            or ignitions.shape[0] == 0
+            or ignitions.shape[1] not in (2, 3)
+        ):
+            message = (
+                "`fire_initial_position` should be an (x, y) position or a list of "
+                f"(x, y) or (x, y, time) ignitions, but got {pos}"
+            )
+            log.error(message)
+            raise ConfigError(message)
+        if ignitions.shape[1] == 2:
+            ignitions = np.hstack((ignitions, np.zeros((ignitions.shape[0], 1))))
+        return ignitions[np.argsort(ignitions[:, 2], kind="stable")]
+
+    def _load_fire(
+        self,
+        pos: Optional[FirePositionType] = None,
+    ) -> FireConfig:
         """
         Load the FireConfig from the YAML data.
 
+        Arguments:
+            pos: The static (x, y) position to start the fire at, or an array of
+                 (x, y) or (x, y, time) ignitions
+
         Returns:
             The YAML data converted to a FireConfig dataclass
         """
+        self._ensure_area()
         max_fire_duration = int(self.yaml_data["fire"]["max_fire_duration"])
         diagonal_spread = bool(self.yaml_data["fire"]["diagonal_spread"])
         fire_init_pos_type = self.yaml_data["fire"]["fire_initial_position"]["type"]
@@ -790,15 +1020,18 @@ class Config:
                 ]
                 if isinstance(fire_pos, str):
                     fire_pos = fire_pos[1:-1].split(",")
-                if len(fire_pos) > 2:
-                    raise ConfigError(
-                        "`fire_initial_position` should only be a Tuple of length 2"
-                    )
-                fire_initial_position = (int(fire_pos[0]), int(fire_pos[1]))
             # Pos is specified, so use that
             else:
-                fire_initial_position = pos
-            return FireConfig(fire_initial_position, diagonal_spread, max_fire_duration)
+                fire_pos = pos
+            ignitions = self._load_ignitions(fire_pos)
+            # The earliest ignition is the initial position
+            fire_initial_position = (int(ignitions[0, 0]), int(ignitions[0, 1]))
+            return FireConfig(
+                fire_initial_position,
+                diagonal_spread,
+                max_fire_duration,
+                ignitions=ignitions,
+            )
         elif fire_init_pos_type == "random":
             if pos is not None:
                 log.warn(
@@ -849,6 +1082,7 @@ class Config:
         Returns:
             The YAML data converted to a WindConfig dataclass
         """
+        self._ensure_area()
         # Only support simple for now
         # TODO: Figure out how Perlin and CFD create wind
         fn_name = self.yaml_data["wind"]["function"]
@@ -864,33 +1098,14 @@ class Config:
             speed_kwargs = None
             dir_kwargs = None
         elif fn_name == "cfd":
-            # Check if wind files have been generated
-            cfd_generated = os.path.isfile(
-                "pregenerated_wind_files/generated_wind_directions.npy"
-            ) and os.path.isfile("pregenerated_wind_files/generated_wind_magnitudes.npy")
-            if cfd_generated is False:
-                log.info("Generating CFD wind data")
-                time_to_train = self.yaml_data["wind"]["cfd"]["time_to_train"]
-                cfd_setup = WindControllerCFD(
-                    self.yaml_data["area"]["screen_size"],
-                    self.yaml_data["wind"]["cfd"]["result_accuracy"],
-                    self.yaml_data["wind"]["cfd"]["scale"],
-                    self.yaml_data["wind"]["cfd"]["timestep_dt"],
-                    self.yaml_data["wind"]["cfd"]["diffusion"],
-                    self.yaml_data["wind"]["cfd"]["viscosity"],
-                    self.terrain.topography_layer.data,
-                    self.yaml_data["wind"]["cfd"]["speed"],
-                    self.yaml_data["wind"]["cfd"]["direction"],
-                    time_to_train,
-                )
-                generate_cfd_wind_layer(time_to_train, cfd_setup)
-            speed_arr = np.load("pregenerated_wind_files/generated_wind_magnitudes.npy")
-            direction_arr = np.load(
-                "pregenerated_wind_files/generated_wind_directions.npy"
-            )
+            speed_arr, direction_arr = self._load_cfd_wind()
             speed_arr = scale_ms_to_ftpm(speed_arr)
             speed_kwargs = self.yaml_data["wind"]["cfd"]
             dir_kwargs = self.yaml_data["wind"]["cfd"]
+        elif fn_name == "diagnostic":
+            speed_arr, direction_arr = self._load_diagnostic_wind()
+            speed_kwargs = self.yaml_data["wind"]["diagnostic"]
+            dir_kwargs = self.yaml_data["wind"]["diagnostic"]
         elif fn_name == "perlin":
             wind_map = WindController()
             speed_kwargs = deepcopy(self.yaml_data["wind"]["perlin"]["speed"])
@@ -940,12 +1155,53 @@ class Config:
             direction_fn = None
 
         # Convert to float to get correct type
-        speed_arr = speed_arr.astype(np.float64)
-        direction_arr = direction_arr.astype(np.float64)
+        speed_arr = speed_arr.astype(self.simulation.dtype)
+        direction_arr = direction_arr.astype(self.simulation.dtype)
 
         return WindConfig(speed_arr, direction_arr, speed_fn, direction_fn)
 
-    def _cfd_wind_setup(self) -> WindControllerCFD:
+    def _load_diagnostic_wind(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Adjust the domain-average wind in `wind.diagnostic` to the topography with
+        the diagnostic wind model.
+
+        Returns:
+            The wind speeds (ft/min) and the wind directions (degrees clockwise from
+            North)
+        """
+        kwargs = dict(self.yaml_data["wind"]["diagnostic"])
+        speed = mph_to_ftpm(kwargs.pop("speed"))
+        direction = kwargs.pop("direction")
+        try:
+            return diagnostic_wind(
+                self.terrain.topography_layer.data,
+                self.yaml_data["area"]["pixel_scale"],
+                speed,
+                direction,
+                **kwargs,
+            )
+        except (TypeError, ValueError) as e:
+            message = f"The diagnostic wind parameters are not valid: {e}"
+            log.error(message)
+            raise ConfigError(message)
+
+    def _cfd_wind_setup(
+        self,
+        wind_direction: Optional[Union[str, float]] = None,
+        wind_speed: Optional[float] = None,
+    ) -> WindControllerCFD:
+        """
+        Create the CFD wind controller from the YAML data.
+
+        Arguments:
+            wind_direction: The inflow direction, if it should differ from
+                            `wind.cfd.direction`
+            wind_speed: The inflow speed, if it should differ from `wind.cfd.speed`
+
+        Returns:
+            The WindControllerCFD
+        """
+        self._ensure_area()
         screen_size: tuple[int, int] = self.yaml_data["area"]["screen_size"]
         result_accuracy: int = self.yaml_data["wind"]["cfd"]["result_accuracy"]
         # scale: int = self.yaml_data['wind']['cfd']['scale']
@@ -954,8 +1210,10 @@ class Config:
         diffusion: float = self.yaml_data["wind"]["cfd"]["diffusion"]
         viscosity: float = self.yaml_data["wind"]["cfd"]["viscosity"]
         terrain_features: np.ndarray = self.terrain.topography_layer.data
-        wind_speed: float = self.yaml_data["wind"]["cfd"]["speed"]
-        wind_direction: str = self.yaml_data["wind"]["cfd"]["direction"]
+        if wind_speed is None:
+            wind_speed = self.yaml_data["wind"]["cfd"]["speed"]
+        if wind_direction is None:
+            wind_direction = self.yaml_data["wind"]["cfd"]["direction"]
         time_to_train = self.yaml_data["wind"]["cfd"]["time_to_train"]
 
         wind_map = WindControllerCFD(
@@ -969,9 +1227,108 @@ class Config:
             wind_speed=wind_speed,
             wind_direction=wind_direction,
             time_to_train=time_to_train,
+            **self._cfd_solver_kwargs(),
         )
         return wind_map
 
+    def _load_cfd_wind(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Load the CFD wind field. If `wind.cfd.sector_size` is set, the field is
+        interpolated from a library of fields trained every `sector_size` degrees, so
+        changing the inflow direction does not need a new CFD run.
+
+        Returns:
+            The wind magnitudes (m/s) and the wind directions (degrees clockwise from
+            North)
+        """
+        cfd = self.yaml_data["wind"]["cfd"]
+        sector_size = cfd.get("sector_size")
+        if sector_size is None:
+            return self._load_cfd_field(cfd["direction"])
+        try:
+            library = CFDWindLibrary(
+                float(sector_size),
+                REFERENCE_WIND_SPEED,
+                lambda direction: self._load_cfd_field(direction, REFERENCE_WIND_SPEED),
+            )
+        except ValueError as e:
+            log.error(str(e))
+            raise ConfigError(str(e))
+        return library.wind(cfd["direction"], cfd["speed"])
+
+    def _load_cfd_field(
+        self, direction: Union[str, float], speed: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Train the CFD wind for an inflow direction, or load the trained wind field from
+        the wind cache. The cache key includes a hash of the topography, the screen
+        size, and all of the CFD settings (inflow speed and direction, and the solver
+        parameters), so a cached wind field is only reused for the same terrain and
+        inflow.
+
+        Arguments:
+            direction: The direction the inflow comes from
+            speed: The inflow speed, if it should differ from `wind.cfd.speed`
+
+        Returns:
+            The wind magnitudes (m/s) and the wind directions (degrees clockwise from
+            North)
+        """
+        cfd = self.yaml_data["wind"]["cfd"]
+        if speed is None:
+            speed = cfd["speed"]
+        screen_size = self.yaml_data["area"]["screen_size"]
+        kwargs = {
+            **{name: value for name, value in cfd.items() if name != "sector_size"},
+            **self._cfd_solver_kwargs(),
+            "speed": speed,
+            "direction": direction_degrees(direction),
+            "pixel_scale": self.yaml_data["area"]["pixel_scale"],
+            "terrain": array_digest(self.terrain.topography_layer.data),
+        }
+        cache = self.wind_cache
+        key = layer_cache_key("wind", "cfd", kwargs, screen_size)
+        if cache is not None and key is not None:
+            magnitudes = cache.load(key, "magnitudes")
+            directions = cache.load(key, "directions")
+            if magnitudes is not None and directions is not None:
+                return magnitudes, directions
+
+        log.info(f"Generating CFD wind data for the inflow from {direction}")
+        magnitudes, directions = train_cfd_wind(
+            cfd["time_to_train"], self._cfd_wind_setup(direction, speed)
+        )
+        if cache is not None and key is not None:
+            cache.save(key, "magnitudes", magnitudes)
+            cache.save(key, "directions", directions)
+        return magnitudes, directions
+
+    def _cfd_solver_kwargs(self) -> Dict[str, Any]:
+        """
+        Get the optional pressure solver settings of the CFD wind.
+
+        Returns:
+            The `pressure_solver` and `tolerance` keyword arguments for
+            WindControllerCFD
+        """
+        cfd = self.yaml_data["wind"]["cfd"]
+        pressure_solver = cfd.get("pressure_solver", "gauss-seidel")
+        if pressure_solver not in PRESSURE_SOLVERS:
+            message = (
+                f"The CFD pressure solver ({pressure_solver}) must be one of "
+                f"{PRESSURE_SOLVERS}"
+            )
+            log.error(message)
+            raise ConfigError(message)
+        tolerance = cfd.get("tolerance")
+        if tolerance is not None:
+            tolerance = float(tolerance)
+            if tolerance <= 0:
+                message = f"The CFD tolerance ({tolerance}) should be greater than 0"
+                log.error(message)
+                raise ConfigError(message)
+        return {"pressure_solver": pressure_solver, "tolerance": tolerance}
+
     def reset_terrain(
         self,
         topography_seed: Optional[int] = None,
@@ -999,14 +1356,20 @@ class Config:
             lat, long = location
             self.yaml_data["operational"]["latitude"] = lat
             self.yaml_data["operational"]["longitude"] = long
-            self.landfire_lat_long_box = self._make_lat_long_box()
+
+        # The current layer types are read from the YAML data, so that the terrain
+        # does not need to be loaded to be reset
+        current_topo_type = self.yaml_data["terrain"]["topography"]["type"]
+        current_fuel_type = self.yaml_data["terrain"]["fuel"]["type"]
 
         # Can only reset functional topography seeds, since operational is updated
         # via the `location` argument
         if topography_seed is not None:
             # Working with functional data
-            if self.terrain.topography_function is not None:
-                topo_fn_name = self.terrain.topography_function.name
+            if current_topo_type == "functional":
+                topo_fn_name = self.yaml_data["terrain"]["topography"]["functional"][
+                    "function"
+                ]
                 self.yaml_data["terrain"]["topography"]["functional"][topo_fn_name][
                     "seed"
                 ] = topography_seed
@@ -1014,8 +1377,8 @@ class Config:
         # via the `location` argument
         if fuel_seed is not None:
             # Working with functional data
-            if self.terrain.fuel_function is not None:
-                fuel_fn_name = self.terrain.fuel_function.name
+            if current_fuel_type == "functional":
+                fuel_fn_name = self.yaml_data["terrain"]["fuel"]["functional"]["function"]
                 self.yaml_data["terrain"]["fuel"]["functional"][fuel_fn_name][
                     "seed"
                 ] = fuel_seed
@@ -1027,8 +1390,8 @@ class Config:
             # we need to revert back to the original screen_size from the config file
             if topography_type == "operational" and fuel_type == "operational":
                 if (
-                    self.terrain.topography_type == "functional"
-                    and self.terrain.fuel_type == "functional"
+                    current_topo_type == "functional"
+                    and current_fuel_type == "functional"
                 ):
                     self.yaml_data["screen_size"] = self.original_screen_size
         if topography_type is not None:
@@ -1038,12 +1401,17 @@ class Config:
             # Update the yaml data
             self.yaml_data["terrain"]["fuel"]["type"] = fuel_type
 
-        # Remake the LandFireLatLongBox
-        self.landfire_lat_long_box = self._make_lat_long_box()
-        # Remake the AreaConfig since operational/functional could have changed
-        self.area = self._load_area()
-        # Remake the terrain
-        self.terrain = self._load_terrain()
+        # Remake the LandFireLatLongBox, the AreaConfig since operational/functional
+        # could have changed, and the terrain on next access
+        self._invalidate("landfire_lat_long_box", "area", "terrain")
+        # The CFD and diagnostic winds are computed from the topography, so they are
+        # remade too. Other winds are only remade if the screen size could change.
+        wind_fn_name = self.yaml_data["wind"]["function"]
+        screen_size_changed = (
+            location is not None or topography_type is not None or fuel_type is not None
+        )
+        if wind_fn_name in ("cfd", "diagnostic") or screen_size_changed:
+            self._invalidate("wind")
 
     def reset_wind(
         self, speed_seed: Optional[int] = None, direction_seed: Optional[int] = None
@@ -1057,10 +1425,14 @@ class Config:
         """
         # We want to update the YAML wind data so that the call to _load_wind()
         # re-create the WindConfig with the updated parameters
+        # The wind function is read from the YAML data, so that the wind does not need
+        # to be loaded to be reset. The simple and diagnostic wind functions have no
+        # seeds.
+        wind_fn_name = self.yaml_data["wind"]["function"]
         if speed_seed is not None:
             # Working with functional data
-            if self.wind.speed_function is not None:
-                speed_fn_name = self.wind.speed_function.name
+            if wind_fn_name not in ("simple", "diagnostic"):
+                speed_fn_name = wind_fn_name
                 if "seed" in self.yaml_data["wind"][speed_fn_name]["speed"]:
                     self.yaml_data["wind"][speed_fn_name]["speed"]["seed"] = speed_seed
                 else:
@@ -1070,8 +1442,8 @@ class Config:
                     )
 
         if direction_seed is not None:
-            if self.wind.direction_function is not None:
-                direction_fn_name = self.wind.direction_function.name
+            if wind_fn_name not in ("simple", "diagnostic"):
+                direction_fn_name = wind_fn_name
                 if "seed" in self.yaml_data["wind"][direction_fn_name]["direction"]:
                     self.yaml_data["wind"][direction_fn_name]["direction"][
                         "seed"
@@ -1083,10 +1455,13 @@ class Config:
                         "config"
                     )
 
-        self.wind = self._load_wind()
+        # Remake the wind on next access
+        self._invalidate("wind")
 
     def reset_fire(
-        self, seed: Optional[int] = None, pos: Optional[Tuple[int, int]] = None
+        self,
+        seed: Optional[int] = None,
+        pos: Optional[FirePositionType] = None,
     ) -> None:
         """
         Reset the fire initial position seed. Note that both `seed` and `pos` cannot
@@ -1095,7 +1470,8 @@ class Config:
 
         Arguments:
             seed: The seed used to randomize fire initial position generation.
-            pos: The static position to start the fire at
+            pos: The static position to start the fire at, or an array of (x, y) or
+                 (x, y, time) ignitions
         """
         fire_init_pos_type = self.yaml_data["fire"]["fire_initial_position"]["type"]
 
@@ -1120,7 +1496,7 @@ class Config:
                 # For consistency, ensure YAML data contains the same position value.
                 self.yaml_data["fire"]["fire_initial_position"][fire_init_pos_type][
                     "position"
-                ] = pos
+                ] = (pos.tolist() if isinstance(pos, np.ndarray) else pos)
                 # Reload the FireConfig with the updated position in the yaml data
                 self.fire = self._load_fire(pos=pos)
             except KeyError:
@@ -7,6 +7,7 @@ due to processing limitations.
 
 import time
 from pathlib import Path
+from typing import Tuple
 
 import numpy as np
 import pygame
@@ -16,105 +17,182 @@ from .log import create_logger
 
 log = create_logger(__name__)
 
-pygame.init()
-
-
-def renderD(surface, screen_size, scale, density) -> None:
-    for i in range(0, screen_size):
-        for j in range(0, screen_size):
-            x = i * scale
-            y = j * scale
-            d = density[i][j]
-            if d > 255:
-                d = 255
-            rect = pygame.Rect(x, y, scale, scale)
-            pygame.draw.rect(surface, (d, d, d), rect)
-    return
-
-
-def renderV(surface, screen_size, scale, velocity_x, velocity_y) -> None:
-    for i in range(0, screen_size):
-        for j in range(0, screen_size):
-            x = i * scale
-            y = j * scale
-            vx = velocity_x[i][j]
-            vy = velocity_y[i][j]
-            if not (abs(vx) < 0.1 and abs(vy) <= 0.1):
-                meanval = int(np.mean([vx, vy]))
-                if meanval < 0:
-                    meanval = 0
-                if meanval > 255:
-                    meanval = 255
-                pygame.draw.line(
-                    surface,
-                    [meanval, meanval, meanval, meanval],
-                    [x, y],
-                    [x + vx, y + vy],
-                )
-    return
-
-
-def generate_magnitude_array(velocity_x, velocity_y):
-    magnitude = np.zeros((velocity_x.shape[0], velocity_y.shape[1]), dtype=float)
-    shape_x = magnitude.shape[0]
-    shape_y = magnitude.shape[1]
-    for row in range(0, shape_y):
-        for col in range(0, shape_x):
-            magnitude[col][row] = np.sqrt(
-                (velocity_x[col][row] ** 2) + (velocity_y[col][row] ** 2)
-            )
-    return magnitude
-
-
-def generate_direction_array(velocity_x, velocity_y):
-    direction = np.zeros((velocity_x.shape[0], velocity_y.shape[1]), dtype=float)
-    shape_x = direction.shape[0]
-    shape_y = direction.shape[1]
-    for row in range(0, shape_y):
-        for col in range(0, shape_x):
-            vx = velocity_x[col][row]
-            vy = (-1) * velocity_y[col][row]
-            angle_raw = np.degrees(np.arctan2(vy, vx))
-            converted_angle = np.mod(((-1) * angle_raw + 90), 360)
-            direction[col][row] = converted_angle
-    return direction
-
 
-def generate_cfd_wind_layer(
-    time_to_train: int, cfd_setup: WindControllerCFD, display: bool = False
-):
+def _draw_grid(surface: pygame.Surface, scale: int, values: np.ndarray) -> None:
+    """
+    Draw a grid of gray values on a surface, with `scale` by `scale` pixels for each
+    cell. The first axis of the grid is y (rows) and the second axis is x (columns).
+
+    Arguments:
+        surface: The surface to draw on
+        scale: The number of pixels along each side of a cell
+        values: The gray values of the cells. Values are clipped to 0-255.
+    """
+    gray = np.clip(values, 0, 255).astype(np.uint8)
+    # PyGame surface arrays are indexed by (x, y), so the rows become the y axis
+    gray = np.repeat(np.repeat(gray.T, scale, axis=0), scale, axis=1)
+    image = pygame.surfarray.make_surface(np.stack([gray, gray, gray], axis=-1))
+    surface.blit(image, (0, 0))
+
+
+def renderD(surface: pygame.Surface, scale: int, density: np.ndarray) -> None:
+    """
+    Draw the CFD density field in grayscale.
+
+    Arguments:
+        surface: The surface to draw on
+        scale: The number of pixels along each side of a cell
+        density: The density field, with y (rows) along the first axis
+    """
+    _draw_grid(surface, scale, density)
+
+
+def renderV(
+    surface: pygame.Surface, scale: int, velocity_x: np.ndarray, velocity_y: np.ndarray
+) -> None:
+    """
+    Draw the CFD wind speed in grayscale.
+
+    Arguments:
+        surface: The surface to draw on
+        scale: The number of pixels along each side of a cell
+        velocity_x: The velocity along the first axis of the grid
+        velocity_y: The velocity along the second axis of the grid
+    """
+    _draw_grid(surface, scale, generate_magnitude_array(velocity_x, velocity_y))
+
+
+def generate_magnitude_array(
+    velocity_x: np.ndarray, velocity_y: np.ndarray
+) -> np.ndarray:
+    """
+    Get the wind speed of each cell from its velocity components.
+
+    Arguments:
+        velocity_x: The velocity along the first axis of the grid
+        velocity_y: The velocity along the second axis of the grid
+
+    Returns:
+        The wind magnitudes
+    """
+    return np.hypot(
+        np.asarray(velocity_x, dtype=float), np.asarray(velocity_y, dtype=float)
+    )
+
+
+def generate_direction_array(
+    velocity_x: np.ndarray, velocity_y: np.ndarray
+) -> np.ndarray:
+    """
+    Get the direction that the wind in each cell blows toward from its velocity
+    components. The first axis of the grid (rows) points south and the second axis
+    (columns) points east.
+
+    Arguments:
+        velocity_x: The velocity along the first axis of the grid
+        velocity_y: The velocity along the second axis of the grid
+
+    Returns:
+        The wind directions in degrees clockwise from North
+    """
+    east = np.asarray(velocity_y, dtype=float)
+    # Adding zero turns -0.0 into 0.0, so calm cells point north
+    north = (-1) * np.asarray(velocity_x, dtype=float) + 0.0
+    return np.mod(np.degrees(np.arctan2(east, north)), 360)
+
+
+def train_cfd_wind(
+    time_to_train: int,
+    cfd_setup: WindControllerCFD,
+    display: bool = False,
+    progress_interval: float = 10.0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Step the CFD wind for `time_to_train` seconds and get the resulting wind field.
+    Without `display`, no PyGame display is created, so the wind can be trained in
+    a headless environment. The progress and time per step are logged every
+    `progress_interval` seconds.
+
+    Arguments:
+        time_to_train: The number of seconds to step the CFD wind for
+        cfd_setup: The CFD wind controller to step
+        display: Whether to render the wind velocities while training
+        progress_interval: The number of seconds between progress logs
+
+    Returns:
+        The wind magnitudes and the wind directions (in degrees clockwise from North)
+    """
     time_bound = time_to_train  # in seconds
-    time_end = time.time() + time_bound
     wind_map: WindControllerCFD = cfd_setup
 
     wm_scale = wind_map.get_wind_scale()
     wm_size = wind_map.get_screen_size()
 
     if display is True:
-        screen = pygame.display.set_mode(wm_size)
+        pygame.init()
+        # The first axis of the grid is x, which is the first axis of a PyGame surface
+        screen = pygame.display.set_mode((wm_size[0] * wm_scale, wm_size[1] * wm_scale))
         screen.fill("white")
         pygame.display.flip()
 
-    log.info("Processing, please wait...")
-    while time.time() < time_end:
+    log.info(f"Training the CFD wind on a {wm_size} grid for {time_bound}s...")
+    time_start = time.perf_counter()
+    time_end = time_start + time_bound
+    next_progress = time_start + progress_interval
+    steps = 0
+    while time.perf_counter() < time_end:
         wind_map.iterate_wind_step()
-        # wm_density = wind_map.get_wind_density_field()
-        wm_velocity_x = wind_map.get_wind_velocity_field_x()
-        wm_velocity_y = wind_map.get_wind_velocity_field_y()
-
         wind_map.fvect.step()
+        steps += 1
+
         if display is True:
-            # renderD(screen, wm_size, wm_scale, wm_density)
-            renderV(screen, wm_size, wm_scale, wm_velocity_x, wm_velocity_y)
+            renderV(
+                screen,
+                wm_scale,
+                wind_map.get_wind_velocity_field_x(),
+                wind_map.get_wind_velocity_field_y(),
+            )
             pygame.display.flip()
 
-    log.info("Complete! Generating npy files")
+        now = time.perf_counter()
+        if now >= next_progress:
+            log.info(
+                f"Trained {steps} steps in {now - time_start:.0f}/{time_bound}s "
+                f"({1000 * (now - time_start) / steps:.1f} ms per step)"
+            )
+            next_progress += progress_interval
+
+    elapsed = time.perf_counter() - time_start
+    log.info(
+        f"Trained the CFD wind for {steps} steps in {elapsed:.1f}s"
+        + (f" ({1000 * elapsed / steps:.1f} ms per step)" if steps else "")
+    )
 
+    wm_velocity_x = wind_map.get_wind_velocity_field_x()
+    wm_velocity_y = wind_map.get_wind_velocity_field_y()
     wm_mag = generate_magnitude_array(wm_velocity_x, wm_velocity_y)
     wm_dir = generate_direction_array(wm_velocity_x, wm_velocity_y)
+    return wm_mag, wm_dir
 
+
+def generate_cfd_wind_layer(
+    time_to_train: int, cfd_setup: WindControllerCFD, display: bool = False
+) -> None:
+    """
+    Train the CFD wind with `train_cfd_wind` and save the wind magnitudes and
+    directions to npy files in `./pregenerated_wind_files`. Leave `display` off to
+    run headless.
+
+    Arguments:
+        time_to_train: The number of seconds to step the CFD wind for
+        cfd_setup: The CFD wind controller to step
+        display: Whether to render the wind velocities while training
+    """
+    wm_mag, wm_dir = train_cfd_wind(time_to_train, cfd_setup, display)
+
+    log.info("Generating npy files")
     simfire_path = Path().resolve()  # Get the current path and save files to this path
     wind_path = simfire_path / "pregenerated_wind_files"
-    wind_path.mkdir(parents=True)
+    wind_path.mkdir(parents=True, exist_ok=True)
     np.save(wind_path / "generated_wind_magnitudes.npy", wm_mag)
     np.save(wind_path / "generated_wind_directions.npy", wm_dir)
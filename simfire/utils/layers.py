@@ -1,20 +1,23 @@
+import dataclasses
 import datetime
 import os
 import shutil
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import geopandas
 import landfire
 import matplotlib.pyplot as plt
 import numpy as np
+import tifffile
 from geopy.distance import great_circle
 from geotiff import GeoTiff
 from landfire.product.enums import ProductRegion, ProductTheme, ProductVersion
 from landfire.product.search import ProductSearch
 from matplotlib.contour import QuadContourSet
 from PIL import Image
-from scipy.ndimage.morphology import binary_dilation
+from scipy.ndimage import binary_dilation, binary_erosion
+from skimage.draw import polygon as draw_polygon
 
 from ..enums import (
     COLORS,
@@ -23,12 +26,16 @@ from ..enums import (
     BurnStatus,
     FuelModelRGB13,
     FuelModelToFuel,
+    MapBiomasToFuelModel,
 )
+from ..utils.cache import LayerCache
 from ..utils.log import create_logger
-from ..utils.units import meters_to_feet
+from ..utils.raster import read_raster_cached
+from ..utils.tile_index import Tile, TileIndex
+from ..utils.units import feet_to_meters, meters_to_feet
 from ..world.elevation_functions import ElevationFn
 from ..world.fuel_array_functions import FuelArrayFn
-from ..world.parameters import Fuel
+from ..world.parameters import Fuel, FuelGrid
 
 log = create_logger(__name__)
 
@@ -100,29 +107,37 @@ class LandFireLatLongBox:
                 log.info(f"Creating SF_HOME directory: {sf_path}")
                 sf_path.mkdir(parents=True, exist_ok=True)
 
-        self.output_path = (
-            sf_path / f"landfire/{self.year}/{self.product_layers_path.stem}/"
-        )
+        self.landfire_path = sf_path / f"landfire/{self.year}"
+        self.output_path = self.landfire_path / f"{self.product_layers_path.stem}/"
 
         log.info(f"Saving LandFire data to: {self.output_path}")
 
         # make each a layer a global variable that we "fill"
         self.fuel = np.array([])
         self.topography = np.array([])
+        # The lazily-read tif data, either a np.memmap or a Zarr array
+        self.geotiff_data: Any = None
+
+        # FIX FOR CRS CHANGES
+        # crop data to new pixel_height and pixel_width
+        pixel_height = int(np.floor(height / 30))  # round down to nearest int
+        pixel_width = int(np.floor(width / 30))  # round down to nearest int
 
         # check if we've already pulled this data before
         exists = self._check_paths()
         if exists:
-            self._make_data()
+            self._make_data((pixel_height, pixel_width))
         else:
-            self.layer_products = self._get_layer_names()
-            self.query_lat_lon_layer_data()
-            self._make_data()
+            # check if this area is contained in data that was already pulled
+            tile = self._find_cached_tile((pixel_height, pixel_width))
+            if tile is not None:
+                offset = tile.index(*self.points[0])
+                self._make_data((pixel_height, pixel_width), tile.path, offset)
+            else:
+                self.layer_products = self._get_layer_names()
+                self.query_lat_lon_layer_data()
+                self._make_data((pixel_height, pixel_width))
 
-        # FIX FOR CRS CHANGES
-        # crop data to new pixel_height and pixel_width
-        pixel_height = int(np.floor(height / 30))  # round down to nearest int
-        pixel_width = int(np.floor(width / 30))  # round down to nearest int
         self.fuel = self.fuel[:pixel_height, :pixel_width]
         self.topography = self.topography[:pixel_height, :pixel_width]
 
@@ -138,9 +153,8 @@ class LandFireLatLongBox:
 
         Assume we always pull at least Fuel and Topography data.
 
-        TODO: Currently we do not have the functionality to find points within an
-                existing LatLongBox that has already been downloaded.
-                This could greatly improve functionality and speed up training interations
+        Boxes that are contained in data pulled for a different box are found by
+        `_find_cached_tile`.
         """
         if self.output_path.exists():
             tifs = [str(t) for t in self.output_path.glob("*.tif")]
@@ -160,6 +174,24 @@ class LandFireLatLongBox:
         else:
             return False
 
+    def _find_cached_tile(self, shape: Tuple[int, int]) -> Optional[Tile]:
+        """
+        Find previously pulled data for this year that fully contains this box, so
+        it can be cropped locally instead of being pulled again. Only the GeoTIFF
+        headers are read to build the index, so this works offline from a pre-seeded
+        `SF_HOME/landfire` directory.
+
+        Arguments:
+            shape: The (height, width) in pixels of the box
+
+        Returns:
+            The smallest cached tile that contains the box, or None if there is none
+        """
+        tile = TileIndex.from_dir(self.landfire_path).find(*self.points[0], shape)
+        if tile is not None:
+            log.debug(f"Data for this area already exists. Cropping from: {tile.path}")
+        return tile
+
     def _get_layer_names(self) -> Dict[str, str]:
         """
         Functionality to ge the LandFire Product names for the Layers specified.
@@ -253,10 +285,19 @@ class LandFireLatLongBox:
             self.output_path / self.product_layers_path, self.output_path
         )
 
-    def _make_data(self):
+    def _make_data(
+        self,
+        shape: Optional[Tuple[int, int]] = None,
+        tif_path: Optional[Path] = None,
+        offset: Tuple[int, int] = (0, 0),
+    ):
         """
         Functionality to read in tif data for layers, and create iamge data.
 
+        Only the window of the tif data that is used is read from disk. The tif is
+        memory-mapped if it is uncompressed, and is otherwise read lazily by chunk
+        through Zarr, so large extracts do not need to fit in memory.
+
         NOTE: for now we assume fuel and topography are always pulled in the respective
                 order, but this could be used in the future:
 
@@ -265,19 +306,45 @@ class LandFireLatLongBox:
                 globals()[self.layers[i]] = np.array(self.geotiff_data[:, :, i])
         ```
 
+        Arguments:
+            shape: The (height, width) in pixels of the window of the data to read.
+                   Defaults to the rest of the tif after the offset.
+            tif_path: The tif to read. Defaults to the tif in `self.output_path`.
+            offset: The (row, column) of the top-left corner of the window to read
         """
-        tifs = [str(t) for t in self.output_path.glob("*.tif")][0]
+        if tif_path is None:
+            tifs = [str(t) for t in self.output_path.glob("*.tif")][0]
+        else:
+            tifs = str(tif_path)
 
         # the order the data was requested is the order of the Band in the Tif file
-        geo_tiff = GeoTiff(tifs, crs_code=4326)
-        self.geotiff_data = geo_tiff.read()
-
-        self.fuel = np.array(self.geotiff_data[:, :, 0])
+        try:
+            self.geotiff_data = tifffile.memmap(tifs, mode="r")
+        except ValueError:
+            # The tif is compressed or not contiguous, so it can't be memory-mapped
+            geo_tiff = GeoTiff(tifs, crs_code=4326)
+            self.geotiff_data = geo_tiff.read()
+
+        row, col = offset
+        if shape is None:
+            height = self.geotiff_data.shape[0] - row
+            width = self.geotiff_data.shape[1] - col
+        else:
+            height, width = shape
+        # Read one extra column of fuel on each side (where there is one) so the
+        # dilation below matches dilating the whole tif at the edges of the window
+        left = min(col, 1)
+        fuel = np.array(
+            self.geotiff_data[row : row + height, col - left : col + width + 1, 0]
+        )
         # expand "Roads/Urban" fuel type so that fires cannot burn through it
-        mask = binary_dilation(self.fuel == 91, [[5, 5, 5]])
-        self.fuel[mask] = 91
+        mask = binary_dilation(fuel == 91, [[5, 5, 5]])
+        fuel[mask] = 91
+        self.fuel = fuel[:, left : left + width]
 
-        self.topography = np.array(self.geotiff_data[:, :, 1])
+        self.topography = np.array(
+            self.geotiff_data[row : row + height, col : col + width, 1]
+        )
 
     def create_lat_lon_array(self) -> np.ndarray:
         """
@@ -326,6 +393,46 @@ class LatLongBox:
         self.tr: Tuple[Tuple[int, int], Tuple[int, int]] = ((0, 0), (0, 0))
 
 
+def _evaluate_grid_fn(fn: Callable[[Any, Any], Any], height: int, width: int) -> Any:
+    """
+    Call a function of (x, y) coordinates for every point of a (height, width) grid.
+
+    The function is called once with the full grid of points. Functions that only
+    support scalar inputs are called for each point instead: these either raise a
+    TypeError or ValueError for array inputs (and not for scalar inputs), or return
+    a single value.
+
+    Arguments:
+        fn: The function that maps (x, y) points to values
+        height: The height of the grid
+        width: The width of the grid
+
+    Returns:
+        The value returned for the grid of points (e.g. an array or FuelGrid), or an
+        array of the values returned for each point
+    """
+    x = np.arange(width)
+    y = np.arange(height)
+    X, Y = np.meshgrid(x, y)
+    try:
+        values = fn(X, Y)
+    except (TypeError, ValueError):
+        # Errors that are not caused by the array inputs are raised here
+        fn(X[0, 0], Y[0, 0])
+        log.debug(f"Calling the scalar function {fn} for each point of the grid")
+        return np.vectorize(fn)(X, Y)
+
+    shape = values.shape if hasattr(values, "shape") else np.shape(values)
+    if shape == X.shape:
+        return values
+    if shape == ():
+        return np.vectorize(fn)(X, Y)
+    raise ValueError(
+        f"The function {fn} returned shape {shape} for the grid of points, "
+        f"but should return shape {X.shape}"
+    )
+
+
 class DataLayer:
     """
     Base class for any data that affects the terrain.
@@ -483,17 +590,16 @@ class FunctionalBurnProbabilityLayer(BurnProbabilityLayer):
         """
         Use self.elevation_fn to make the elevation data layer.
 
+        The elevation function is called once with the full grid of (x, y) points. If
+        it only supports scalar inputs, it is called for each point instead.
+
         Arguments:
             elevation_fn: The function that maps (x, y) points to elevations
 
         Returns:
             A numpy array containing the elevation data
         """
-        x = np.arange(self.width)
-        y = np.arange(self.height)
-        X, Y = np.meshgrid(x, y)
-        elevation_fn_vect = np.vectorize(elevation_fn)
-        elevations = elevation_fn_vect(X, Y)
+        elevations = np.asarray(_evaluate_grid_fn(elevation_fn, self.height, self.width))
         # Expand third dimension to align with data layers
         elevations = np.expand_dims(elevations, axis=-1)
 
@@ -520,6 +626,21 @@ class TopographyLayer(DataLayer):
         super().__init__()
         self.data: np.ndarray
         self.image: np.ndarray
+        self._contours: Optional[QuadContourSet] = None
+
+    @property
+    def contours(self) -> QuadContourSet:
+        """
+        The contour lines of the elevation data. These are only used for plotting and
+        are expensive to compute for large layers, so they are computed on first use.
+        """
+        if self._contours is None:
+            self._contours = self._make_contours()
+        return self._contours
+
+    @contours.setter
+    def contours(self, contours: QuadContourSet) -> None:
+        self._contours = contours
 
     def _make_contours(self) -> QuadContourSet:
         """
@@ -563,45 +684,119 @@ class FunctionalTopographyLayer(TopographyLayer):
     Layer that stores elevation data computed from a function.
     """
 
-    def __init__(self, height, width, elevation_fn: ElevationFn, name: str) -> None:
+    def __init__(
+        self,
+        height,
+        width,
+        elevation_fn: ElevationFn,
+        name: str,
+        cache: Optional[LayerCache] = None,
+        cache_key: Optional[str] = None,
+    ) -> None:
         """
-        Initialize the elvation layer by computing the elevations and contours.
+        Initialize the elvation layer by computing the elevations. The contours are
+        computed when first accessed.
 
         Arguments:
             height: The height of the data layer
             width: The width of the data layer
             elevation_fn: A callable function that converts (x, y) coorindates to
                           elevations.
+            name: The name of the elevation function (e.g.: 'perlin')
+            cache: The on-disk cache to load the elevations from and save them to
+            cache_key: The key of the elevations in the cache. The cache is only used
+                       if both `cache` and `cache_key` are specified.
         """
         super().__init__()
         self.height = height
         self.width = width
         self.name = name
 
-        self.data = self._make_data(elevation_fn)
-        self.contours = self._make_contours()
+        elevations = None
+        if cache is not None and cache_key is not None:
+            elevations = cache.load(cache_key, "elevations")
+        if elevations is not None and elevations.shape == (height, width):
+            self.data = np.expand_dims(elevations, axis=-1)
+        else:
+            self.data = self._make_data(elevation_fn)
+            if cache is not None and cache_key is not None:
+                cache.save(cache_key, "elevations", self.data[..., 0])
 
     def _make_data(self, elevation_fn: ElevationFn) -> np.ndarray:
         """
         Use self.elevation_fn to make the elevation data layer.
 
+        The elevation function is called once with the full grid of (x, y) points. If
+        it only supports scalar inputs, it is called for each point instead.
+
         Arguments:
             elevation_fn: The function that maps (x, y) points to elevations
 
         Returns:
             A numpy array containing the elevation data
         """
-        x = np.arange(self.width)
-        y = np.arange(self.height)
-        X, Y = np.meshgrid(x, y)
-        elevation_fn_vect = np.vectorize(elevation_fn)
-        elevations = elevation_fn_vect(X, Y)
+        elevations = np.asarray(_evaluate_grid_fn(elevation_fn, self.height, self.width))
         # Expand third dimension to align with data layers
         elevations = np.expand_dims(elevations, axis=-1)
 
         return elevations
 
 
+class RasterTopographyLayer(TopographyLayer):
+    """
+    Layer that stores elevation data read from a local GeoTIFF (e.g. SRTM or
+    TOPODATA), reprojected and resampled to the simulation grid. No network calls are
+    made, so any region with local data can be used.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        latitude: float,
+        longitude: float,
+        height: int,
+        width: int,
+        pixel_scale: float,
+        band: int = 0,
+        crs: str = "EPSG:4326",
+        cache: Optional[LayerCache] = None,
+    ) -> None:
+        """
+        Initialize the elevation layer by reading the GeoTIFF. The contours are
+        computed when first accessed.
+
+        Arguments:
+            path: The path to the GeoTIFF of elevations in meters
+            latitude: The latitude of the top-left corner of the layer
+            longitude: The longitude of the top-left corner of the layer
+            height: The height of the data layer in pixels
+            width: The width of the data layer in pixels
+            pixel_scale: The size of each pixel in feet
+            band: The band of the GeoTIFF that contains the elevations
+            crs: The CRS of the GeoTIFF
+            cache: The on-disk cache to load the resampled elevations from and save
+                   them to
+        """
+        super().__init__()
+        self.path = Path(path).expanduser()
+        self.height = height
+        self.width = width
+
+        elevations = read_raster_cached(
+            self.path,
+            latitude,
+            longitude,
+            (height, width),
+            float(feet_to_meters(pixel_scale)),
+            method="bilinear",
+            band=band,
+            crs=crs,
+            cache=cache,
+        )
+        # Convert from meters to feet for use with simulator
+        self.data = np.expand_dims(meters_to_feet(elevations), axis=-1)
+
+
 class FuelLayer(DataLayer):
     """
     Base class for use with operational and procedurally generated
@@ -637,6 +832,57 @@ class FuelLayer(DataLayer):
         return np.array([])
 
 
+def _make_fuel_model_luts() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Create 256-entry lookup tables for the FBFM13 fuel model codes, so that whole
+    rasters of codes can be mapped with `lut[idxs]` instead of per-pixel dictionary
+    lookups. The no-data codes outside of [0, 255] all map to the same fuel and color,
+    so they share index 0, which is not a fuel model code.
+
+    Returns:
+        A tuple containing:
+            A boolean array of which indices are valid fuel model codes
+            An object array of the Fuel for each index
+            A (256, 3) array of the RGB color in [0, 1] for each index
+    """
+    valid_lut = np.zeros(256, dtype=bool)
+    fuel_lut = np.full(256, None, dtype=object)
+    rgb_lut = np.zeros((256, 3))
+    for code, fuel in FuelModelToFuel.items():
+        idx = code if 0 <= code < 256 else _FUEL_MODEL_NODATA_IDX
+        valid_lut[idx] = True
+        fuel_lut[idx] = fuel
+        rgb_lut[idx] = FuelModelRGB13[code]
+    return valid_lut, fuel_lut, rgb_lut
+
+
+_FUEL_MODEL_NODATA_IDX = 0
+_FUEL_MODEL_NODATA_CODES = [code for code in FuelModelToFuel if not 0 <= code < 256]
+_FUEL_MODEL_VALID_LUT, _FUEL_MODEL_FUEL_LUT, _FUEL_MODEL_RGB_LUT = _make_fuel_model_luts()
+
+
+def _fuel_model_lut_index(codes: np.ndarray) -> np.ndarray:
+    """
+    Convert FBFM13 fuel model codes to indices into the fuel model lookup tables.
+
+    Arguments:
+        codes: The fuel model codes
+
+    Returns:
+        The lookup table index of each code
+    """
+    codes = np.asarray(codes)
+    in_range = (codes >= 0) & (codes < 256)
+    idxs = np.where(in_range, codes, _FUEL_MODEL_NODATA_IDX).astype(np.intp)
+    # Codes outside of [0, 255] are only valid if they are no-data codes
+    valid = np.where(
+        in_range, _FUEL_MODEL_VALID_LUT[idxs], np.isin(codes, _FUEL_MODEL_NODATA_CODES)
+    )
+    if not valid.all():
+        raise ValueError(f"Unknown fuel model codes: {np.unique(codes[~valid])}")
+    return idxs
+
+
 class OperationalFuelLayer(FuelLayer):
     def __init__(self, LandFireLatLongBox: LandFireLatLongBox):
         """
@@ -657,10 +903,8 @@ class OperationalFuelLayer(FuelLayer):
             to rgb values for visualization in the simulator.
         """
         if "fuel" in self.LandFireLatLongBox.layers:
-            func = np.vectorize(lambda x: tuple(FuelModelRGB13[x]))
-            fuel_data_rgb = func(self.LandFireLatLongBox.fuel)
-
-            fuel_data_rgb = np.stack(fuel_data_rgb, axis=-1) * 255.0
+            lut_idxs = _fuel_model_lut_index(self.LandFireLatLongBox.fuel)
+            fuel_data_rgb = _FUEL_MODEL_RGB_LUT[lut_idxs] * 255.0
 
         else:
             fuel_data_rgb = np.array([])
@@ -671,8 +915,8 @@ class OperationalFuelLayer(FuelLayer):
         """
         Functionality to get the raw Fuel Model data for the Simharness
         """
-        func = np.vectorize(lambda x: FuelModelToFuel[x])
-        fuel_data = func(self.LandFireLatLongBox.fuel)
+        lut_idxs = _fuel_model_lut_index(self.LandFireLatLongBox.fuel)
+        fuel_data = _FUEL_MODEL_FUEL_LUT[lut_idxs]
         return fuel_data
 
 
@@ -681,7 +925,15 @@ class FunctionalFuelLayer(FuelLayer):
     Layer that stores fuel data computed from a function.
     """
 
-    def __init__(self, height, width, fuel_fn: FuelArrayFn, name: str) -> None:
+    def __init__(
+        self,
+        height,
+        width,
+        fuel_fn: FuelArrayFn,
+        name: str,
+        cache: Optional[LayerCache] = None,
+        cache_key: Optional[str] = None,
+    ) -> None:
         """
         Initialize the fuel layer by computing the fuels.
 
@@ -691,19 +943,66 @@ class FunctionalFuelLayer(FuelLayer):
             fuel_fn: A callable function that converts (x, y) coorindates to
                      elevations.
             name: The name of the fuel layer (e.g.: 'chaparral')
+            cache: The on-disk cache to load the fuel grid and image from and save
+                   them to
+            cache_key: The key of the fuel grid and image in the cache. The cache is
+                       only used if both `cache` and `cache_key` are specified.
         """
         super().__init__()
         self.height = height
         self.width = width
         self.name = name
 
-        self.data = self._make_data(fuel_fn)
+        self.fuel_grid: FuelGrid
         self.texture = self._load_texture()
-        self.image = self._make_image()
+
+        cached = None
+        if cache is not None and cache_key is not None:
+            cached = self._load_cached(cache, cache_key)
+        if cached is not None:
+            self.fuel_grid, self.image = cached
+            self.data = np.expand_dims(self.fuel_grid.to_fuels(), axis=-1)
+        else:
+            self.data = self._make_data(fuel_fn)
+            self.image = self._make_image()
+            if cache is not None and cache_key is not None:
+                for field in dataclasses.fields(FuelGrid):
+                    cache.save(cache_key, field.name, getattr(self.fuel_grid, field.name))
+                cache.save(cache_key, "image", self.image)
+
+    def _load_cached(
+        self, cache: LayerCache, cache_key: str
+    ) -> Optional[Tuple[FuelGrid, np.ndarray]]:
+        """
+        Load the fuel grid and image from the cache.
+
+        Arguments:
+            cache: The on-disk cache to load from
+            cache_key: The key of the fuel grid and image in the cache
+
+        Returns:
+            The cached fuel grid and image, or None if they are not all cached with the
+            correct shape
+        """
+        arrays: Dict[str, np.ndarray] = {}
+        for field in dataclasses.fields(FuelGrid):
+            arr = cache.load(cache_key, field.name)
+            if arr is None or arr.shape != (self.height, self.width):
+                return None
+            arrays[field.name] = arr
+        image = cache.load(cache_key, "image")
+        if image is None or image.shape != (self.height, self.width, 3):
+            return None
+
+        return FuelGrid(**arrays), image
 
     def _make_data(self, fuel_fn: FuelArrayFn) -> np.ndarray:
         """
-        Use self.fuel_fn to make the fuel data layer.
+        Use self.fuel_fn to make the fuel data layer. The fuel parameters are also
+        stored as arrays in self.fuel_grid.
+
+        The fuel function is called once with the full grid of (x, y) points. If it
+        only supports scalar inputs, it is called for each point instead.
 
         Arguments:
             fuel_fn: A callable function that converts (x, y) coorindates to
@@ -712,11 +1011,13 @@ class FunctionalFuelLayer(FuelLayer):
         Returns:
             A numpy array containing the fuel data
         """
-        x = np.arange(self.width)
-        y = np.arange(self.height)
-        X, Y = np.meshgrid(x, y)
-        fuel_fn_vect = np.vectorize(fuel_fn)
-        fuels = fuel_fn_vect(X, Y)
+        fuel_grid = _evaluate_grid_fn(fuel_fn, self.height, self.width)
+        if isinstance(fuel_grid, FuelGrid):
+            self.fuel_grid = fuel_grid
+            fuels = fuel_grid.to_fuels()
+        else:
+            fuels = np.asarray(fuel_grid)
+            self.fuel_grid = FuelGrid.from_fuels(fuels)
         # Expand third dimension to align with data layers
         fuels = np.expand_dims(fuels, axis=-1)
 
@@ -729,42 +1030,41 @@ class FunctionalFuelLayer(FuelLayer):
         Returns:
             A NumPy array containing the RGB of the fuel data.
         """
-        image = np.zeros((self.width, self.height) + (3,))
-
-        # Loop over the high-level tiles (these are not at the pixel level)
-        for i in range(self.height):
-            for j in range(self.width):
-                # Need these pixel level coordinates to span the correct range
-                updated_texture = self._update_texture_dryness(self.data[i][j][0])
-                image[i, j] = updated_texture
+        image = self._update_texture_dryness(self.fuel_grid).astype(np.float64)
 
         return image
 
-    def _update_texture_dryness(self, fuel: Fuel) -> np.ndarray:
+    def _update_texture_dryness(self, fuel_grid: FuelGrid) -> np.ndarray:
         """
         Determine the percent change to make the terrain look drier (i.e.
         more red/yellow/brown) by using the FuelArray values. Then, update
-        the texture color using PIL and image blending with a preset
-        yellow-brown color/image.
+        the texture color by blending it with a preset yellow-brown color. This gives
+        the same result as `PIL.Image.blend` at each pixel, but for the whole grid
+        at once.
 
         Arguments:
-            fuel: The Fuel with parameters that specify how "dry" the texture should look
+            fuel_grid: The fuels with parameters that specify how "dry" the texture
+                       should look at each pixel
 
         Returns:
-            new_texture: The texture with RGB values modified to look drier based
-                         on the parameters of fuel_arr
+            new_texture: The (H, W, 3) texture with RGB values modified to look drier
+                         based on the parameters of fuel_grid
         """
         # Add the numbers after normalization
         # M_x is inverted because a lower value is more flammable
-        color_change_pct = fuel.w_0 / 0.2296 + fuel.delta / 7 + (0.2 - fuel.M_x) / 0.2
+        color_change_pct = (
+            fuel_grid.w_0 / 0.2296 + fuel_grid.delta / 7 + (0.2 - fuel_grid.M_x) / 0.2
+        )
         # Divide by 3 since there are 3 values
         color_change_pct /= 3
 
-        arr = self.texture.copy()
-        arr_img = Image.fromarray(arr)
-        resized_brown = DRY_TERRAIN_BROWN_IMG.resize(arr_img.size)
-        texture_img = Image.blend(arr_img, resized_brown, color_change_pct / 2)
-        new_texture = np.array(texture_img)
+        texture = self.texture.reshape(-1, 3)[0].astype(np.int32)
+        # The dry terrain image is a single solid color
+        brown = np.array(DRY_TERRAIN_BROWN_IMG).reshape(-1, 3)[0].astype(np.int32)
+        # PIL blends in single precision and truncates the result to uint8
+        alpha = (color_change_pct / 2).astype(np.float32)[..., None]
+        new_texture = texture + alpha * (brown - texture).astype(np.float32)
+        new_texture = np.clip(new_texture, 0, 255).astype(np.uint8)
 
         return new_texture
 
@@ -784,6 +1084,87 @@ class FunctionalFuelLayer(FuelLayer):
         return texture
 
 
+class RasterFuelLayer(FuelLayer):
+    """
+    Layer that stores fuel data read from a local GeoTIFF of land cover classes (e.g.
+    MapBiomas), resampled to the simulation grid. The classes are converted to FBFM13
+    fuel models with a mapping table. No network calls are made, so any region with
+    local data can be used.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        latitude: float,
+        longitude: float,
+        height: int,
+        width: int,
+        pixel_scale: float,
+        mapping: Optional[Dict[int, int]] = None,
+        band: int = 0,
+        crs: str = "EPSG:4326",
+        cache: Optional[LayerCache] = None,
+    ) -> None:
+        """
+        Initialize the fuel layer by reading the GeoTIFF.
+
+        Arguments:
+            path: The path to the GeoTIFF of land cover classes
+            latitude: The latitude of the top-left corner of the layer
+            longitude: The longitude of the top-left corner of the layer
+            height: The height of the data layer in pixels
+            width: The width of the data layer in pixels
+            pixel_scale: The size of each pixel in feet
+            mapping: The mapping from land cover class to FBFM13 fuel model code.
+                     Defaults to the MapBiomas mapping `MapBiomasToFuelModel`.
+            band: The band of the GeoTIFF that contains the classes
+            crs: The CRS of the GeoTIFF
+            cache: The on-disk cache to load the resampled classes from and save them
+                   to
+        """
+        super().__init__()
+        self.path = Path(path).expanduser()
+        self.height = height
+        self.width = width
+        self.mapping = MapBiomasToFuelModel if mapping is None else mapping
+
+        classes = read_raster_cached(
+            self.path,
+            latitude,
+            longitude,
+            (height, width),
+            float(feet_to_meters(pixel_scale)),
+            method="nearest",
+            band=band,
+            crs=crs,
+            cache=cache,
+        )
+        self.fuel_models = self._map_classes(classes)
+        lut_idxs = _fuel_model_lut_index(self.fuel_models)
+        self.data = np.expand_dims(_FUEL_MODEL_FUEL_LUT[lut_idxs], axis=-1)
+        self.image = _FUEL_MODEL_RGB_LUT[lut_idxs] * 255.0
+
+    def _map_classes(self, classes: np.ndarray) -> np.ndarray:
+        """
+        Convert land cover classes to FBFM13 fuel model codes with self.mapping.
+
+        Arguments:
+            classes: The land cover classes
+
+        Returns:
+            The fuel model code of each class
+        """
+        unique_classes, inverse = np.unique(classes, return_inverse=True)
+        unknown = [c for c in unique_classes.tolist() if c not in self.mapping]
+        if len(unknown) > 0:
+            raise ValueError(
+                f"The land cover classes {unknown} in {self.path} do not have a fuel "
+                "model mapping"
+            )
+        codes = np.array([self.mapping[c] for c in unique_classes.tolist()])
+        return codes[inverse].reshape(classes.shape)
+
+
 class HistoricalLayer:
     def __init__(
         self,
@@ -850,6 +1231,9 @@ class HistoricalLayer:
         # get the duraton of fire specified
         self.duration = self._calc_time_elapsed(self.start_time, self.end_time)
         self.mitigation_arr, self.mitigation_pts = self._make_mitigations()
+        # The filled daily perimeters are only used for validation and plotting, so
+        # they are rasterized on first use
+        self._perimeter_masks: Optional[np.ndarray] = None
 
     def _get_historical_data(self) -> None:
         """Collect geopandas dataframes availbale for the specified fire"""
@@ -989,9 +1373,12 @@ class HistoricalLayer:
             array_points = []
             points = hand_lines.iloc[i]
             mitigation_points = []
-            for p in points:
-                lat, lon, create_date = p
-                y, x = get_closest_indice(self.lat_lon_array, (lat, lon))
+            ys, xs = get_closest_indices(
+                self.lat_lon_array,
+                np.array([p[0] for p in points]),
+                np.array([p[1] for p in points]),
+            )
+            for y, x, (_, _, create_date) in zip(ys.tolist(), xs.tolist(), points):
                 array_points.append((y, x))
                 mitigation_array[y, x] = BurnStatus.SCRATCHLINE
                 mitigation_points.append((x, y, BurnStatus.SCRATCHLINE, create_date))
@@ -1016,9 +1403,12 @@ class HistoricalLayer:
             array_points = []
             points = dozer_lines.iloc[i]
             mitigation_points = []
-            for p in points:
-                lat, lon, create_date = p
-                y, x = get_closest_indice(self.lat_lon_array, (lat, lon))
+            ys, xs = get_closest_indices(
+                self.lat_lon_array,
+                np.array([p[0] for p in points]),
+                np.array([p[1] for p in points]),
+            )
+            for y, x, (_, _, create_date) in zip(ys.tolist(), xs.tolist(), points):
                 array_points.append((y, x))
                 mitigation_array[y, x] = BurnStatus.FIRELINE
                 mitigation_points.append((x, y, BurnStatus.FIRELINE, create_date))
@@ -1100,48 +1490,98 @@ class HistoricalLayer:
 
         raise ValueError(f"Time data '{bmd_time}' does not match any known format.")
 
-    def _make_perimeters_image(self) -> np.ndarray:
+    @property
+    def perimeter_masks(self) -> np.ndarray:
         """
-        Create an array of the historical perimeter data
+        The (N, H, W) stack of filled masks of the N daily fire perimeters on the
+        simulation grid, in the order of `self.perimeter_deltas`.
+        """
+        if self._perimeter_masks is None:
+            self._perimeter_masks = self._make_perimeter_masks()
+        return self._perimeter_masks
+
+    def _make_perimeter_masks(self) -> np.ndarray:
+        """
+        Rasterize the daily fire perimeter polygons onto the simulation grid.
 
         Returns:
-            an array of the historical perimeters
+            The (N, H, W) boolean array of the filled perimeters
         """
-        perimeter_array = np.zeros((self.screen_size)).astype(int)
         geo_perimeters = self.polygons_df.loc[
             self.polygons_df["FeatureCat"] == "Wildfire Daily Fire Perimeter", :
         ]
+        masks = np.zeros((len(geo_perimeters), *self.screen_size), dtype=bool)
+        for i, geometry in enumerate(geo_perimeters.geometry):
+            masks[i] = rasterize_polygon(self.lat_lon_array, geometry)
 
-        def _get_geometry(df):
-            xy = df.geometry.exterior.xy
-            longs = xy[0].tolist()
-            lats = xy[1].tolist()
-            return [list(z) for z in zip(lats, longs)]
+        return masks
 
-        perimeters = geo_perimeters.apply(_get_geometry, axis=1)
+    def _make_perimeters_image(self) -> np.ndarray:
+        """
+        Create an array of the historical perimeter data
 
-        for i in range(len(perimeters)):
-            array_points = []
-            points = perimeters.iloc[i]
-            for p in points:
-                y, x = get_closest_indice(self.lat_lon_array, (p[1], p[0]))
-                array_points.append((x, y))
-                # set the value to the perimeter index
-                perimeter_array[x, y] = i + 1
-            # need to interpolate points in this polygon for connectedness
-            for perim_idx in range(len(array_points) - 1):
-                coords = np.linspace(
-                    array_points[perim_idx], array_points[perim_idx + 1], dtype=int
-                )
-                coords = np.unique(coords.astype(int), axis=0)
-                for coord_x, coord_y in coords:
-                    perimeter_array[coord_x, coord_y] = i + 1
+        Returns:
+            an array of the historical perimeters
+        """
+        perimeter_array = np.zeros((self.screen_size)).astype(int)
+        for i, mask in enumerate(self.perimeter_masks):
+            # set the outline of the filled perimeter to the perimeter index
+            outline = mask & ~binary_erosion(mask)
+            perimeter_array[outline] = i + 1
         out_image = np.zeros((*perimeter_array.shape, 4), dtype=np.uint8)
         # Map the colors to each index in the fireline points
         np.take(COLORS, perimeter_array, axis=0, out=out_image)
 
         return out_image
 
+    def compare_to_perimeters(
+        self, fire_map_history: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        Score simulated fire maps against all of the daily fire perimeters at once.
+        A pixel is burned in a fire map if it is `BURNING` or `BURNED`.
+
+        Arguments:
+            fire_map_history: The fire maps to compare with shape (..., N, H, W), where
+                              the fire map at index i is compared with perimeter i
+                              (e.g. the fire map after `self.perimeter_deltas[i]`). Any
+                              leading dimensions, like multiple runs, are kept. A single
+                              (H, W) fire map is compared with every perimeter.
+
+        Returns:
+            A dictionary of the `iou`, `precision`, and `recall` arrays with shape
+            (..., N). Each score is 0 where its denominator is 0.
+        """
+        fire_map_history = np.asarray(fire_map_history)
+        if fire_map_history.shape[-2:] != tuple(self.screen_size):
+            raise ValueError(
+                f"The fire maps have shape {fire_map_history.shape[-2:]}, but the "
+                f"perimeters have shape {tuple(self.screen_size)}"
+            )
+        burned = (fire_map_history == BurnStatus.BURNING) | (
+            fire_map_history == BurnStatus.BURNED
+        )
+        if burned.ndim == 2:
+            # Compare the single fire map with every perimeter
+            burned = burned[None]
+        masks = self.perimeter_masks
+        true_pos = (burned & masks).sum(axis=(-2, -1))
+        pred_pos = burned.sum(axis=(-2, -1))
+        actual_pos = masks.sum(axis=(-2, -1))
+        union = pred_pos + actual_pos - true_pos
+
+        def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+            num, den = np.broadcast_arrays(num, den)
+            return np.divide(
+                num, den, out=np.zeros(num.shape, dtype=float), where=den > 0
+            )
+
+        return {
+            "iou": _ratio(true_pos, union),
+            "precision": _ratio(true_pos, pred_pos),
+            "recall": _ratio(true_pos, actual_pos),
+        }
+
     def _get_perimeter_time_deltas(self):
         """
         Use `_calc_time_elapsed` functionality to get a list of time elapsed between
@@ -1176,6 +1616,113 @@ class HistoricalLayer:
         return perimeter_time_deltas
 
 
+def rasterize_polygon(lat_lon_data: np.ndarray, geometry: Any) -> np.ndarray:
+    """
+    Fill a (multi)polygon on the simulation grid. A pixel is filled if its center is
+    inside the polygon, and the holes of the polygon are not filled.
+
+    Arguments:
+        lat_lon_data: array of the (h, w, (lat, lon)) data of the screen_size of the
+            simulation, as created by `LandFireLatLongBox.create_lat_lon_array`
+        geometry: The shapely Polygon or MultiPolygon in (lon, lat) coordinates
+
+    Returns:
+        The (h, w) boolean mask of the filled polygon
+    """
+    shape = lat_lon_data.shape[:2]
+    mask = np.zeros(shape, dtype=bool)
+    for polygon in getattr(geometry, "geoms", [geometry]):
+        # Toggling the pixels inside each ring (even-odd rule) removes the holes
+        for ring in [polygon.exterior, *polygon.interiors]:
+            coords = np.asarray(ring.coords)
+            rows = _axis_fractional_indices(lat_lon_data[:, 0, 0], coords[:, 1])
+            cols = _axis_fractional_indices(lat_lon_data[0, :, 1], coords[:, 0])
+            rr, cc = draw_polygon(rows, cols, shape)
+            mask[rr, cc] ^= True
+
+    return mask
+
+
+def _axis_fractional_indices(axis: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Convert values to fractional indices of a regularly spaced (linspace) axis, using
+    the axis start and step.
+
+    Arguments:
+        axis: The regularly spaced axis values
+        values: The values to convert
+
+    Returns:
+        The fractional index of each value. If all of the axis values are the same, the
+        index is 0.
+    """
+    n = axis.shape[0]
+    step = (axis[-1] - axis[0]) / (n - 1) if n > 1 else 0.0
+    if step == 0:
+        return np.zeros(np.shape(values))
+    return (np.asarray(values) - axis[0]) / step
+
+
+def _closest_axis_indices(axis: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Find the index of the closest value in a regularly spaced (linspace) axis for each
+    of the values. The index is computed from the axis start and step, and then
+    compared with its neighbors so that ties and floating point error resolve to the
+    same (lowest) index as `np.argmin`.
+
+    Arguments:
+        axis: The regularly spaced axis values
+        values: The values to look up
+
+    Returns:
+        The index of the closest axis value for each value
+    """
+    n = axis.shape[0]
+    idxs = np.clip(
+        np.rint(_axis_fractional_indices(axis, values)).astype(np.intp), 0, n - 1
+    )
+    dists = np.abs(axis[idxs] - values)
+    for offset in (-1, 1):
+        neighbor_idxs = np.clip(idxs + offset, 0, n - 1)
+        neighbor_dists = np.abs(axis[neighbor_idxs] - values)
+        closer = (neighbor_dists < dists) | (
+            (neighbor_dists == dists) & (neighbor_idxs < idxs)
+        )
+        idxs = np.where(closer, neighbor_idxs, idxs)
+        dists = np.where(closer, neighbor_dists, dists)
+    return idxs
+
+
+def get_closest_indices(
+    lat_lon_data: np.ndarray, lats: np.ndarray, lons: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Utility function to find the closest indices for many geospatial points at once.
+
+    The lat/lon data must be a regular grid, like the one created by
+    `LandFireLatLongBox.create_lat_lon_array`, where the latitude only changes along
+    the rows and the longitude only changes along the columns. Then the closest point
+    in the grid can be found for each axis separately from the affine transform of the
+    grid, instead of computing the distance to every point in the grid.
+
+    Arguments:
+        lat_lon_data: array of the (h, w, (lat, lon)) data of the screen_size of the
+            simulation
+        lats: The latitudes of the points
+        lons: The longitudes of the points
+
+    Returns:
+        y, x: arrays of the indices in the lat/lon array that correspond to the
+            simulation array indices, in the same order as `get_closest_indice`
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    rows = _closest_axis_indices(lat_lon_data[:, 0, 0], lats)
+    cols = _closest_axis_indices(lat_lon_data[0, :, 1], lons)
+
+    return cols, rows
+
+
 def get_closest_indice(
     lat_lon_data: np.ndarray, point: Tuple[float, float]
 ) -> Tuple[int, int]:
@@ -1191,13 +1738,6 @@ def get_closest_indice(
         y, x: tuple pair of index in lat/lon array that corresponds to
             the simulation array index
     """
-
-    idx = np.argmin(
-        np.sqrt(
-            np.square(lat_lon_data[..., 0] - point[0])
-            + np.square(lat_lon_data[..., 1] - point[1])
-        )
-    )
-    x, y = np.unravel_index(idx, lat_lon_data.shape[:2])
+    y, x = get_closest_indices(lat_lon_data, np.array(point[0]), np.array(point[1]))
 
     return int(y), int(x)
@@ -0,0 +1,195 @@
+"""
+Functionality to read local GeoTIFFs (e.g. SRTM/TOPODATA elevation or MapBiomas land
+cover) onto the simulation grid. The simulation grid is a regular grid in the UTM zone
+of its top-left corner, so the source raster is reprojected and resampled to the
+simulation `pixel_scale`. Only the window of the source raster that covers the grid is
+read from disk.
+"""
+
+import math
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+import tifffile
+import zarr
+from pyproj import CRS, Transformer
+from scipy.ndimage import map_coordinates
+
+from .cache import LayerCache, layer_cache_key
+from .tile_index import Tile
+
+RESAMPLING_METHODS = ("nearest", "bilinear")
+
+
+def utm_crs(lat: float, lon: float) -> CRS:
+    """
+    Get the WGS84 UTM zone CRS that contains a point.
+
+    Arguments:
+        lat: The latitude of the point
+        lon: The longitude of the point
+
+    Returns:
+        The UTM zone CRS
+    """
+    zone = min(int((lon + 180) // 6) + 1, 60)
+    epsg = (32600 if lat >= 0 else 32700) + zone
+    return CRS.from_epsg(epsg)
+
+
+def _open_raster(path: Union[str, Path]) -> Any:
+    """
+    Open a GeoTIFF lazily. The tif is memory-mapped if it is uncompressed, and is
+    otherwise read by chunk through Zarr.
+
+    Arguments:
+        path: The path to the GeoTIFF
+
+    Returns:
+        A np.memmap or Zarr array of the raster
+    """
+    try:
+        return tifffile.memmap(path, mode="r")
+    except ValueError:
+        # The tif is compressed or not contiguous, so it can't be memory-mapped
+        return zarr.open(tifffile.imread(path, aszarr=True), mode="r")
+
+
+def read_raster(
+    path: Union[str, Path],
+    lat: float,
+    lon: float,
+    shape: Tuple[int, int],
+    pixel_size: float,
+    method: str = "nearest",
+    band: int = 0,
+    crs: str = "EPSG:4326",
+) -> np.ndarray:
+    """
+    Read a GeoTIFF onto a regular grid with its top-left corner at (lat, lon).
+
+    Arguments:
+        path: The path to the GeoTIFF
+        lat: The latitude of the top-left corner of the grid
+        lon: The longitude of the top-left corner of the grid
+        shape: The (height, width) of the grid in pixels
+        pixel_size: The size of each grid pixel in meters
+        method: The resampling method. Use 'nearest' for class data and 'bilinear'
+                for continuous data.
+        band: The band of the GeoTIFF to read
+        crs: The CRS of the GeoTIFF
+
+    Returns:
+        The (height, width) array of resampled data
+
+    Raises:
+        ValueError: If the method is not valid, the file is not a GeoTIFF, or the
+                    raster does not cover the grid
+    """
+    if method not in RESAMPLING_METHODS:
+        raise ValueError(
+            f"The resampling method ({method}) must be one of {RESAMPLING_METHODS}"
+        )
+    tile = Tile.from_file(path)
+    if tile is None:
+        raise ValueError(f"{path} is not a readable GeoTIFF")
+
+    # The centers of the grid pixels in the UTM zone of the top-left corner
+    grid_crs = utm_crs(lat, lon)
+    to_grid = Transformer.from_crs("EPSG:4326", grid_crs, always_xy=True)
+    x0, y0 = to_grid.transform(lon, lat)
+    x = x0 + (np.arange(shape[1]) + 0.5) * pixel_size
+    y = y0 - (np.arange(shape[0]) + 0.5) * pixel_size
+    X, Y = np.meshgrid(x, y)
+
+    # The fractional (row, column) of each grid pixel center in the source raster
+    to_src = Transformer.from_crs(grid_crs, crs, always_xy=True)
+    src_x, src_y = to_src.transform(X, Y)
+    rows = (tile.north - src_y) / tile.y_res - 0.5
+    cols = (src_x - tile.west) / tile.x_res - 0.5
+    if (
+        rows.min() < -0.5
+        or cols.min() < -0.5
+        or rows.max() > tile.height - 0.5
+        or cols.max() > tile.width - 0.5
+    ):
+        raise ValueError(f"The raster {path} does not cover the requested area")
+
+    # Only read the window of the raster that covers the grid (plus the neighbors
+    # needed for bilinear interpolation)
+    row_min = max(math.floor(rows.min()), 0)
+    col_min = max(math.floor(cols.min()), 0)
+    row_max = min(math.ceil(rows.max()) + 1, tile.height)
+    col_max = min(math.ceil(cols.max()) + 1, tile.width)
+    raster = _open_raster(path)
+    if raster.ndim == 2:
+        window = np.asarray(raster[row_min:row_max, col_min:col_max])
+    else:
+        window = np.asarray(raster[row_min:row_max, col_min:col_max, band])
+    rows -= row_min
+    cols -= col_min
+
+    if method == "nearest":
+        row_idxs = np.clip(np.rint(rows).astype(np.intp), 0, window.shape[0] - 1)
+        col_idxs = np.clip(np.rint(cols).astype(np.intp), 0, window.shape[1] - 1)
+        return window[row_idxs, col_idxs]
+    return map_coordinates(
+        window.astype(np.float64), [rows, cols], order=1, mode="nearest"
+    )
+
+
+def read_raster_cached(
+    path: Union[str, Path],
+    lat: float,
+    lon: float,
+    shape: Tuple[int, int],
+    pixel_size: float,
+    method: str = "nearest",
+    band: int = 0,
+    crs: str = "EPSG:4326",
+    cache: Optional[LayerCache] = None,
+) -> np.ndarray:
+    """
+    Read a GeoTIFF onto a regular grid with `read_raster`, and load the resampled
+    result from the cache if it was read before. The cache key includes the size and
+    modification time of the file, so changing the file invalidates the cache.
+
+    Arguments:
+        path: The path to the GeoTIFF
+        lat: The latitude of the top-left corner of the grid
+        lon: The longitude of the top-left corner of the grid
+        shape: The (height, width) of the grid in pixels
+        pixel_size: The size of each grid pixel in meters
+        method: The resampling method ('nearest' or 'bilinear')
+        band: The band of the GeoTIFF to read
+        crs: The CRS of the GeoTIFF
+        cache: The on-disk cache to load the result from and save it to
+
+    Returns:
+        The (height, width) array of resampled data
+    """
+    if cache is None:
+        return read_raster(path, lat, lon, shape, pixel_size, method, band, crs)
+
+    path = Path(path).expanduser().resolve()
+    stat = path.stat()
+    kwargs: Dict[str, Any] = {
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "lat": lat,
+        "lon": lon,
+        "pixel_size": pixel_size,
+        "method": method,
+        "band": band,
+        "crs": crs,
+    }
+    key = layer_cache_key("raster", str(path), kwargs, shape)
+    if key is not None:
+        data = cache.load(key, "data")
+        if data is not None and data.shape == tuple(shape):
+            return data
+    data = read_raster(path, lat, lon, shape, pixel_size, method, band, crs)
+    if key is not None:
+        cache.save(key, "data", data)
+    return data
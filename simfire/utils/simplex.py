@@ -0,0 +1,331 @@
+"""
+Simplex Noise
+=============
+
+Vectorized NumPy port of the 2D and 3D simplex noise from the `noise` package
+(`noise.snoise2` and `noise.snoise3`). The computations are done in single precision in
+the same order as the C implementation so that the outputs match the `noise` package
+for the same inputs, but whole arrays of points are computed at once instead of one
+Python call per point.
+"""
+
+from typing import Callable, Optional, Sequence, Union
+
+import numpy as np
+
+# 2D simplex skew factors
+F2 = np.float32(0.3660254037844386)  # 0.5 * (sqrt(3.0) - 1.0)
+G2 = np.float32(0.21132486540518713)  # (3.0 - sqrt(3.0)) / 6.0
+# 3D simplex skew factors
+F3 = np.float32(1.0) / np.float32(3.0)
+G3 = np.float32(1.0) / np.float32(6.0)
+
+# The permutation table used by the `noise` package, repeated twice to avoid wrapping
+# fmt: off
+PERM = np.tile(
+    np.array(
+        [
+            151, 160, 137, 91, 90, 15, 131, 13, 201, 95, 96, 53, 194, 233, 7, 225,
+            140, 36, 103, 30, 69, 142, 8, 99, 37, 240, 21, 10, 23, 190, 6, 148,
+            247, 120, 234, 75, 0, 26, 197, 62, 94, 252, 219, 203, 117, 35, 11, 32,
+            57, 177, 33, 88, 237, 149, 56, 87, 174, 20, 125, 136, 171, 168, 68, 175,
+            74, 165, 71, 134, 139, 48, 27, 166, 77, 146, 158, 231, 83, 111, 229, 122,
+            60, 211, 133, 230, 220, 105, 92, 41, 55, 46, 245, 40, 244, 102, 143, 54,
+            65, 25, 63, 161, 1, 216, 80, 73, 209, 76, 132, 187, 208, 89, 18, 169,
+            200, 196, 135, 130, 116, 188, 159, 86, 164, 100, 109, 198, 173, 186, 3, 64,
+            52, 217, 226, 250, 124, 123, 5, 202, 38, 147, 118, 126, 255, 82, 85, 212,
+            207, 206, 59, 227, 47, 16, 58, 17, 182, 189, 28, 42, 223, 183, 170, 213,
+            119, 248, 152, 2, 44, 154, 163, 70, 221, 153, 101, 155, 167, 43, 172, 9,
+            129, 22, 39, 253, 19, 98, 108, 110, 79, 113, 224, 232, 178, 185, 112, 104,
+            218, 246, 97, 228, 251, 34, 242, 193, 238, 210, 144, 12, 191, 179, 162, 241,
+            81, 51, 145, 235, 249, 14, 239, 107, 49, 192, 214, 31, 181, 199, 106, 157,
+            184, 84, 204, 176, 115, 121, 50, 45, 127, 4, 150, 254, 138, 236, 205, 93,
+            222, 114, 67, 29, 24, 72, 243, 141, 128, 195, 78, 66, 215, 61, 156, 180,
+        ],
+        dtype=np.int64,
+    ),
+    2,
+)
+# fmt: on
+
+# The x and y components of the gradient vectors used by the `noise` package
+GRAD3 = np.array(
+    [
+        [1, 1],
+        [-1, 1],
+        [1, -1],
+        [-1, -1],
+        [1, 0],
+        [-1, 0],
+        [1, 0],
+        [-1, 0],
+        [0, 1],
+        [0, -1],
+        [0, 1],
+        [0, -1],
+    ],
+    dtype=np.float32,
+)
+# The z components of the gradient vectors, which are only used by 3D noise
+GRAD3_Z = np.array([0, 0, 0, 0, 1, 1, -1, -1, 1, 1, -1, -1], dtype=np.float32)
+# The gradient x, y and z components for each permutation table entry, so that each
+# simplex corner only needs a single lookup per component
+GRAD_X = GRAD3[PERM % 12, 0]
+GRAD_Y = GRAD3[PERM % 12, 1]
+GRAD_Z = GRAD3_Z[PERM % 12]
+
+
+def _noise2(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Compute a single octave of 2D simplex noise for float32 arrays of points.
+
+    Arguments:
+        x: The x coordinates
+        y: The y coordinates
+
+    Returns:
+        The noise values in [-1, 1] for each (x, y) point
+    """
+    s = (x + y) * F2
+    i = np.floor(x + s)
+    j = np.floor(y + s)
+    t = (i + j) * G2
+
+    x0 = x - (i - t)
+    y0 = y - (j - t)
+
+    # i1/j1 are the offsets of the middle corner of the simplex
+    i1 = x0 > y0
+    j1 = ~i1
+
+    x1 = x0 - i1 + G2
+    y1 = y0 - j1 + G2
+    x2 = x0 + G2 * np.float32(2.0) - np.float32(1.0)
+    y2 = y0 + G2 * np.float32(2.0) - np.float32(1.0)
+
+    I = i.astype(np.intp) & 255  # noqa: E741
+    J = j.astype(np.intp) & 255
+    # np.take is faster than fancy indexing, and the indices are always in range
+    g0 = I + np.take(PERM, J, mode="wrap")
+    g1 = I + i1 + np.take(PERM, J + j1, mode="wrap")
+    g2 = I + 1 + np.take(PERM, J + 1, mode="wrap")
+
+    total = np.zeros_like(x)
+    for xx, yy, g in ((x0, y0, g0), (x1, y1, g1), (x2, y2, g2)):
+        # f = 0.5 - xx * xx - yy * yy, computed in place
+        f = xx * xx
+        np.subtract(np.float32(0.5), f, out=f)
+        f -= yy * yy
+        # Corners outside of the radius (f <= 0) do not contribute
+        np.maximum(f, np.float32(0.0), out=f)
+        # contribution = f * f * f * f * dot(gradient, (xx, yy))
+        n = f * f
+        n *= f
+        n *= f
+        dot = np.take(GRAD_X, g, mode="wrap") * xx
+        dot += np.take(GRAD_Y, g, mode="wrap") * yy
+        n *= dot
+        total += n
+
+    return total * np.float32(70.0)
+
+
+def _noise3(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+    """
+    Compute a single octave of 3D simplex noise for float32 arrays of points.
+
+    Arguments:
+        x: The x coordinates
+        y: The y coordinates
+        z: The z coordinates
+
+    Returns:
+        The noise values in [-1, 1] for each (x, y, z) point
+    """
+    s = (x + y + z) * F3
+    i = np.floor(x + s)
+    j = np.floor(y + s)
+    k = np.floor(z + s)
+    t = (i + j + k) * G3
+
+    x0 = x - (i - t)
+    y0 = y - (j - t)
+    z0 = z - (k - t)
+
+    # The offsets of the second (o1) and third (o2) corners of the simplex, which
+    # depend on the order of x0, y0 and z0
+    x_ge_y = x0 >= y0
+    y_ge_z = y0 >= z0
+    x_ge_z = x0 >= z0
+    i1 = x_ge_y & (y_ge_z | x_ge_z)
+    j1 = ~x_ge_y & y_ge_z
+    k1 = ~(i1 | j1)
+    i2 = x_ge_y | (y_ge_z & x_ge_z)
+    j2 = ~x_ge_y | y_ge_z
+    k2 = ~(i2 & j2)
+
+    x1 = x0 - i1 + G3
+    y1 = y0 - j1 + G3
+    z1 = z0 - k1 + G3
+    x2 = x0 - i2 + G3 * np.float32(2.0)
+    y2 = y0 - j2 + G3 * np.float32(2.0)
+    z2 = z0 - k2 + G3 * np.float32(2.0)
+    x3 = x0 - np.float32(1.0) + G3 * np.float32(3.0)
+    y3 = y0 - np.float32(1.0) + G3 * np.float32(3.0)
+    z3 = z0 - np.float32(1.0) + G3 * np.float32(3.0)
+
+    I = i.astype(np.intp) & 255  # noqa: E741
+    J = j.astype(np.intp) & 255
+    K = k.astype(np.intp) & 255
+
+    def perm(idx: np.ndarray) -> np.ndarray:
+        return np.take(PERM, idx, mode="wrap")
+
+    g0 = I + perm(J + perm(K))
+    g1 = I + i1 + perm(J + j1 + perm(K + k1))
+    g2 = I + i2 + perm(J + j2 + perm(K + k2))
+    g3 = I + 1 + perm(J + 1 + perm(K + 1))
+
+    total = np.zeros_like(x)
+    for xx, yy, zz, g in (
+        (x0, y0, z0, g0),
+        (x1, y1, z1, g1),
+        (x2, y2, z2, g2),
+        (x3, y3, z3, g3),
+    ):
+        # f = 0.6 - xx * xx - yy * yy - zz * zz, computed in place
+        f = xx * xx
+        np.subtract(np.float32(0.6), f, out=f)
+        f -= yy * yy
+        f -= zz * zz
+        # Corners outside of the radius (f <= 0) do not contribute
+        np.maximum(f, np.float32(0.0), out=f)
+        # contribution = f * f * f * f * dot(gradient, (xx, yy, zz))
+        n = f * f
+        n *= f
+        n *= f
+        dot = np.take(GRAD_X, g, mode="wrap") * xx
+        dot += np.take(GRAD_Y, g, mode="wrap") * yy
+        dot += np.take(GRAD_Z, g, mode="wrap") * zz
+        n *= dot
+        total += n
+
+    return total * np.float32(32.0)
+
+
+def _fractal(
+    noise_fn: Callable[..., np.ndarray],
+    coords: Sequence[Union[float, np.ndarray]],
+    octaves: int,
+    persistence: float,
+    lacunarity: float,
+    base: Optional[float],
+    chunk_size: int,
+) -> np.ndarray:
+    """
+    Sum octaves of a noise function for arrays of points, in chunks of points.
+
+    Arguments:
+        noise_fn: The single octave noise function
+        coords: The coordinate arrays of the points. Must broadcast together.
+        octaves: The number of passes of noise to sum together
+        persistence: The amplitude of each successive octave relative to the one below
+        lacunarity: The frequency of each successive octave relative to the one below
+        base: A fixed offset added to the noise coordinates, or None for no offset
+        chunk_size: The number of points to compute at a time
+
+    Returns:
+        A float32 array of noise values with the broadcast shape of `coords`
+    """
+    if octaves <= 0:
+        raise ValueError(f"Expected octaves value > 0, but got {octaves}")
+    arrays = np.broadcast_arrays(*(np.asarray(c, dtype=np.float32) for c in coords))
+    out = np.empty(arrays[0].shape, dtype=np.float32)
+    flat = [arr.ravel() for arr in arrays]
+    out_flat = out.reshape(-1)
+    persistence = np.float32(persistence)
+    lacunarity = np.float32(lacunarity)
+
+    def octave(chunks, freq=None):
+        if freq is not None:
+            chunks = [chunk * freq for chunk in chunks]
+        if base is not None:
+            chunks = [chunk + np.float32(base) for chunk in chunks]
+        return noise_fn(*chunks)
+
+    for start in range(0, out_flat.size, chunk_size):
+        chunks = [arr[start : start + chunk_size] for arr in flat]
+        freq = np.float32(1.0)
+        amp = np.float32(1.0)
+        max_amp = np.float32(1.0)
+        total = octave(chunks)
+        for _ in range(1, octaves):
+            freq *= lacunarity
+            amp *= persistence
+            max_amp += amp
+            total += octave(chunks, freq) * amp
+        out_flat[start : start + chunk_size] = total / max_amp
+
+    return out
+
+
+def snoise2(
+    x: Union[float, np.ndarray],
+    y: Union[float, np.ndarray],
+    octaves: int = 1,
+    persistence: float = 0.5,
+    lacunarity: float = 2.0,
+    base: float = 0.0,
+    chunk_size: int = 2**14,
+) -> np.ndarray:
+    """
+    Compute fractal 2D simplex noise for arrays of points. This matches the output of
+    `noise.snoise2(x, y, octaves, persistence, lacunarity, base=base)` for each point.
+
+    Arguments:
+        x: The x coordinates
+        y: The y coordinates. Must broadcast with `x`.
+        octaves: The number of passes of noise to sum together
+        persistence: The amplitude of each successive octave relative to the one below
+        lacunarity: The frequency of each successive octave relative to the one below
+        base: A fixed offset added to the noise coordinates
+        chunk_size: The number of points to compute at a time. This bounds the
+                    memory used by intermediate arrays for large inputs.
+
+    Returns:
+        A float32 array of noise values in [-1, 1] with the broadcast shape of
+        `x` and `y`
+    """
+    return _fractal(_noise2, (x, y), octaves, persistence, lacunarity, base, chunk_size)
+
+
+def snoise3(
+    x: Union[float, np.ndarray],
+    y: Union[float, np.ndarray],
+    z: Union[float, np.ndarray],
+    octaves: int = 1,
+    persistence: float = 0.5,
+    lacunarity: float = 2.0,
+    chunk_size: int = 2**14,
+) -> np.ndarray:
+    """
+    Compute fractal 3D simplex noise for arrays of points. This matches the output of
+    `noise.snoise3(x, y, z, octaves, persistence, lacunarity)` for each point.
+
+    Arguments:
+        x: The x coordinates
+        y: The y coordinates. Must broadcast with `x` and `z`.
+        z: The z coordinates. Must broadcast with `x` and `y`.
+        octaves: The number of passes of noise to sum together
+        persistence: The amplitude of each successive octave relative to the one below
+        lacunarity: The frequency of each successive octave relative to the one below
+        chunk_size: The number of points to compute at a time. This bounds the
+                    memory used by intermediate arrays for large inputs.
+
+    Returns:
+        A float32 array of noise values in [-1, 1] with the broadcast shape of
+        `x`, `y` and `z`
+    """
+    return _fractal(
+        _noise3, (x, y, z), octaves, persistence, lacunarity, None, chunk_size
+    )
@@ -3,7 +3,7 @@ from typing import Optional, Tuple, Union
 import numpy as np
 
 from ..enums import FuelConstants
-from ..world.parameters import Fuel
+from ..world.parameters import Fuel, FuelGrid
 
 
 def random_seed_list(
@@ -114,6 +114,29 @@ def chaparral(seed: Union[int, None] = None) -> Fuel:
     )
 
 
+def chaparral_grid(shape: Tuple[int, ...], seed: Optional[int] = None) -> FuelGrid:
+    """
+    Create a grid of chaparral fuels using an optional input seed
+
+    Each fuel parameter is drawn independently for every pixel from a local
+    `np.random.Generator`, so the global NumPy random state is not changed.
+
+    Arguments:
+        shape: The shape of the grid (e.g. (height, width))
+        seed: Initial seed.
+
+    Returns:
+        A FuelGrid of the given shape with randomized fuel parameters.
+    """
+    rng = np.random.default_rng(seed)
+    return FuelGrid(
+        w_0=rng.uniform(FuelConstants.W_0_MIN, FuelConstants.W_0_MAX, size=shape),
+        delta=rng.uniform(FuelConstants.DELTA_MIN, FuelConstants.DELTA_MAX, size=shape),
+        M_x=rng.uniform(FuelConstants.M_X_MIN, FuelConstants.M_X_MAX, size=shape),
+        sigma=rng.uniform(FuelConstants.SIGMA_MIN, FuelConstants.SIGMA_MAX, size=shape),
+    )
+
+
 def fuel(seed: Optional[int] = None) -> Tuple[float, float]:
     """
     Functionailty to use a random seed to define a center point.
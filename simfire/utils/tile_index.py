@@ -0,0 +1,193 @@
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union, cast
+
+import tifffile
+
+from .log import create_logger
+
+log = create_logger(__name__)
+
+# GeoTIFF tags that describe the pixel size and the location of the raster
+MODEL_PIXEL_SCALE_TAG = 33550
+MODEL_TIEPOINT_TAG = 33922
+
+
+@dataclass
+class Tile:
+    """
+    A cached GeoTIFF in EPSG:4326 (lat/long) coordinates.
+
+    Parameters:
+        path: The path to the GeoTIFF
+        west: The longitude of the left edge of the raster
+        north: The latitude of the top edge of the raster
+        x_res: The width of a pixel in degrees of longitude
+        y_res: The height of a pixel in degrees of latitude
+        height: The height of the raster in pixels
+        width: The width of the raster in pixels
+    """
+
+    path: Path
+    west: float
+    north: float
+    x_res: float
+    y_res: float
+    height: int
+    width: int
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> Optional["Tile"]:
+        """
+        Create a Tile from the GeoTIFF tags of a file. Only the header is read.
+
+        Arguments:
+            path: The path to the GeoTIFF
+
+        Returns:
+            The Tile, or None if the file is not a readable GeoTIFF
+        """
+        try:
+            with tifffile.TiffFile(path) as tif:
+                # The first page is always a TiffPage, not a TiffFrame
+                page = cast(tifffile.TiffPage, tif.pages[0])
+                scale = page.tags[MODEL_PIXEL_SCALE_TAG].value
+                tiepoint = page.tags[MODEL_TIEPOINT_TAG].value
+                height, width = page.imagelength, page.imagewidth
+        except (OSError, KeyError, IndexError, ValueError, tifffile.TiffFileError) as e:
+            log.warning(f"Could not read the GeoTIFF tags of {path}: {e}")
+            return None
+        # The tiepoint maps raster (i, j) to model (x, y)
+        west = tiepoint[3] - tiepoint[0] * scale[0]
+        north = tiepoint[4] + tiepoint[1] * scale[1]
+        return cls(Path(path), west, north, scale[0], scale[1], height, width)
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """The (west, south, east, north) bounds of the tile"""
+        return (
+            self.west,
+            self.north - self.height * self.y_res,
+            self.west + self.width * self.x_res,
+            self.north,
+        )
+
+    def index(self, lat: float, lon: float) -> Tuple[int, int]:
+        """
+        Get the (row, column) of the pixel that contains a point.
+
+        Arguments:
+            lat: The latitude of the point
+            lon: The longitude of the point
+
+        Returns:
+            The (row, column) index of the pixel
+        """
+        row = math.floor((self.north - lat) / self.y_res)
+        col = math.floor((lon - self.west) / self.x_res)
+        return row, col
+
+    def window(
+        self, lat: float, lon: float, shape: Tuple[int, int]
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Get the offset of a window that starts at the pixel containing a point.
+
+        Arguments:
+            lat: The latitude of the top-left corner of the window
+            lon: The longitude of the top-left corner of the window
+            shape: The (height, width) of the window in pixels
+
+        Returns:
+            The (row, column) offset of the window, or None if the window does not fit
+            in the tile
+        """
+        row, col = self.index(lat, lon)
+        if row < 0 or col < 0:
+            return None
+        if row + shape[0] > self.height or col + shape[1] > self.width:
+            return None
+        return row, col
+
+
+class TileIndex:
+    """
+    Spatial index over the bounds of cached GeoTIFF tiles. The index is a simple grid:
+    each tile is added to every grid cell that its bounds overlap, so finding the tiles
+    around a point only needs to look at a single cell.
+    """
+
+    def __init__(self, cell_size: float = 1.0) -> None:
+        """
+        Arguments:
+            cell_size: The size of each grid cell in degrees
+        """
+        self.cell_size = cell_size
+        self.tiles: List[Tile] = []
+        self._grid: Dict[Tuple[int, int], List[int]] = {}
+
+    @classmethod
+    def from_dir(cls, path: Union[str, Path], cell_size: float = 1.0) -> "TileIndex":
+        """
+        Create an index of all GeoTIFFs in a directory (recursively). No data is
+        downloaded, so this works offline from a pre-seeded directory.
+
+        Arguments:
+            path: The directory to search for `.tif` files
+            cell_size: The size of each grid cell in degrees
+
+        Returns:
+            The TileIndex of all readable GeoTIFFs
+        """
+        index = cls(cell_size)
+        path = Path(path)
+        if path.is_dir():
+            for tif_path in sorted(path.rglob("*.tif")):
+                tile = Tile.from_file(tif_path)
+                if tile is not None:
+                    index.add(tile)
+        return index
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return (
+            math.floor(lon / self.cell_size),
+            math.floor(lat / self.cell_size),
+        )
+
+    def add(self, tile: Tile) -> None:
+        """
+        Add a tile to the index.
+
+        Arguments:
+            tile: The tile to add
+        """
+        tile_id = len(self.tiles)
+        self.tiles.append(tile)
+        west, south, east, north = tile.bounds
+        x_min, y_min = self._cell(south, west)
+        x_max, y_max = self._cell(north, east)
+        for x in range(x_min, x_max + 1):
+            for y in range(y_min, y_max + 1):
+                self._grid.setdefault((x, y), []).append(tile_id)
+
+    def find(self, lat: float, lon: float, shape: Tuple[int, int]) -> Optional[Tile]:
+        """
+        Find a tile that fully contains a window.
+
+        Arguments:
+            lat: The latitude of the top-left corner of the window
+            lon: The longitude of the top-left corner of the window
+            shape: The (height, width) of the window in pixels
+
+        Returns:
+            The smallest tile that contains the window, or None if no tile does
+        """
+        candidates = [
+            self.tiles[tile_id]
+            for tile_id in self._grid.get(self._cell(lat, lon), [])
+            if self.tiles[tile_id].window(lat, lon, shape) is not None
+        ]
+        if len(candidates) == 0:
+            return None
+        return min(candidates, key=lambda tile: tile.height * tile.width)
@@ -86,7 +86,7 @@ def str_to_minutes(string: str) -> int:
 
 
 def meters_to_feet(
-    meters: Union[int, float, np.ndarray]
+    meters: Union[int, float, np.ndarray],
 ) -> Union[int, float, np.ndarray]:
     """
     Convert meters to feet
@@ -100,6 +100,19 @@ def meters_to_feet(
     return meters * 3.28084
 
 
+def feet_to_meters(feet: Union[int, float, np.ndarray]) -> Union[int, float, np.ndarray]:
+    """
+    Convert feet to meters
+
+    Arguments:
+        feet: The distance in feet.
+
+    Returns:
+        The distance in meters.
+    """
+    return feet * 0.3048
+
+
 def chains_to_feet_handline(chains: float) -> Tuple[int, int]:
     """
     Convert "chains" to (width x hieght) / hour per individual firefighters.
@@ -1,8 +1,21 @@
+import math
 import unittest
+from typing import Tuple
+
+import numpy as np
 
 from ...game._tests import DummyFuelLayer, DummyTopographyLayer
 from ...game.sprites import Terrain
-from ..wind_mechanics.cfd_wind import Fluid
+from ..wind_mechanics.cfd_wind import (
+    DirectPressureSolver,
+    Fluid,
+    advect,
+    diffuse,
+    lin_solve,
+    obstacle_mask,
+    project,
+    set_bnd,
+)
 
 
 class TestFluid(unittest.TestCase):
@@ -68,3 +81,253 @@ class TestFluid(unittest.TestCase):
     def test_step(self) -> None:
         """Test that the step function runs with no errors"""
         self.assertIsNone(self.fluid.step())
+
+
+# The cell-by-cell loop implementation that the vectorized solver replaced, used as a
+# reference on small square grids. The only change is in `_loop_advect`, where the
+# second half of the bilinear interpolation was lost to a stray line break.
+
+
+def _loop_set_bnd(b: int, x: np.ndarray, terrain: np.ndarray, N: Tuple[int, int]):
+    for i in range(1, N[0] - 1):
+        x[i][0] = -x[i][1] if b == 2 else x[i][1]
+        x[i][N[0] - 1] = -x[i][N[0] - 2] if b == 2 else x[i][N[0] - 2]
+    for j in range(1, N[1] - 1):
+        x[0][j] = -x[1][j] if b == 1 else x[1][j]
+        x[N[1] - 1][j] = -x[N[1] - 2][j] if b == 1 else x[N[1] - 2][j]
+    x[0][0] = 0.5 * (x[1][0] + x[0][1])
+    x[0][N[0] - 1] = 0.5 * (x[1][N[0] - 1] + x[0][N[0] - 2])
+    x[N[1] - 1][0] = 0.5 * (x[N[1] - 2][0] + x[N[1] - 1][1])
+    x[N[1] - 1][N[1] - 1] = 0.5 * (x[N[1] - 2][N[1] - 1] + x[N[1] - 1][N[1] - 2])
+    if b == 2:
+        for row in range(2, N[0] - 2):
+            for col in range(2, N[1] - 2):
+                if terrain[row][col] == 1.0:
+                    x[row][col] = 0.0
+                    if terrain[row][col - 1] == 0.0:
+                        x[row][col - 1] = -1 * x[row][col - 1]
+                    if terrain[row][col + 1] == 0:
+                        x[row][col + 1] = -1 * x[row][col + 1]
+    if b == 1:
+        for row in range(2, N[0] - 2):
+            for col in range(2, N[1] - 2):
+                if terrain[row][col] == 1.0:
+                    x[row][col] = 0.0
+                    if terrain[row - 1][col] == 0.0:
+                        x[row - 1][col] = -1 * x[row - 1][col]
+                    if terrain[row + 1][col] == 0.0:
+                        x[row + 1][col] = -1 * x[row + 1][col]
+
+
+def _loop_lin_solve(b, x, x0, a, c, itr, terrain, N):
+    cRecip = 1.0 / c
+    for t in range(0, itr):
+        for j in range(1, N[0] - 1):
+            for i in range(1, N[1] - 1):
+                calc = (
+                    x0[i][j] + a * (x[i + 1][j] + x[i - 1][j] + x[i][j + 1] + x[i][j - 1])
+                ) * cRecip
+                if terrain[i][j] != 1.0:
+                    x[i][j] = calc
+                else:
+                    x[i][j] = 0.0
+        _loop_set_bnd(b, x, terrain, N)
+
+
+def _loop_diffuse(b, x, x0, diff, dt, itr, terrain, N):
+    a = dt * diff * (N[0] - 2) * (N[1] - 2)
+    _loop_lin_solve(b, x, x0, a, 1 + 6 * a, itr, terrain, N)
+
+
+def _loop_project(velocX, velocY, p, div, itr, terrain, N):
+    for j in range(1, N[0] - 1):
+        for i in range(1, N[1] - 1):
+            div[i][j] = (
+                -0.5
+                * (
+                    velocX[i + 1][j]
+                    - velocX[i - 1][j]
+                    + velocY[i][j + 1]
+                    - velocY[i][j - 1]
+                )
+            ) / N[0]
+            p[i][j] = 0
+    _loop_set_bnd(0, div, terrain, N)
+    _loop_set_bnd(0, p, terrain, N)
+    _loop_lin_solve(0, p, div, 1, 6, itr, terrain, N)
+    for j in range(1, N[0] - 1):
+        for i in range(1, N[1] - 1):
+            velocX[i][j] -= 0.5 * (p[i + 1][j] - p[i - 1][j]) * N[1]
+            velocY[i][j] -= 0.5 * (p[i][j + 1] - p[i][j - 1]) * N[0]
+    _loop_set_bnd(1, velocX, terrain, N)
+    _loop_set_bnd(2, velocY, terrain, N)
+
+
+def _loop_advect(b, d, d0, velocX, velocY, dt, terrain, N):
+    dtx = dt * (N[1] - 2)
+    dty = dt * (N[0] - 2)
+    for j in range(1, N[0] - 1):
+        for i in range(1, N[1] - 1):
+            x = min(max(i - dtx * velocX[i][j], 0.5), N[1] - 2 + 0.5)
+            y = min(max(j - dty * velocY[i][j], 0.5), N[0] - 2 + 0.5)
+            i0 = math.floor(x)
+            j0 = math.floor(y)
+            s1 = x - i0
+            s0 = 1.0 - s1
+            t1 = y - j0
+            t0 = 1.0 - t1
+            d[i][j] = s0 * (t0 * d0[i0][j0] + t1 * d0[i0][j0 + 1]) + s1 * (
+                t0 * d0[i0 + 1][j0] + t1 * d0[i0 + 1][j0 + 1]
+            )
+    _loop_set_bnd(b, d, terrain, N)
+
+
+class TestVectorizedFluid(unittest.TestCase):
+    def setUp(self) -> None:
+        self.n = (12, 12)
+        rng = np.random.default_rng(41)
+        self.terrain = (rng.random(self.n) > 0.8).astype(np.float32)
+        self.obstacles = obstacle_mask(self.terrain, self.n)
+        self.x = rng.normal(size=self.n)
+        self.x0 = rng.normal(size=self.n)
+        # Velocities small enough that the back-traced positions stay on the grid
+        self.vx = rng.normal(scale=0.05, size=self.n)
+        self.vy = rng.normal(scale=0.05, size=self.n)
+        return super().setUp()
+
+    def test_set_bnd(self) -> None:
+        """Test that the boundaries and terrain collisions match the loops"""
+        for b in (0, 1, 2):
+            expected = self.x.copy()
+            _loop_set_bnd(b, expected, self.terrain, self.n)
+            result = self.x.copy()
+            set_bnd(b, result, self.obstacles)
+            np.testing.assert_array_equal(result, expected, err_msg=f"b={b}")
+
+    def test_advect(self) -> None:
+        """Test that the semi-Lagrangian advection matches the loops"""
+        for b in (0, 1, 2):
+            expected = np.zeros(self.n)
+            _loop_advect(
+                b, expected, self.x0, self.vx, self.vy, 1.0, self.terrain, self.n
+            )
+            result = np.zeros(self.n)
+            advect(b, result, self.x0, self.vx, self.vy, 1.0, self.obstacles)
+            np.testing.assert_allclose(result, expected, atol=1e-12, err_msg=f"b={b}")
+
+    def test_diffuse(self) -> None:
+        """
+        Test that the diffusion converges to the same solution as the loops. The
+        sweep order is different, so only the converged solutions match.
+        """
+        terrain = np.zeros(self.n)
+        expected = self.x.copy()
+        _loop_diffuse(0, expected, self.x0, 0.01, 1.0, 100, terrain, self.n)
+        result = self.x.copy()
+        diffuse(0, result, self.x0, 0.01, 1.0, 100, terrain == 1.0)
+        np.testing.assert_allclose(result, expected, atol=1e-10)
+
+    def test_project(self) -> None:
+        """Test that the projection converges to the same velocities as the loops"""
+        expected = (self.vx.copy(), self.vy.copy(), np.zeros(self.n), np.zeros(self.n))
+        _loop_project(*expected, 100, self.terrain, self.n)
+        result = (self.vx.copy(), self.vy.copy(), np.zeros(self.n), np.zeros(self.n))
+        project(*result, 100, self.obstacles)
+        for r, e in zip(result, expected):
+            np.testing.assert_allclose(r, e, atol=1e-10)
+
+    def test_step(self) -> None:
+        """Test that a full step with converged solves matches the loops"""
+        fluid = Fluid(self.n, 100, 1, 0.1, 0.0001, 0.0001, np.zeros(self.n))
+        for i in range(1, self.n[0] - 1):
+            fluid.addVelocity(i, 1, 0.0, 0.5)
+            fluid.addDensity(i, 1, 10.0)
+        arrays = ("Vx", "Vy", "Vx0", "Vy0", "s", "density")
+        expected = {name: getattr(fluid, name).copy() for name in arrays}
+        fluid.step()
+
+        e = expected
+        args = (fluid.itr, np.zeros(self.n), self.n)
+        _loop_diffuse(1, e["Vx0"], e["Vx"], fluid.visc, fluid.dt, *args)
+        _loop_diffuse(2, e["Vy0"], e["Vy"], fluid.visc, fluid.dt, *args)
+        _loop_project(e["Vx0"], e["Vy0"], e["Vx"], e["Vy"], *args)
+        _loop_advect(1, e["Vx"], e["Vx0"], e["Vx0"], e["Vy0"], fluid.dt, *args[1:])
+        _loop_advect(2, e["Vy"], e["Vy0"], e["Vx0"], e["Vy0"], fluid.dt, *args[1:])
+        _loop_project(e["Vx"], e["Vy"], e["Vx0"], e["Vy0"], *args)
+        _loop_diffuse(0, e["s"], e["density"], fluid.diff, fluid.dt, *args)
+        _loop_advect(0, e["density"], e["s"], e["Vx"], e["Vy"], fluid.dt, *args[1:])
+        for name in arrays:
+            np.testing.assert_allclose(
+                getattr(fluid, name), e[name], atol=1e-8, err_msg=name
+            )
+
+    def test_non_square_grid(self) -> None:
+        """
+        Test that non-square grids are solved, and that transposing the grid (and
+        swapping the velocity components) transposes the result
+        """
+        n = (8, 14)
+        rng = np.random.default_rng(7)
+        terrain = (rng.random(n) > 0.8).astype(np.float32)
+        fluid = Fluid(n, 4, 1, 0.1, 0.0, 0.0001, terrain[..., None])
+        fluid_t = Fluid(n[::-1], 4, 1, 0.1, 0.0, 0.0001, terrain.T)
+        for i in range(1, n[0] - 1):
+            fluid.addVelocity(i, 1, 0.0, 0.5)
+            fluid_t.addVelocity(1, i, 0.5, 0.0)
+        for _ in range(3):
+            fluid.step()
+            fluid_t.step()
+        self.assertTrue(np.isfinite(fluid.Vx).all() and np.isfinite(fluid.Vy).all())
+        np.testing.assert_allclose(fluid.Vx, fluid_t.Vy.T, atol=1e-12)
+        np.testing.assert_allclose(fluid.Vy, fluid_t.Vx.T, atol=1e-12)
+
+        with self.assertRaises(ValueError):
+            Fluid(n, 1, 1, 0.1, 0.0, 0.0001, terrain.T)
+
+
+class TestPressureSolver(unittest.TestCase):
+    def setUp(self) -> None:
+        self.n = (12, 16)
+        rng = np.random.default_rng(42)
+        self.obstacles = obstacle_mask(rng.random(self.n) > 0.85, self.n)
+        self.vx = rng.normal(scale=0.05, size=self.n)
+        self.vy = rng.normal(scale=0.05, size=self.n)
+        return super().setUp()
+
+    def test_direct_solve(self) -> None:
+        """
+        Test that the direct solve matches the converged Gauss-Seidel iterations and
+        removes the divergence
+        """
+        expected = (self.vx.copy(), self.vy.copy(), np.zeros(self.n), np.zeros(self.n))
+        project(*expected, 200, self.obstacles)
+        result = (self.vx.copy(), self.vy.copy(), np.zeros(self.n), np.zeros(self.n))
+        solver = DirectPressureSolver(self.obstacles)
+        project(*result, 1, self.obstacles, solver)
+        for r, e in zip(result, expected):
+            np.testing.assert_allclose(r, e, atol=1e-12)
+
+    def test_tolerance(self) -> None:
+        """Test that the Gauss-Seidel iterations stop once the updates are small"""
+        x0 = np.zeros(self.n)
+        x0[1:-1, 1:-1] = self.vx[1:-1, 1:-1]
+        x = np.zeros(self.n)
+        lin_solve(0, x, x0, 1, 6, 10_000, self.obstacles, tol=1e-6)
+        one_more = x.copy()
+        lin_solve(0, one_more, x0, 1, 6, 1, self.obstacles)
+        self.assertLess(np.abs(one_more - x).max(), 1e-6)
+        # The converged solution is close to the exact one
+        exact = np.zeros(self.n)
+        DirectPressureSolver(self.obstacles).solve(exact, x0)
+        np.testing.assert_allclose(x, exact, atol=1e-5)
+
+    def test_fluid_pressure_solver(self) -> None:
+        """Test that the Fluid uses the chosen pressure solver"""
+        terrain = self.obstacles.astype(np.float32)
+        fluid = Fluid(self.n, 1, 1, 0.1, 0.0, 0.0001, terrain, "direct")
+        self.assertIsInstance(fluid.pressure_solver, DirectPressureSolver)
+        fluid.addVelocity(5, 1, 0.0, 0.5)
+        fluid.step()
+        self.assertTrue(np.isfinite(fluid.Vy).all())
+        with self.assertRaises(ValueError):
+            Fluid(self.n, 1, 1, 0.1, 0.0, 0.0001, terrain, "multigrid")
@@ -0,0 +1,59 @@
+import unittest
+
+import numpy as np
+
+from ..wind_mechanics.diagnostic_wind import diagnostic_wind
+
+
+class TestDiagnosticWind(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pixel_scale = 30.0
+        self.y, self.x = np.mgrid[0:100, 0:120].astype(float)
+        return super().setUp()
+
+    def test_flat(self) -> None:
+        """Test that flat terrain keeps the domain-average wind everywhere"""
+        speeds, directions = diagnostic_wind(
+            np.full((100, 120, 1), 500.0), self.pixel_scale, 20.0, 135.0
+        )
+        self.assertEqual(speeds.shape, (100, 120))
+        np.testing.assert_allclose(speeds, 20.0)
+        np.testing.assert_allclose(directions, 135.0)
+
+    def test_hill(self) -> None:
+        """
+        Test that the wind over a hill speeds up at the top and on the slope into the
+        wind, and slows down on the lee slope, while keeping the average speed
+        """
+        hill = 1000 * np.exp(-((self.x - 60) ** 2 + (self.y - 50) ** 2) / (2 * 15**2))
+        # The wind blows toward the east
+        speeds, _ = diagnostic_wind(hill, self.pixel_scale, 20.0, 90.0)
+        self.assertAlmostEqual(speeds.mean(), 20.0)
+        self.assertGreater(speeds[50, 60], 20.0)
+        self.assertGreater(speeds[50, 45], speeds[50, 75])
+
+    def test_valley_channelling(self) -> None:
+        """
+        Test that the wind in a valley is turned toward the direction of the valley
+        """
+        # A valley that runs North to South
+        valley = 2 * self.pixel_scale * np.abs(self.x - 60)
+        _, directions = diagnostic_wind(valley, self.pixel_scale, 20.0, 45.0)
+        # The bottom of the valley has no slope to turn the wind
+        sides = np.hstack([directions[:, 45:59], directions[:, 62:76]])
+        self.assertTrue((sides < 45.0).all())
+        self.assertTrue((sides >= 0).all())
+        _, directions = diagnostic_wind(
+            valley, self.pixel_scale, 20.0, 45.0, channelling=0
+        )
+        np.testing.assert_allclose(directions, 45.0)
+
+    def test_invalid(self) -> None:
+        """Test that invalid factors and elevation shapes raise a ValueError"""
+        elevation = np.zeros((10, 10))
+        with self.assertRaises(ValueError):
+            diagnostic_wind(elevation, self.pixel_scale, 20.0, 0.0, channelling=1.0)
+        with self.assertRaises(ValueError):
+            diagnostic_wind(elevation, self.pixel_scale, 20.0, 0.0, lid_height=0)
+        with self.assertRaises(ValueError):
+            diagnostic_wind(np.zeros((10, 10, 2)), self.pixel_scale, 20.0, 0.0)
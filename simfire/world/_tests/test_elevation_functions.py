@@ -2,6 +2,8 @@ import unittest
 from pathlib import Path
 from typing import Callable
 
+import numpy as np
+
 from ...utils.config import Config
 from ..elevation_functions import ElevationFn, flat, gaussian, perlin
 
@@ -80,3 +82,21 @@ class TestElevationFunctions(unittest.TestCase):
             z_valid,
             msg=f"The returned value should be {z_valid}, " f"but is actually {z}",
         )
+
+    def test_array_inputs(self) -> None:
+        """Test that the elevation functions compute arrays of points at once"""
+        X, Y = np.meshgrid(np.arange(20), np.arange(10))
+        fns = (
+            flat(),
+            gaussian(100, 10, 5, 4, 3),
+            perlin(3, 0.5, 2.0, 827, 100, 300),
+        )
+        for fn in fns:
+            z = fn(X, Y)
+            z_valid = np.vectorize(fn)(X, Y)
+            self.assertEqual(
+                z.shape,
+                X.shape,
+                msg=f"The returned shape should be {X.shape}, but is {z.shape}",
+            )
+            np.testing.assert_allclose(z, z_valid)
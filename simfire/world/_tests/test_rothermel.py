@@ -5,7 +5,7 @@ import numpy as np
 from ...world.elevation_functions import flat
 from ..parameters import FuelParticle
 from ..presets import Chaparral, TallGrass
-from ..rothermel import compute_rate_of_spread
+from ..rothermel import compute_moisture_coefficients, compute_rate_of_spread
 
 KNOWN_ROTHERMEL_OUTPUT = [
     1059.7013711275968,
@@ -98,3 +98,80 @@ class TestRothermel(unittest.TestCase):
         )
         for i, r in enumerate(R.tolist()):
             self.assertAlmostEqual(r, KNOWN_ROTHERMEL_OUTPUT[i], places=2)
+
+    def test_compute_rate_of_spread_precision(self) -> None:
+        """
+        Test that float32 inputs produce a float32 rate of spread that agrees with the
+        float64 calculation to within single precision tolerance.
+        """
+        chaparral = Chaparral
+        grass = TallGrass
+        particle = FuelParticle()
+
+        new_loc_x = [1, 2, 2, 2, 1, 0, 0, 0]
+        new_loc_y = [2, 2, 1, 0, 0, 0, 1, 2]
+        # Include a zero fuel load to check that it is still set to 0
+        w_0 = [chaparral.w_0] * 3 + [0.0] + [grass.w_0] * 4
+        params = [
+            [1] * 8,
+            [1] * 8,
+            new_loc_x,
+            new_loc_y,
+            w_0,
+            [chaparral.delta] * 4 + [grass.delta] * 4,
+            [chaparral.M_x] * 4 + [grass.M_x] * 4,
+            [chaparral.sigma] * 4 + [grass.sigma] * 4,
+            [particle.h] * 8,
+            [particle.S_T] * 8,
+            [particle.S_e] * 8,
+            [particle.p_p] * 8,
+            [0.03] * 8,
+            [88 * 13] * 8,
+            [135] * 8,
+            [0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7],
+            [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, -1.0],
+        ]
+
+        R_64 = compute_rate_of_spread(*[np.array(p, dtype=np.float64) for p in params])
+        R_32 = compute_rate_of_spread(*[np.array(p, dtype=np.float32) for p in params])
+
+        self.assertEqual(R_64.dtype, np.float64)
+        self.assertEqual(R_32.dtype, np.float32)
+        self.assertEqual(R_32[3], 0)
+        np.testing.assert_allclose(R_32, R_64, rtol=1e-4)
+
+    def test_precomputed_moisture_coefficients(self) -> None:
+        """
+        Test that passing pre-computed moisture coefficients gives the same rate of
+        spread as computing them from the fuel moisture.
+        """
+        particle = FuelParticle()
+        n = 4
+        params = [
+            [1] * n,
+            [1] * n,
+            [1, 2, 2, 0],
+            [2, 2, 1, 0],
+            [Chaparral.w_0, 0.0, TallGrass.w_0, Chaparral.w_0],
+            [Chaparral.delta, 1.0, TallGrass.delta, Chaparral.delta],
+            [Chaparral.M_x, 1.0, TallGrass.M_x, Chaparral.M_x],
+            [Chaparral.sigma, 1.0, TallGrass.sigma, Chaparral.sigma],
+            [particle.h] * n,
+            [particle.S_T] * n,
+            [particle.S_e] * n,
+            [particle.p_p] * n,
+            [0.03, 0.03, 0.08, 0.3],
+            [88 * 13] * n,
+            [135] * n,
+            [0.0] * n,
+            [0.0] * n,
+        ]
+        arrs = [np.array(p, dtype=np.float64) for p in params]
+        eta_M, Q_ig = compute_moisture_coefficients(arrs[12], arrs[6])
+
+        R = compute_rate_of_spread(*arrs)
+        R_precomputed = compute_rate_of_spread(*arrs, eta_M=eta_M, Q_ig=Q_ig)
+
+        np.testing.assert_allclose(R_precomputed, R)
+        # Fuel moisture above the moisture of extinction stops the spread
+        self.assertAlmostEqual(R[3], 0)
@@ -1,5 +1,9 @@
+import itertools
 import unittest
 
+import noise
+import numpy as np
+
 from ..wind_mechanics.perlin_wind import WindNoise
 
 
@@ -36,9 +40,64 @@ class TestWindNoise(unittest.TestCase):
                 self.assertTrue(row_value <= self.range_max)
                 self.assertTrue(row_value >= self.range_min)
 
+    def test_generate_map_array_matches_noise(self) -> None:
+        """
+        Test that the vectorized map matches computing `noise.snoise2` per pixel, and
+        that a window matches the same part of the full map
+        """
+        shape = (30, 40)
+        wind_map = self.test_wind.generate_map_array(shape)
+        expected = np.array(
+            [
+                [
+                    self.test_wind._denormalize_noise_value(
+                        noise.snoise2(
+                            x / self.scale,
+                            y / self.scale,
+                            octaves=self.octaves,
+                            persistence=self.persistence,
+                            lacunarity=self.lacunarity,
+                            base=self.seed,
+                        )
+                    )
+                    for x in range(shape[1])
+                ]
+                for y in range(shape[0])
+            ],
+            dtype=np.float32,
+        )
+        np.testing.assert_array_equal(wind_map, expected)
+
+        window = self.test_wind.generate_window(5, 12, 10, 20)
+        np.testing.assert_array_equal(window, wind_map[5:15, 12:32])
+
     def test_denormalize_noise_value(self) -> None:
         noise_value = 0.5
 
         new_value = self.test_wind._denormalize_noise_value(noise_value)
         self.assertTrue(new_value >= self.range_min)
         self.assertTrue(new_value <= self.range_max)
+
+    def test_generate_frames(self) -> None:
+        """
+        Test that frames are generated lazily across buffers, stay in range, and
+        change smoothly over time
+        """
+        shape = (20, 30)
+        frames = self.test_wind.generate_frames(shape, time_scale=10, buffer_size=3)
+        first = list(itertools.islice(frames, 7))
+        for frame in first:
+            self.assertEqual(frame.shape, shape)
+            self.assertTrue((frame >= self.range_min).all())
+            self.assertTrue((frame <= self.range_max).all())
+        self.assertFalse(np.array_equal(first[0], first[-1]))
+        # Frames from different buffers should be the same as with a single buffer
+        single = self.test_wind.generate_frames(shape, time_scale=10, buffer_size=7)
+        np.testing.assert_array_equal(first, list(itertools.islice(single, 7)))
+        # Consecutive frames should be closer than frames far apart in time
+        step = np.abs(first[1] - first[0]).mean()
+        far = list(itertools.islice(frames, 100))[-1]
+        self.assertLess(step, np.abs(far - first[0]).mean())
+
+        with self.assertRaises(ValueError):
+            next(self.test_wind.generate_frames(shape, time_scale=0))
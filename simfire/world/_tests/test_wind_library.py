@@ -0,0 +1,100 @@
+import unittest
+
+import numpy as np
+
+from ...utils.generate_cfd_wind_layer import generate_direction_array
+from ..wind_mechanics.wind_controller import WindControllerCFD, inflow_velocity
+from ..wind_mechanics.wind_library import CFDWindLibrary
+
+
+class TestInflow(unittest.TestCase):
+    def test_inflow_velocity(self) -> None:
+        """
+        Test that named and numeric directions give the velocity of the wind blowing
+        away from them
+        """
+        # The first grid axis (rows) points south and the second (columns) east
+        self.assertEqual(inflow_velocity(10, "north"), (10.0, 0.0))
+        self.assertEqual(inflow_velocity(10, "west"), (0.0, 10.0))
+        self.assertEqual(inflow_velocity(10, 90), (0.0, -10.0))
+        self.assertEqual(inflow_velocity(10, "South"), (-10.0, 0.0))
+        velocity_x, velocity_y = inflow_velocity(10, 225)
+        self.assertAlmostEqual(velocity_x, -10 / np.sqrt(2))
+        self.assertAlmostEqual(velocity_y, 10 / np.sqrt(2))
+        with self.assertRaises(ValueError):
+            inflow_velocity(10, "up")
+
+    def test_iterate_wind_step(self) -> None:
+        """
+        Test that the inflow is added along the upwind edges and the wind blows away
+        from the inflow direction, with rows pointing south and columns east
+        """
+        controller = WindControllerCFD(
+            screen_size=(16, 16), wind_speed=2.0, wind_direction=315.0
+        )
+        controller.iterate_wind_step()
+        direction = generate_direction_array(
+            controller.get_wind_velocity_field_x(), controller.get_wind_velocity_field_y()
+        )
+        # The wind from the northwest blows to the southeast along both upwind edges
+        np.testing.assert_allclose(direction[1, 2:-2], 135.0, atol=10.0)
+        np.testing.assert_allclose(direction[2:-2, 1], 135.0, atol=10.0)
+
+        # On a non-square grid, the net wind blows away from each cardinal inflow
+        for wind_direction, expected in (("north", 180.0), ("east", 270.0)):
+            with self.subTest(wind_direction=wind_direction):
+                controller = WindControllerCFD(
+                    screen_size=(16, 24), wind_speed=2.0, wind_direction=wind_direction
+                )
+                for _ in range(3):
+                    controller.iterate_wind_step()
+                net_direction = generate_direction_array(
+                    controller.get_wind_velocity_field_x()[1:-1, 1:-1].sum(),
+                    controller.get_wind_velocity_field_y()[1:-1, 1:-1].sum(),
+                )
+                self.assertAlmostEqual(float(net_direction), expected, delta=5.0)
+
+
+class TestCFDWindLibrary(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loaded = []
+
+        def load_sector(direction: float):
+            # A uniform field blowing away from the inflow direction
+            self.loaded.append(direction)
+            return np.full((4, 6), 10.0), np.full((4, 6), (direction + 180.0) % 360)
+
+        self.library = CFDWindLibrary(30.0, 10.0, load_sector)
+        return super().setUp()
+
+    def test_sectors(self) -> None:
+        """Test that the sectors cover the circle and must divide it evenly"""
+        self.assertEqual(len(self.library.sectors), 12)
+        self.assertEqual(self.library.sectors[1], 30.0)
+        with self.assertRaises(ValueError):
+            CFDWindLibrary(25.0, 10.0, lambda direction: (np.zeros(1), np.zeros(1)))
+        for sector_size in (0, -30.0):
+            with self.subTest(sector_size=sector_size):
+                with self.assertRaises(ValueError):
+                    CFDWindLibrary(
+                        sector_size, 10.0, lambda direction: (np.zeros(1), np.zeros(1))
+                    )
+
+    def test_wind(self) -> None:
+        """
+        Test that sectors are loaded on demand, and that directions between sectors
+        are interpolated and scaled by the speed
+        """
+        magnitude, direction = self.library.wind("east", 10.0)
+        self.assertEqual(self.loaded, [90.0])
+        np.testing.assert_allclose(magnitude, 10.0)
+        np.testing.assert_allclose(direction, 270.0)
+
+        magnitude, direction = self.library.wind(345.0, 20.0)
+        self.assertEqual(self.loaded, [90.0, 330.0, 0.0])
+        np.testing.assert_allclose(direction, 165.0)
+        # Linear interpolation of the unit vectors 30 degrees apart
+        np.testing.assert_allclose(magnitude, 20.0 * np.cos(np.radians(15)))
+
+        self.library.build()
+        self.assertEqual(sorted(self.loaded), self.library.sectors)
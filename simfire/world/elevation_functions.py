@@ -1,9 +1,14 @@
-from math import exp
-from typing import Callable
+from typing import Callable, Union
 
-import noise
+import numpy as np
 
-ElevationFn = Callable[[int, int], float]
+from ..utils import simplex
+
+# Elevation functions accept either scalar (x, y) points or arrays of points and
+# return elevations of the same (broadcast) shape
+ElevationInput = Union[int, float, np.ndarray]
+ElevationOutput = Union[float, np.ndarray]
+ElevationFn = Callable[[ElevationInput, ElevationInput], ElevationOutput]
 
 
 def flat() -> ElevationFn:
@@ -14,18 +19,20 @@ def flat() -> ElevationFn:
         A callable that computes z values for (x, y) inputs
     """
 
-    def fn(x: int, y: int) -> float:
+    def fn(x: ElevationInput, y: ElevationInput) -> ElevationOutput:
         """
         Return a constant, flat elevation value at every x and y point
 
         Arguments:
-            x: The input x location (isn't used).
-            y: The input y location (isn't used).
+            x: The input x location(s). Only used for the output shape.
+            y: The input y location(s). Only used for the output shape.
 
         Returns:
-            The constant, flat elevation of 0.
+            The constant, flat elevation of 0, as an array if `x` or `y` is an array
         """
-        return 0
+        if np.isscalar(x) and np.isscalar(y):
+            return 0
+        return np.zeros(np.broadcast(x, y).shape)
 
     return fn
 
@@ -48,22 +55,24 @@ def gaussian(
         A callabe that computes z values for (x, y) inputs
     """
 
-    def fn(x: int, y: int) -> float:
+    def fn(x: ElevationInput, y: ElevationInput) -> ElevationOutput:
         """
-        Return the gaussian function value at the specified point.
+        Return the gaussian function value at the specified point(s).
 
         Arguments:
-            x: the input x coordinate
-            y: the input y coordinate
+            x: the input x coordinate(s)
+            y: the input y coordinate(s)
 
         Returns:
-            The output z coordinate computed by the function
+            The output z coordinate(s) computed by the function
         """
 
         exp_term = ((x - mu_x) ** 2 / (4 * sigma_x**2)) + (
             (y - mu_y) ** 2 / (4 * sigma_y**2)
         )
-        z = amplitude * exp(-exp_term)
+        z = amplitude * np.exp(-exp_term)
+        if np.ndim(z) == 0:
+            return float(z)
         return z
 
     return fn
@@ -99,24 +108,30 @@ def perlin(
     if range_min >= range_max:
         raise ValueError(f"range_min={range_min} must be less than range_max={range_max}")
 
-    def fn(x: int, y: int) -> float:
+    def fn(x: ElevationInput, y: ElevationInput) -> ElevationOutput:
         """
-        Return the generated Perlin Noise function at the specified value.
+        Return the generated Perlin Noise function at the specified value(s).
 
         Arguments:
-            x: the input x coordinate
-            y: the input y coordinate
+            x: the input x coordinate(s)
+            y: the input y coordinate(s)
 
         Returns:
-            The output z coordinate computed by the function
+            The output z coordinate(s) computed by the function
         """
-        z = noise.snoise2(x, y, octaves, persistence, lacunarity, base=seed)
+        # The noise is computed in single precision like `noise.snoise2`, but the
+        # scaling is done in double precision
+        z = simplex.snoise2(x, y, octaves, persistence, lacunarity, base=seed).astype(
+            np.float64
+        )
         # Normalize to [0, 1]
         z = (z + 1) / 2
         # Scale to [0, range_max-range_min]
         z = z * (range_max - range_min)
         # Add to normalize to [range_min, range_max]
         z = z + range_min
+        if z.ndim == 0:
+            return float(z)
         return z
 
     return fn
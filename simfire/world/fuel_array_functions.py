@@ -1,12 +1,17 @@
-from typing import Callable, Optional
+from typing import Callable, Optional, Union
 
-from ..utils.terrain import chaparral
-from .parameters import Fuel
+import numpy as np
 
-FuelArrayFn = Callable[[float, float], Fuel]
+from ..utils.terrain import chaparral, chaparral_grid
+from .parameters import Fuel, FuelGrid
 
+# Fuel functions accept either scalar (x, y) points and return a single Fuel, or
+# arrays of points and return a FuelGrid with the (broadcast) shape of the points
+FuelArrayInput = Union[float, np.ndarray]
+FuelArrayFn = Callable[[FuelArrayInput, FuelArrayInput], Union[Fuel, FuelGrid]]
 
-def chaparral_fn(seed: Optional[int] = None) -> FuelArrayFn:
+
+def chaparral_fn(seed: Optional[int] = None, per_pixel: bool = False) -> FuelArrayFn:
     """
     Return a callable that accepts (x, y) coordinates and returns a Fuel with
     Chaparral characterisitics at that coordinate
@@ -14,27 +19,56 @@ def chaparral_fn(seed: Optional[int] = None) -> FuelArrayFn:
     The w_0 parameter is slightly altered/jittered to allow for non-uniform terrains.
     Specifying a specific seed allows for re-createable random terrain.
 
+    By default, a seeded function returns the same Fuel at every coordinate, and an
+    unseeded function draws a new Fuel for every coordinate. With `per_pixel`, the
+    fuel parameters of every pixel are drawn independently from one generator
+    seeded with `seed`, so seeded terrains are non-uniform and re-createable. Scalar
+    coordinates then get a single Fuel drawn from a generator with the same seed. Each
+    parameter of a grid is drawn as one block, so this Fuel does not match the fuel of
+    any particular pixel.
+
     Arguments:
         seed: The seed to initialize the Fuel w_0 randomization
+        per_pixel: Whether to draw independent (seeded) fuel parameters per pixel
 
     Returns:
         A FuelFn callable that accepts (x,y) coordinates and returns a Fuel
     """
 
-    def fn(x: float, y: float) -> Fuel:
+    def fn(x: FuelArrayInput, y: FuelArrayInput) -> Union[Fuel, FuelGrid]:
         """
         Use the input coordinates to generate a Fuel for the environment at that
         coordinate.
 
         Arguments:
-            x: The input x coordinate
-            y: The input y coorindate
+            x: The input x coordinate(s)
+            y: The input y coorindate(s)
 
         Returns:
-            A Fuel
+            A Fuel for scalar inputs, or a FuelGrid with the shape of the inputs
         """
-        fuel = chaparral(seed)
+        shape = np.broadcast(x, y).shape
+        if per_pixel or seed is None:
+            if len(shape) > 0:
+                return chaparral_grid(shape, seed)
+            if seed is None:
+                return chaparral(seed)
+            grid = chaparral_grid((), seed)
+            return Fuel(
+                w_0=float(grid.w_0),
+                delta=float(grid.delta),
+                M_x=float(grid.M_x),
+                sigma=float(grid.sigma),
+            )
 
-        return fuel
+        fuel = chaparral(seed)
+        if len(shape) == 0:
+            return fuel
+        return FuelGrid(
+            w_0=np.full(shape, fuel.w_0),
+            delta=np.full(shape, fuel.delta),
+            M_x=np.full(shape, fuel.M_x),
+            sigma=np.full(shape, fuel.sigma),
+        )
 
     return fn
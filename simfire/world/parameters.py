@@ -1,8 +1,12 @@
 from dataclasses import dataclass
-from typing import Sequence, Union
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
+# A single wind keyframe grid, either in memory or as a path to a .npy file on disk
+WindGridType = Union[np.ndarray, str, Path]
+
 
 @dataclass
 class FuelParticle:
@@ -49,6 +53,316 @@ class Fuel:
     sigma: float
 
 
+@dataclass
+class FuelGrid:
+    """
+    A grid of fuels stored as one array per Fuel parameter. This is much faster to
+    create and compute with than an array of Fuel objects.
+
+    Parameters:
+        w_0: Oven-dry Fuel Load (lb/ft^2) at each pixel.
+        delta: Fuel bed depth (ft) at each pixel.
+        M_x: Dead fuel moisture of extinction at each pixel.
+        sigma: Surface-area-to-volume ratio (ft^2/ft^3) at each pixel.
+    """
+
+    w_0: np.ndarray
+    delta: np.ndarray
+    M_x: np.ndarray
+    sigma: np.ndarray
+
+    def __post_init__(self) -> None:
+        shapes = {np.shape(arr) for arr in (self.w_0, self.delta, self.M_x, self.sigma)}
+        if len(shapes) != 1:
+            raise ValueError(
+                f"All FuelGrid arrays must have the same shape, got {shapes}"
+            )
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return np.shape(self.w_0)
+
+    @classmethod
+    def from_fuels(cls, fuels: np.ndarray) -> "FuelGrid":
+        """
+        Create a FuelGrid from an array of Fuel objects.
+
+        Arguments:
+            fuels: An array of Fuel objects
+
+        Returns:
+            A FuelGrid with the same shape as `fuels`
+        """
+        return cls(
+            *(
+                np.frompyfunc(lambda fuel: getattr(fuel, name), 1, 1)(fuels).astype(
+                    np.float64
+                )
+                for name in ("w_0", "delta", "M_x", "sigma")
+            )
+        )
+
+    def to_fuels(self) -> np.ndarray:
+        """
+        Create an array of Fuel objects from the grid.
+
+        Returns:
+            An object array of Fuel with the same shape as the grid
+        """
+        fuels = np.frompyfunc(Fuel, 4, 1)(self.w_0, self.delta, self.M_x, self.sigma)
+        return np.asarray(fuels, dtype=object)
+
+
+@dataclass
+class WindSchedule:
+    """
+    A time-varying wind field made up of keyframes. Each keyframe has a time (in
+    minutes of simulation time), a wind speed grid, and a wind direction grid. The
+    grids can be (T, H, W) arrays (e.g. a `np.memmap`), or sequences of (H, W) arrays
+    or paths to .npy files. Keyframes are only read when the fire manager needs them,
+    so only the keyframes around the current simulation time are held in memory.
+
+    Parameters:
+        times: The simulation time of each keyframe (minutes). Must be increasing.
+        U: The wind speed grids at midflame height (ft/min) for each keyframe.
+        U_dir: The wind direction grids at midflame height (degrees) for each
+               keyframe. 0 is North, 90 is East, 180 is South, 270 is West.
+        interpolate: Whether to linearly interpolate between keyframes. If `False`,
+                     the most recent keyframe is used.
+    """
+
+    times: Sequence[float]
+    U: Union[np.ndarray, Sequence[WindGridType]]
+    U_dir: Union[np.ndarray, Sequence[WindGridType]]
+    interpolate: bool = True
+
+    def __post_init__(self) -> None:
+        if not len(self.times) == len(self.U) == len(self.U_dir):
+            raise ValueError(
+                f"The number of keyframe times ({len(self.times)}), wind speeds "
+                f"({len(self.U)}), and wind directions ({len(self.U_dir)}) should "
+                "match"
+            )
+        if len(self.times) == 0:
+            raise ValueError("The wind schedule should have at least one keyframe")
+        if np.any(np.diff(self.times) <= 0):
+            raise ValueError(
+                f"The keyframe times should be strictly increasing, but got {self.times}"
+            )
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @classmethod
+    def from_keyframes(
+        cls,
+        keyframes: Sequence[Tuple[float, WindGridType, WindGridType]],
+        interpolate: bool = True,
+    ) -> "WindSchedule":
+        """
+        Create a WindSchedule from a list of (time, speed_grid, dir_grid) keyframes.
+
+        Arguments:
+            keyframes: The (time, speed_grid, dir_grid) keyframes
+            interpolate: Whether to linearly interpolate between keyframes
+
+        Returns:
+            The WindSchedule for the keyframes
+        """
+        times, U, U_dir = zip(*keyframes)
+        return cls(list(times), list(U), list(U_dir), interpolate=interpolate)
+
+    @classmethod
+    def from_npy(
+        cls,
+        times: Sequence[float],
+        speed_path: Union[str, Path],
+        direction_path: Union[str, Path],
+        interpolate: bool = True,
+    ) -> "WindSchedule":
+        """
+        Create a WindSchedule from (T, H, W) wind speed and direction stacks saved as
+        .npy files. The files are memory-mapped so only the keyframes that are used
+        are read from disk.
+
+        Arguments:
+            times: The simulation time of each keyframe (minutes)
+            speed_path: The path to the (T, H, W) wind speed .npy file
+            direction_path: The path to the (T, H, W) wind direction .npy file
+            interpolate: Whether to linearly interpolate between keyframes
+
+        Returns:
+            The WindSchedule for the memory-mapped stacks
+        """
+        U = np.load(speed_path, mmap_mode="r")
+        U_dir = np.load(direction_path, mmap_mode="r")
+        return cls(times, U, U_dir, interpolate=interpolate)
+
+    def keyframe(self, idx: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Read the wind speed and direction grids of a single keyframe.
+
+        Arguments:
+            idx: The index of the keyframe
+
+        Returns:
+            The wind speed and wind direction grids of the keyframe
+        """
+
+        def load(grid: WindGridType) -> np.ndarray:
+            if isinstance(grid, (str, Path)):
+                return np.load(grid, mmap_mode="r")
+            return np.asarray(grid)
+
+        return load(self.U[idx]), load(self.U_dir[idx])
+
+
+@dataclass
+class WindStream:
+    """
+    A time-varying wind field that is read one frame at a time from an iterator, like
+    the evolving noise frames from `WindController.generate_wind_frames`. Frame `i` is
+    used from `i * interval` minutes of simulation time until the next frame. Frames
+    are only pulled from the iterator when the simulation reaches them, so the full
+    (T, H, W) stack is never created. The last frame is held if the iterator runs out.
+    The iterator is consumed by the simulation, so a WindStream can only be used once.
+
+    Parameters:
+        frames: The (wind speed, wind direction) grids for each frame, in ft/min and
+                degrees (0 is North, 90 is East, 180 is South, 270 is West)
+        interval: The amount of time in minutes of simulation time that each frame
+                  covers
+    """
+
+    frames: Iterable[Tuple[np.ndarray, np.ndarray]]
+    interval: float
+
+    def __post_init__(self) -> None:
+        if self.interval <= 0:
+            raise ValueError(
+                f"The wind stream interval ({self.interval}) should be greater than 0"
+            )
+        self._frames: Iterator[Tuple[np.ndarray, np.ndarray]] = iter(self.frames)
+
+    def next_frame(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Pull the next frame from the iterator.
+
+        Returns:
+            The wind speed and wind direction grids of the next frame, or None if
+            there are no more frames
+        """
+        return next(self._frames, None)
+
+
+@dataclass
+class CoarseWindGrid:
+    """
+    A wind field on a coarser grid than the terrain, like the output of a weather
+    model. The wind is bilinearly interpolated at the terrain pixels where it is
+    needed, so a full resolution wind grid is never created.
+
+    The `geotransform` places the grid on the terrain in the order of a GDAL
+    geotransform, but in units of terrain pixels: (x of the left edge, cell width,
+    0, y of the top edge, 0, cell height). The y axis points down the terrain like
+    the rows of the terrain arrays, so the cell height is positive. The grid must
+    cover the whole terrain.
+
+    Parameters:
+        U: The (h, w) wind speed grid at midflame height (ft/min).
+        U_dir: The (h, w) wind direction grid at midflame height (degrees). 0 is
+               North, 90 is East, 180 is South, 270 is West.
+        geotransform: The position and cell size of the grid on the terrain.
+    """
+
+    U: np.ndarray
+    U_dir: np.ndarray
+    geotransform: Tuple[float, float, float, float, float, float]
+
+    def __post_init__(self) -> None:
+        self.U = np.asarray(self.U, dtype=np.float64)
+        self.U_dir = np.asarray(self.U_dir, dtype=np.float64)
+        if self.U.ndim != 2 or self.U.shape != self.U_dir.shape:
+            raise ValueError(
+                f"The wind speed grid shape {self.U.shape} and wind direction grid "
+                f"shape {self.U_dir.shape} should be the same (h, w) shape"
+            )
+        _, cell_width, x_skew, _, y_skew, cell_height = self.geotransform
+        if x_skew != 0 or y_skew != 0:
+            raise ValueError(
+                f"The geotransform {self.geotransform} should not be rotated"
+            )
+        if cell_width <= 0 or cell_height <= 0:
+            raise ValueError(
+                f"The cell width ({cell_width}) and cell height ({cell_height}) "
+                "of the geotransform should be greater than 0"
+            )
+        # Interpolating the direction vectors keeps directions on either side of
+        # North from averaging to South
+        radians = np.radians(self.U_dir)
+        self._east = np.sin(radians)
+        self._north = np.cos(radians)
+
+    def covers(self, screen_size: Tuple[int, int]) -> bool:
+        """
+        Check if the grid covers a terrain.
+
+        Arguments:
+            screen_size: The (height, width) of the terrain in pixels
+
+        Returns:
+            Whether the whole terrain is inside the grid
+        """
+        left, cell_width, _, top, _, cell_height = self.geotransform
+        height, width = self.U.shape
+        return (
+            left <= 0
+            and top <= 0
+            and left + width * cell_width >= screen_size[1]
+            and top + height * cell_height >= screen_size[0]
+        )
+
+    def sample(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bilinearly interpolate the wind at the centers of terrain pixels. Pixels
+        within half a cell of the edge of the grid use the nearest edge values.
+
+        Arguments:
+            x: The x (column) coordinates of the terrain pixels
+            y: The y (row) coordinates of the terrain pixels
+
+        Returns:
+            The wind speed and wind direction at each pixel
+        """
+        left, cell_width, _, top, _, cell_height = self.geotransform
+        height, width = self.U.shape
+        # The fractional (row, column) of each pixel center between the cell centers
+        cols = np.clip((np.asarray(x) + 0.5 - left) / cell_width - 0.5, 0, width - 1)
+        rows = np.clip((np.asarray(y) + 0.5 - top) / cell_height - 0.5, 0, height - 1)
+        col_0 = np.minimum(np.floor(cols).astype(np.intp), max(width - 2, 0))
+        row_0 = np.minimum(np.floor(rows).astype(np.intp), max(height - 2, 0))
+        col_1 = np.minimum(col_0 + 1, width - 1)
+        row_1 = np.minimum(row_0 + 1, height - 1)
+        col_weight = cols - col_0
+        row_weight = rows - row_0
+
+        def interpolate(grid: np.ndarray) -> np.ndarray:
+            top_values = grid[row_0, col_0] + col_weight * (
+                grid[row_0, col_1] - grid[row_0, col_0]
+            )
+            bottom_values = grid[row_1, col_0] + col_weight * (
+                grid[row_1, col_1] - grid[row_1, col_0]
+            )
+            return top_values + row_weight * (bottom_values - top_values)
+
+        U = interpolate(self.U)
+        U_dir = np.mod(
+            np.degrees(np.arctan2(interpolate(self._east), interpolate(self._north))),
+            360,
+        )
+        return U, U_dir
+
+
 @dataclass
 class Environment:
     """
@@ -57,6 +371,13 @@ class Environment:
     The wind speed and direction can be a constant value, nested sequences,
     or numpy arrays. The FireManager will convert the constant values and
     nested sequences to numpy arrays internally.
+    The fuel moisture can be a constant value, a per-pixel (H, W) array, or a
+    time-indexed (T, H, W) stack of arrays. Each slice of a stack is used for
+    `M_f_interval` minutes of simulation time, and the last slice is held once the
+    simulation runs past the end of the stack.
+    A WindSchedule or a WindStream can be given to make the wind change over the
+    simulation, or a CoarseWindGrid can be given to interpolate the wind from a
+    coarser grid. In that case, `U` and `U_dir` are ignored.
 
     Parameters:
         M_f: Fuel moisture (amount of water in fuel/vegetation). 1-3% for SoCal, usually
@@ -64,13 +385,29 @@ class Environment:
         U: Wind speed at midflame height (ft/min).
         U_dir: Wind direction at midflame height (degrees). 0 is North, 90 is East, 180
                is South, 270 is West.
+        M_f_interval: The amount of time in minutes that each slice of a time-indexed
+                      fuel moisture stack covers. Only used when M_f has shape
+                      (T, H, W).
+        wind_schedule: The time-varying wind field to use instead of `U` and `U_dir`.
+        wind_stream: The time-varying wind field that is generated frame by frame to
+                     use instead of `U` and `U_dir`.
+        wind_grid: The coarse wind field to interpolate instead of using `U` and
+                   `U_dir`.
     """
 
     # Fuel Moisture (amount of water in fuel/vegetation)
     # 1-3% for SoCal, usually never more than 8% for SoCal
-    M_f: float
+    M_f: Union[float, np.ndarray]
     # Wind speed at midflame height (ft/min)
     U: Union[float, Sequence[Sequence[float]], np.ndarray]
     # Wind direction at midflame height (degrees)
     # 0 is North, 90 is East, 180 is South, 270 is West
     U_dir: Union[float, Sequence[Sequence[float]], np.ndarray]
+    # Minutes of simulation time covered by each slice of a (T, H, W) moisture stack
+    M_f_interval: float = 60.0
+    # Time-varying wind field that replaces U and U_dir when given
+    wind_schedule: Optional[WindSchedule] = None
+    # Time-varying wind field that is read frame by frame and replaces U and U_dir
+    wind_stream: Optional[WindStream] = None
+    # Coarse wind field that is interpolated where needed and replaces U and U_dir
+    wind_grid: Optional[CoarseWindGrid] = None
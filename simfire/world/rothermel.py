@@ -1,6 +1,33 @@
+from typing import Optional, Tuple
+
 import numpy as np
 
 
+def compute_moisture_coefficients(
+    M_f: np.ndarray, M_x: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the moisture-dependent terms of the Rothermel rate of spread. These only
+    change when the fuel moisture changes, so they can be computed once for a moisture
+    grid and re-used for every update until the moisture changes.
+
+    Arguments:
+        M_f: The envrionment fuel moisture
+        M_x: The dead fuel moisture of extinction of the fuel
+
+    Returns:
+        The moisture damping coefficient (eta_M) and the heat of preignition (Q_ig) in
+        BTU/lb
+    """
+    # Moisture Damping Coefficient
+    r_M = np.minimum(M_f / M_x, np.ones_like(M_f))
+    eta_M = 1 - 2.59 * r_M + 5.11 * r_M**2 - 3.52 * r_M**3
+    # Heat of Preignition (BTU/lb)
+    Q_ig = 250 + 1116 * M_f
+
+    return eta_M, Q_ig
+
+
 def compute_rate_of_spread(
     loc_x: np.ndarray,
     loc_y: np.ndarray,
@@ -19,6 +46,8 @@ def compute_rate_of_spread(
     U_dir: np.ndarray,
     slope_mag: np.ndarray,
     slope_dir: np.ndarray,
+    eta_M: Optional[np.ndarray] = None,
+    Q_ig: Optional[np.ndarray] = None,
 ) -> np.ndarray:
     """
     Compute the basic Rothermel rate of spread. All measurements are assumed to be in
@@ -43,6 +72,9 @@ def compute_rate_of_spread(
         U: The envrionment wind speed
         U_dir: The envrionment wind direction (degrees clockwise from North)
         slope_dir: The angle of the steepest ascent at the location
+        eta_M: The pre-computed moisture damping coefficient at the new location. If
+               this or `Q_ig` is not provided, both are computed from `M_f` and `M_x`
+        Q_ig: The pre-computed heat of preignition at the new location
 
     Returns:
         R: The computed rate of spread in ft/min
@@ -69,12 +101,14 @@ def compute_rate_of_spread(
     U_dir = U_dir[w_0_idxs_non_zero]
     slope_mag = slope_mag[w_0_idxs_non_zero]
     slope_dir = slope_dir[w_0_idxs_non_zero]
+    if eta_M is None or Q_ig is None:
+        eta_M, Q_ig = compute_moisture_coefficients(M_f, M_x)
+    else:
+        eta_M = eta_M[w_0_idxs_non_zero]
+        Q_ig = Q_ig[w_0_idxs_non_zero]
 
     # Mineral Damping Coefficient
     eta_S = np.minimum(0.174 * S_e**-0.19, np.ones_like(S_e))
-    # Moisture Damping Coefficient
-    r_M = np.minimum(M_f / M_x, np.ones_like(M_f))
-    eta_M = 1 - 2.59 * r_M + 5.11 * r_M**2 - 3.52 * r_M**3
     # Net Fuel Load (lb/ft^2)
     w_n = w_0 * (1 - S_T)
     # Oven-dry Bulk Density (lb/ft^3)
@@ -115,17 +149,19 @@ def compute_rate_of_spread(
     # but we can approximate this by projecting the slope along the direction
     # of travel
     slope_along_angle_of_travel = -slope_mag * np.cos(slope_dir + angle_of_travel)
-    sign = -1 + 2 * (slope_along_angle_of_travel > 0)
+    # Cast the boolean mask to the input precision so the integer sign does not
+    # up-cast float32 inputs to float64
+    positive_slope = slope_along_angle_of_travel > 0
+    sign = -1 + 2 * positive_slope.astype(slope_along_angle_of_travel.dtype)
     phi_s = 5.275 * B**-0.3 * sign * slope_along_angle_of_travel**2
     # Effective Heating Number
     epsilon = np.exp(-138 / sigma)
-    # Heat of Preignition (BTU/lb)
-    Q_ig = 250 + 1116 * M_f
 
     # Rate of Spread (ft/min)
-    # Default everything to 0. This will set all w0=0 values to 0
-    R = np.zeros(orig_shape)
     R_w_0_non_zero = ((I_R * xi) * (1 + phi_w + phi_s)) / (p_b * epsilon * Q_ig)
+    # Default everything to 0. This will set all w0=0 values to 0
+    # Match the precision of the inputs so float32 runs stay float32 end-to-end
+    R = np.zeros(orig_shape, dtype=R_w_0_non_zero.dtype)
     # Set the non-zero w0 values to the calculated rate of spread
     R[w_0_idxs_non_zero] = R_w_0_non_zero
 
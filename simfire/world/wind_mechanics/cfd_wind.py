@@ -1,9 +1,13 @@
-import math
+from typing import Optional
 
 import numpy as np
 import pygame
+from scipy import sparse
+from scipy.sparse.linalg import factorized
 
-terrain_features: np.ndarray
+PRESSURE_SOLVERS = ("gauss-seidel", "direct")
+# The most Gauss-Seidel iterations to run when solving to a tolerance
+MAX_TOLERANCE_ITERATIONS = 10_000
 
 
 class Fluid:
@@ -16,7 +20,14 @@ class Fluid:
         diffusion: float,
         viscosity: float,
         terrain: np.ndarray,
+        pressure_solver: str = "gauss-seidel",
+        tolerance: Optional[float] = None,
     ) -> None:
+        if pressure_solver not in PRESSURE_SOLVERS:
+            raise ValueError(
+                f"The pressure solver ({pressure_solver}) must be one of "
+                f"{PRESSURE_SOLVERS}"
+            )
         self.N: tuple[int, int] = n  # Width x Height of the Screen
         self.itr = iterations
 
@@ -36,8 +47,16 @@ class Fluid:
         self.scale = scale
 
         self.terrain = terrain
-        global terrain_features
-        terrain_features = self.terrain
+        # Cells where the terrain mask is 1 are solid obstacles for the fluid
+        self.obstacles = obstacle_mask(terrain, self.N)
+
+        # The Gauss-Seidel pressure solve runs `iterations` sweeps, or until the
+        # largest update is below `tolerance`. The direct solver factorizes the
+        # pressure system once, since the obstacles do not change between steps.
+        self.tolerance = tolerance
+        self.pressure_solver: Optional[DirectPressureSolver] = None
+        if pressure_solver == "direct":
+            self.pressure_solver = DirectPressureSolver(self.obstacles)
 
     def addDensity(self, x: int, y: int, amount: float):
         self.density[x][y] += amount
@@ -47,17 +66,22 @@ class Fluid:
         self.Vy[x][y] += amountY
 
     def step(self):
-        diffuse(1, self.Vx0, self.Vx, self.visc, self.dt, self.itr, self.N)
-        diffuse(2, self.Vy0, self.Vy, self.visc, self.dt, self.itr, self.N)
+        obstacles = self.obstacles
+        diffuse(1, self.Vx0, self.Vx, self.visc, self.dt, self.itr, obstacles)
+        diffuse(2, self.Vy0, self.Vy, self.visc, self.dt, self.itr, obstacles)
+
+        project(self.Vx0, self.Vy0, self.Vx, self.Vy, *self._project_args())
 
-        project(self.Vx0, self.Vy0, self.Vx, self.Vy, self.itr, self.N)
+        advect(1, self.Vx, self.Vx0, self.Vx0, self.Vy0, self.dt, obstacles)
+        advect(2, self.Vy, self.Vy0, self.Vx0, self.Vy0, self.dt, obstacles)
 
-        advect(1, self.Vx, self.Vx0, self.Vx0, self.Vy0, self.dt, self.N)
-        advect(2, self.Vy, self.Vy0, self.Vx0, self.Vy0, self.dt, self.N)
+        project(self.Vx, self.Vy, self.Vx0, self.Vy0, *self._project_args())
+        diffuse(0, self.s, self.density, self.diff, self.dt, self.itr, obstacles)
+        advect(0, self.density, self.s, self.Vx, self.Vy, self.dt, obstacles)
 
-        project(self.Vx, self.Vy, self.Vx0, self.Vy0, self.itr, self.N)
-        diffuse(0, self.s, self.density, self.diff, self.dt, self.itr, self.N)
-        advect(0, self.density, self.s, self.Vx, self.Vy, self.dt, self.N)
+    def _project_args(self):
+        itr = self.itr if self.tolerance is None else MAX_TOLERANCE_ITERATIONS
+        return itr, self.obstacles, self.pressure_solver, self.tolerance
 
     def renderD(self, surface):
         for i in range(0, self.N[1]):
@@ -97,72 +121,67 @@ class Fluid:
 
 # SUPPORT FUNCTIONS
 
+# All of the support functions work on whole arrays at once with NumPy slicing. The
+# interior cells of a grid are `x[1:-1, 1:-1]`, and the outer ring of cells is the
+# boundary that `set_bnd` mirrors.
+
+
+def obstacle_mask(terrain: np.ndarray, shape: tuple[int, int]) -> np.ndarray:
+    """
+    Convert a terrain mask into a boolean mask of the obstacle cells.
+
+    Arguments:
+        terrain: The terrain mask, which is 1 where the terrain blocks the fluid. A
+                 trailing dimension of size 1 (like the topography layer data) is
+                 squeezed.
+        shape: The shape of the fluid grid
+
+    Returns:
+        A boolean array with the shape of the fluid grid that is True at obstacles
+    """
+    terrain = np.asarray(terrain)
+    if terrain.ndim == 3 and terrain.shape[-1] == 1:
+        terrain = terrain[..., 0]
+    if terrain.shape != tuple(shape):
+        raise ValueError(
+            f"The terrain mask shape {terrain.shape} does not match the fluid grid "
+            f"shape {tuple(shape)}"
+        )
+    return terrain == 1.0
+
+
 # mirrors vector values on boundary edges of cells, allows for fluid to cross over
 # cells and maintain their vector magnitude
 
 
-def set_bnd(b: int, x: np.ndarray, N: tuple[int, int]):
+def set_bnd(b: int, x: np.ndarray, obstacles: np.ndarray):
     # Y Boundaries
-    for i in range(1, N[0] - 1):
-        x[i][0] = -x[i][1] if b == 2 else x[i][1]
-        x[i][N[0] - 1] = -x[i][N[0] - 2] if b == 2 else x[i][N[0] - 2]
+    x[1:-1, 0] = -x[1:-1, 1] if b == 2 else x[1:-1, 1]
+    x[1:-1, -1] = -x[1:-1, -2] if b == 2 else x[1:-1, -2]
 
     # X Boundaries
-    for j in range(1, N[1] - 1):
-        x[0][j] = -x[1][j] if b == 1 else x[1][j]
-        x[N[1] - 1][j] = -x[N[1] - 2][j] if b == 1 else x[N[1] - 2][j]
+    x[0, 1:-1] = -x[1, 1:-1] if b == 1 else x[1, 1:-1]
+    x[-1, 1:-1] = -x[-2, 1:-1] if b == 1 else x[-2, 1:-1]
 
     # Handle corners
-    x[0][0] = 0.5 * (x[1][0] + x[0][1])
-    x[0][N[0] - 1] = 0.5 * (x[1][N[0] - 1] + x[0][N[0] - 2])
-    x[N[1] - 1][0] = 0.5 * (x[N[1] - 2][0] + x[N[1] - 1][1])
-    x[N[1] - 1][N[1] - 1] = 0.5 * (x[N[1] - 2][N[1] - 1] + x[N[1] - 1][N[1] - 2])
+    x[0, 0] = 0.5 * (x[1, 0] + x[0, 1])
+    x[0, -1] = 0.5 * (x[1, -1] + x[0, -2])
+    x[-1, 0] = 0.5 * (x[-2, 0] + x[-1, 1])
+    x[-1, -1] = 0.5 * (x[-2, -1] + x[-1, -2])
 
     # Handle Terrain Collisions
-    global terrain_features
-
-    # Handle Horizontal Interaction
-    if b == 2:
-        for row in range(2, N[0] - 2):
-            for col in range(2, N[1] - 2):
-                # Left to right interaction
-                if terrain_features[row][col] == 1.0:
-                    x[row][col] = 0.0
-                    if terrain_features[row][col - 1] == 0.0:
-                        x[row][col - 1] = -1 * x[row][col - 1]
-                    if terrain_features[row][col + 1] == 0:
-                        x[row][col + 1] = -1 * x[row][col + 1]
-    if b == 1:
-        for row in range(2, N[0] - 2):
-            for col in range(2, N[1] - 2):
-                # Left to right interaction
-                if terrain_features[row][col] == 1.0:
-                    x[row][col] = 0.0
-                    if terrain_features[row - 1][col] == 0.0:
-                        x[row - 1][col] = -1 * x[row - 1][col]
-                    if terrain_features[row + 1][col] == 0.0:
-                        x[row + 1][col] = -1 * x[row + 1][col]
-
-    # Sweep Right X
-    # for col in range(2, N - 2):
-    #     for i in range(2, N - 2):
-    #       if terrain_features[i][col] == 1.0:
-    #           x[i][col] = -x[i][col - 1] if b == 2 else x[i][col - 1];
-    # ## Sweep Left X
-    # for col in reversed(range(2, N - 2)):
-    #     for i in range(2, N - 2):
-    #       if terrain_features[i][col] == 1.0:
-    #         x[i][col] =  -x[i][col+1] if b == 2 else x[i][col+1]
-    # ## Sweep Down
-    # for row in range(2, N - 2):
-    #     for j in range(2, N - 2):
-    #         if terrain_features[row][j] == 1.0:
-    #             x[row][j] = -x[row-1][j] if b == 1 else x[row-1][j];
-    # ## Sweep Up
-    # for row in reversed(range(2, N - 2)):
-    #     for j in range(2, N - 2):
-    #         if terrain_features[row][j] == 1.0:
-    #             x[row][j] = -x[row+1][j] if b == 1 else x[row+1][j];
+    if b not in (1, 2):
+        return
+    # Only obstacles at least two cells away from the edges are handled
+    solid = np.zeros_like(obstacles)
+    solid[2:-2, 2:-2] = obstacles[2:-2, 2:-2]
+    # Open cells next to an obstacle have their velocity reflected once for every
+    # neighboring obstacle, horizontally for the y-velocity (b == 2) and vertically for
+    # the x-velocity (b == 1)
+    axis = 1 if b == 2 else 0
+    flips = np.roll(solid, 1, axis=axis) ^ np.roll(solid, -1, axis=axis)
+    np.negative(x, out=x, where=flips & ~obstacles)
+    x[solid] = 0.0
 
 
 def lin_solve(
@@ -172,21 +191,29 @@ def lin_solve(
     a: float,
     c: float,
     itr: int,
-    N: tuple[int, int],
+    obstacles: np.ndarray,
+    tol: Optional[float] = None,
 ):
+    # Red-black Gauss-Seidel: every cell of one color only depends on cells of the
+    # other color, so each half-sweep can be done with a single vectorized update.
+    # If a tolerance is given, stop early once the largest update is below it.
     cRecip = 1.0 / c
+    rows, cols = np.indices((x.shape[0] - 2, x.shape[1] - 2))
+    red = (rows + cols) % 2 == 0
+    colors = (red & ~obstacles[1:-1, 1:-1], ~red & ~obstacles[1:-1, 1:-1])
     for t in range(0, itr):
-        for j in range(1, N[0] - 1):
-            for i in range(1, N[1] - 1):
-                calc = (
-                    x0[i][j] + a * (x[i + 1][j] + x[i - 1][j] + x[i][j + 1] + x[i][j - 1])
-                ) * cRecip
-                global terrain_features
-                if terrain_features[i][j] != 1.0:
-                    x[i][j] = calc
-                else:
-                    x[i][j] = 0.0
-        set_bnd(b, x, N)
+        x[1:-1, 1:-1][obstacles[1:-1, 1:-1]] = 0.0
+        if tol is not None:
+            previous = x.copy()
+        for color in colors:
+            calc = (
+                x0[1:-1, 1:-1]
+                + a * (x[2:, 1:-1] + x[:-2, 1:-1] + x[1:-1, 2:] + x[1:-1, :-2])
+            ) * cRecip
+            np.copyto(x[1:-1, 1:-1], calc, where=color)
+        set_bnd(b, x, obstacles)
+        if tol is not None and np.abs(x - previous).max() < tol:
+            break
 
 
 # Precalculates a value and passes everything to lin_solve
@@ -199,10 +226,10 @@ def diffuse(
     diff: float,
     dt: float,
     itr: int,
-    N: tuple[int, int],
+    obstacles: np.ndarray,
 ):
-    a = dt * diff * (N[0] - 2) * (N[1] - 2)
-    lin_solve(b, x, x0, a, 1 + 6 * a, itr, N)
+    a = dt * diff * (x.shape[0] - 2) * (x.shape[1] - 2)
+    lin_solve(b, x, x0, a, 1 + 6 * a, itr, obstacles)
 
 
 # Incompressible object, clean up stage for each cell
@@ -214,32 +241,89 @@ def project(
     p: np.ndarray,
     div: np.ndarray,
     itr: int,
-    N: tuple[int, int],
+    obstacles: np.ndarray,
+    solver: Optional["DirectPressureSolver"] = None,
+    tol: Optional[float] = None,
 ):
-    for j in range(1, N[0] - 1):
-        for i in range(1, N[1] - 1):
-            div[i][j] = (
-                -0.5
-                * (
-                    velocX[i + 1][j]
-                    - velocX[i - 1][j]
-                    + velocY[i][j + 1]
-                    - velocY[i][j - 1]
-                )
-            ) / N[0]
-            p[i][j] = 0
-
-    set_bnd(0, div, N)
-    set_bnd(0, p, N)
-    lin_solve(0, p, div, 1, 6, itr, N)
-
-    for j in range(1, N[0] - 1):
-        for i in range(1, N[1] - 1):
-            velocX[i][j] -= 0.5 * (p[i + 1][j] - p[i - 1][j]) * N[1]
-            velocY[i][j] -= 0.5 * (p[i][j + 1] - p[i][j - 1]) * N[0]
-
-    set_bnd(1, velocX, N)
-    set_bnd(2, velocY, N)
+    n0, n1 = velocX.shape
+    div[1:-1, 1:-1] = -0.5 * (
+        (velocX[2:, 1:-1] - velocX[:-2, 1:-1]) / n0
+        + (velocY[1:-1, 2:] - velocY[1:-1, :-2]) / n1
+    )
+    p[1:-1, 1:-1] = 0
+
+    set_bnd(0, div, obstacles)
+    set_bnd(0, p, obstacles)
+    if solver is None:
+        lin_solve(0, p, div, 1, 6, itr, obstacles, tol)
+    else:
+        solver.solve(p, div)
+
+    velocX[1:-1, 1:-1] -= 0.5 * (p[2:, 1:-1] - p[:-2, 1:-1]) * n0
+    velocY[1:-1, 1:-1] -= 0.5 * (p[1:-1, 2:] - p[1:-1, :-2]) * n1
+
+    set_bnd(1, velocX, obstacles)
+    set_bnd(2, velocY, obstacles)
+
+
+class DirectPressureSolver:
+    """
+    Solves the pressure system of `project` exactly with a sparse LU factorization.
+
+    The factorization only depends on the grid shape and the obstacles, so it is
+    computed once and reused for every step. The solution is the one that the
+    Gauss-Seidel iterations of `lin_solve(0, p, div, 1, 6, ...)` converge to.
+    """
+
+    def __init__(self, obstacles: np.ndarray) -> None:
+        """
+        Arguments:
+            obstacles: The boolean obstacle mask of the fluid grid
+        """
+        self.obstacles = obstacles
+        # Only the interior cells that are not obstacles are unknowns, since the
+        # pressure is 0 at obstacles and the boundary copies its interior neighbor
+        self.open = ~obstacles[1:-1, 1:-1]
+        n = np.count_nonzero(self.open)
+        index = np.full(self.open.shape, -1)
+        index[self.open] = np.arange(n)
+
+        # Neighbors on the boundary mirror the cell itself, so they reduce the
+        # diagonal instead of adding an off-diagonal entry
+        padded = np.pad(index, 1, constant_values=-2)
+        diagonal = np.full(self.open.shape, 6.0)
+        rows = [np.arange(n)]
+        cols = [np.arange(n)]
+        for neighbor in (
+            padded[2:, 1:-1],
+            padded[:-2, 1:-1],
+            padded[1:-1, 2:],
+            padded[1:-1, :-2],
+        ):
+            coupled = self.open & (neighbor >= 0)
+            rows.append(index[coupled])
+            cols.append(neighbor[coupled])
+            diagonal -= neighbor == -2
+        rows_arr = np.concatenate(rows)
+        values = np.full(rows_arr.size, -1.0)
+        values[:n] = diagonal[self.open]
+        matrix = sparse.csc_matrix(
+            (values, (rows_arr, np.concatenate(cols))), shape=(n, n)
+        )
+        self._solve = factorized(matrix)
+
+    def solve(self, p: np.ndarray, div: np.ndarray) -> None:
+        """
+        Solve for the pressure in place.
+
+        Arguments:
+            p: The pressure array to fill
+            div: The divergence of the velocity field
+        """
+        interior = np.zeros(self.open.shape)
+        interior[self.open] = self._solve(div[1:-1, 1:-1][self.open])
+        p[1:-1, 1:-1] = interior
+        set_bnd(0, p, self.obstacles)
 
 
 # Responsible for actually moving things around, looks at each cell and grabs its velocity
@@ -254,45 +338,27 @@ def advect(
     velocX: np.ndarray,
     velocY: np.ndarray,
     dt: float,
-    N: tuple[int, int],
+    obstacles: np.ndarray,
 ):
-    dtx = dt * (N[1] - 2)
-    dty = dt * (N[0] - 2)
-
-    Nfloat_i = N[1] - 2
-    Nfloat_j = N[0] - 2
-    for j, jfloat in zip(range(1, N[0] - 1), range(1, N[0] - 1)):
-        for i, ifloat in zip(range(1, N[1] - 1), range(1, N[1] - 1)):
-            tmp1 = dtx * velocX[i][j]
-            tmp2 = dty * velocY[i][j]
-            x = ifloat - tmp1
-            y = jfloat - tmp2
-
-            if x < 0.5:
-                x = 0.5
-            if x > Nfloat_i + 0.5:
-                x = Nfloat_i + 0.5
-            i0 = math.floor(x)
-            i1 = i0 + 1.0
-
-            if y < 0.5:
-                y = 0.5
-            if y > Nfloat_j + 0.5:
-                y = Nfloat_j + 0.5
-            j0 = math.floor(y)
-            j1 = j0 + 1.0
-
-            s1 = x - i0
-            s0 = 1.0 - s1
-            t1 = y - j0
-            t0 = 1.0 - t1
-
-            i0i = int(i0)
-            i1i = int(i1)
-            j0i = int(j0)
-            j1i = int(j1)
-
-            d[i][j] = s0 * (t0 * d0[i0i][j0i] + t1 * d0[i0i][j1i])
-            +s1 * (t0 * d0[i1i][j0i] + t1 * d0[i1i][j1i])
-
-    set_bnd(b, d, N)
+    n0, n1 = d.shape
+    dtx = dt * (n0 - 2)
+    dty = dt * (n1 - 2)
+
+    i, j = np.meshgrid(np.arange(1, n0 - 1), np.arange(1, n1 - 1), indexing="ij")
+    x = np.clip(i - dtx * velocX[1:-1, 1:-1], 0.5, n0 - 2 + 0.5)
+    y = np.clip(j - dty * velocY[1:-1, 1:-1], 0.5, n1 - 2 + 0.5)
+    i0 = np.floor(x).astype(int)
+    j0 = np.floor(y).astype(int)
+    i1 = i0 + 1
+    j1 = j0 + 1
+
+    s1 = x - i0
+    s0 = 1.0 - s1
+    t1 = y - j0
+    t0 = 1.0 - t1
+
+    d[1:-1, 1:-1] = s0 * (t0 * d0[i0, j0] + t1 * d0[i0, j1]) + s1 * (
+        t0 * d0[i1, j0] + t1 * d0[i1, j1]
+    )
+
+    set_bnd(b, d, obstacles)
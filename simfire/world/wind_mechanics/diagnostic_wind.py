@@ -0,0 +1,118 @@
+"""
+Diagnostic Wind
+===============
+A fast, terrain-aware alternative to the CFD wind. A uniform domain-average wind is
+adjusted at every pixel by the shape of the terrain, in the spirit of mass-consistent
+models like WindNinja, but with local vectorized adjustments instead of a flow solve:
+
+- The air between the terrain and a flat lid above the highest terrain is conserved,
+  so the wind speeds up where the layer is thinner (over high terrain)
+- Ridges that are higher than the surrounding terrain are exposed and valleys are
+  sheltered
+- Wind blowing up a slope speeds up and wind blowing down a slope (the lee side)
+  slows down
+- Wind in sheltered, steep terrain is channelled along the contours, since the
+  terrain blocks the flow into the slope
+
+The result is scaled so that the average speed over the domain is the input speed.
+"""
+
+from typing import Tuple
+
+import numpy as np
+from scipy.ndimage import gaussian_filter
+
+
+def diagnostic_wind(
+    elevation: np.ndarray,
+    pixel_scale: float,
+    speed: float,
+    direction: float,
+    smoothing_length: float = 1500.0,
+    lid_height: float = 3000.0,
+    exposure_factor: float = 0.3,
+    slope_factor: float = 0.3,
+    channelling: float = 0.5,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Adjust a domain-average wind to the terrain.
+
+    Arguments:
+        elevation: The (h, w) or (h, w, 1) terrain elevations (ft), like
+                   `TopographyLayer.data`
+        pixel_scale: The size of each pixel (ft)
+        speed: The domain-average wind speed
+        direction: The direction the wind blows toward, in degrees clockwise from
+                   North
+        smoothing_length: The length (ft) over which the terrain is smoothed to find
+                          the ridges and valleys
+        lid_height: The height (ft) of the lid of the wind layer above the highest
+                    terrain. Lower lids speed up the wind more over high terrain.
+        exposure_factor: The fraction that the wind speeds up on the most exposed
+                         ridges and slows down in the most sheltered valleys
+        slope_factor: The fraction that the wind speeds up on steep slopes into the
+                      wind and slows down on steep slopes away from the wind
+        channelling: The fraction of the wind into the slope that is removed on steep,
+                     sheltered terrain
+
+    Returns:
+        The wind speeds (in the units of `speed`) and the wind directions (degrees
+        clockwise from North)
+    """
+    for name, value in (
+        ("exposure factor", exposure_factor),
+        ("slope factor", slope_factor),
+        ("channelling", channelling),
+    ):
+        if not 0 <= value < 1:
+            raise ValueError(f"The {name} ({value}) should be in [0, 1)")
+    if smoothing_length <= 0 or lid_height <= 0:
+        raise ValueError(
+            f"The smoothing length ({smoothing_length}) and lid height ({lid_height}) "
+            "should be greater than 0"
+        )
+    z = np.asarray(elevation, dtype=np.float64)
+    if z.ndim == 3 and z.shape[-1] == 1:
+        z = z[..., 0]
+    if z.ndim != 2:
+        raise ValueError(f"The elevation shape {z.shape} should be (h, w) or (h, w, 1)")
+
+    # The unit vector of the wind, and the terrain gradient, in (east, north)
+    # components. The rows of the grid increase to the south.
+    heading = np.radians(direction)
+    wind_east, wind_north = np.sin(heading), np.cos(heading)
+    dz_south, dz_east = np.gradient(z, pixel_scale)
+    dz_north = -dz_south
+    slope = np.hypot(dz_east, dz_north)
+
+    # Conserve the air in the column between the terrain and the lid
+    depth = z.max() + lid_height - z
+    factor = depth.mean() / depth
+
+    # Ridges above the smoothed terrain are exposed and valleys below it are sheltered
+    relative = z - gaussian_filter(z, smoothing_length / pixel_scale, mode="nearest")
+    relative_scale = relative.std()
+    if relative_scale > 0:
+        exposure = np.tanh(relative / relative_scale)
+    else:
+        exposure = np.zeros_like(z)
+    factor *= 1 + exposure_factor * exposure
+
+    # Speed up blowing up the slope and slow down blowing down the slope
+    upslope = wind_east * dz_east + wind_north * dz_north
+    factor *= 1 + slope_factor * np.tanh(upslope)
+
+    # Remove part of the wind into the slope so the wind follows the contours
+    with np.errstate(invalid="ignore", divide="ignore"):
+        normal_east = np.where(slope > 0, dz_east / slope, 0.0)
+        normal_north = np.where(slope > 0, dz_north / slope, 0.0)
+    cross = wind_east * normal_east + wind_north * normal_north
+    sheltered = (1 - exposure) / 2
+    blocked = channelling * np.tanh(slope) * sheltered * cross
+    east = wind_east - blocked * normal_east
+    north = wind_north - blocked * normal_north
+    factor *= np.hypot(east, north)
+
+    speeds = speed * factor / factor.mean()
+    directions = np.mod(np.degrees(np.arctan2(east, north)), 360)
+    return speeds, directions
@@ -1,7 +1,8 @@
-from typing import Optional
+from typing import Iterator, Optional
 
 import numpy as np
-from noise import snoise2
+
+from ...utils import simplex
 
 
 class WindNoise:
@@ -67,32 +68,82 @@ class WindNoise:
         self.range_max = range_max
 
     def generate_map_array(self, screen_size: tuple[int, int]) -> np.ndarray:
-        map = []
-        map = [
-            [self._generate_noise_value(x, y) for x in range(screen_size[1])]
-            for y in range(screen_size[0])
-        ]
-        return np.array(map, dtype=np.float32)
-
-    def _denormalize_noise_value(self, noise_value) -> float:
-        denormalized_value = (
-            ((noise_value + 1) * (self.range_max - self.range_min)) / 2
-        ) + self.range_min
-        return denormalized_value
+        return self.generate_window(0, 0, screen_size[0], screen_size[1])
 
-    def _generate_noise_value(self, x: int, y: int) -> float:
-        scaledX = x / self.scale
-        scaledY = y / self.scale
+    def generate_window(self, top: int, left: int, height: int, width: int) -> np.ndarray:
+        """
+        Generate the noise values for a window of the map. The values are identical to
+        the same window of `generate_map_array` for a larger map, but only the window
+        is computed.
+
+        Arguments:
+            top: The first row of the window
+            left: The first column of the window
+            height: The number of rows in the window
+            width: The number of columns in the window
 
-        value = snoise2(
+        Returns:
+            The (height, width) array of denormalized noise values
+        """
+        # The coordinates are scaled in double precision before the noise is computed
+        # in single precision, like `noise.snoise2`
+        scaledX = np.arange(left, left + width) / self.scale
+        scaledY = np.arange(top, top + height)[:, None] / self.scale
+        value = simplex.snoise2(
             scaledX,
             scaledY,
             octaves=self.octaves,
             persistence=self.persistence,
             lacunarity=self.lacunarity,
             base=self.seed,
-        )
+        ).astype(np.float64)
+        return self._denormalize_noise_value(value).astype(np.float32)
 
-        denormalized_value = self._denormalize_noise_value(value)
+    def generate_frames(
+        self,
+        screen_size: tuple[int, int],
+        time_scale: float,
+        buffer_size: int = 4,
+    ) -> Iterator[np.ndarray]:
+        """
+        Lazily generate maps that change smoothly over time, using 3D noise with time
+        as the third axis. Frames are computed `buffer_size` at a time, so only a small
+        buffer of upcoming frames is held in memory and the generator never ends.
 
+        Arguments:
+            screen_size: The (height, width) of each map
+            time_scale: The number of frames for the noise to change as much as it
+                        does over `scale` pixels. Higher values change more slowly.
+            buffer_size: The number of frames to compute at once
+
+        Yields:
+            The (height, width) array of denormalized noise values for frames 0, 1,
+            2, ...
+        """
+        if time_scale <= 0:
+            raise ValueError(f"The time scale ({time_scale}) should be greater than 0")
+        if buffer_size <= 0:
+            raise ValueError(f"The buffer size ({buffer_size}) should be greater than 0")
+        # 3D noise has no base, so the seed offsets the spatial coordinates instead
+        scaledX = np.arange(screen_size[1]) / self.scale + self.seed
+        scaledY = np.arange(screen_size[0])[:, None] / self.scale + self.seed
+        start = 0
+        while True:
+            times = np.arange(start, start + buffer_size)[:, None, None] / time_scale
+            frames = simplex.snoise3(
+                scaledX,
+                scaledY,
+                times,
+                octaves=self.octaves,
+                persistence=self.persistence,
+                lacunarity=self.lacunarity,
+            ).astype(np.float64)
+            frames = self._denormalize_noise_value(frames).astype(np.float32)
+            yield from frames
+            start += buffer_size
+
+    def _denormalize_noise_value(self, noise_value):
+        denormalized_value = (
+            ((noise_value + 1) * (self.range_max - self.range_min)) / 2
+        ) + self.range_min
         return denormalized_value
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import pygame
@@ -95,8 +95,82 @@ class WindController:
 
         self.map_wind_direction = self.direction_layer.generate_map_array(screen_size)
 
+    def generate_wind_frames(
+        self,
+        screen_size: tuple[int, int],
+        time_scale: float,
+        buffer_size: int = 4,
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Lazily generate wind speed and direction maps that evolve smoothly over time
+        (e.g. gusts), with the noise parameters of the speed and direction generators.
+        Only `buffer_size` upcoming frames are held in memory, so the full time stack
+        is never created.
+
+        Arguments:
+            screen_size: The (height, width) of each map
+            time_scale: The number of frames for the noise to change as much as it
+                        does over `scale` pixels. Higher values change more slowly.
+            buffer_size: The number of frames to compute at once
+
+        Returns:
+            An endless iterator of (wind speed, wind direction) maps
+        """
+        speeds = self.speed_layer.generate_frames(screen_size, time_scale, buffer_size)
+        directions = self.direction_layer.generate_frames(
+            screen_size, time_scale, buffer_size
+        )
+        return zip(speeds, directions)
+
 
 # For CFD Implementations
+
+# The direction (in degrees clockwise from North) that each named inflow comes from
+WIND_DIRECTIONS = {"north": 0.0, "east": 90.0, "south": 180.0, "west": 270.0}
+
+
+def direction_degrees(direction: Union[str, float]) -> float:
+    """
+    Convert a wind direction to degrees clockwise from North.
+
+    Arguments:
+        direction: The direction in degrees, or one of 'north', 'east', 'south' or
+                   'west'
+
+    Returns:
+        The direction in degrees clockwise from North
+    """
+    if isinstance(direction, str):
+        if direction.lower() not in WIND_DIRECTIONS:
+            raise ValueError(
+                f"The wind direction ({direction}) must be an angle in degrees or one "
+                f"of {list(WIND_DIRECTIONS)}"
+            )
+        return WIND_DIRECTIONS[direction.lower()]
+    return float(direction)
+
+
+def inflow_velocity(speed: float, direction: Union[str, float]) -> Tuple[float, float]:
+    """
+    Get the velocity of a uniform inflow on the CFD grid. The first axis of the grid
+    (rows) points south and the second axis (columns) points east.
+
+    Arguments:
+        speed: The speed of the inflow
+        direction: The direction the inflow comes from, in degrees clockwise from North
+                   or as one of 'north', 'east', 'south' or 'west'
+
+    Returns:
+        The (x, y) velocity of the inflow along the first and second grid axes
+    """
+    # The wind blows toward the opposite of the direction it comes from. Round away
+    # the floating point noise so cardinal directions only have one component.
+    heading = np.radians(direction_degrees(direction) + 180.0)
+    velocity_x = -speed * round(float(np.cos(heading)), 12)
+    velocity_y = speed * round(float(np.sin(heading)), 12)
+    return velocity_x, velocity_y
+
+
 class WindControllerCFD:
     """
     This is a PRECOMPUTE wind controller.  It generates and tracks objects that dictate
@@ -113,8 +187,10 @@ class WindControllerCFD:
         viscosity: float = 0.0000001,
         terrain_features: Optional[np.ndarray] = None,
         wind_speed: float = 27.0,
-        wind_direction: str = "north",
+        wind_direction: Union[str, float] = "north",
         time_to_train: int = 1000,
+        pressure_solver: str = "gauss-seidel",
+        tolerance: Optional[float] = None,
     ) -> None:
         self.N = screen_size
         self.iterations = result_accuracy
@@ -126,21 +202,14 @@ class WindControllerCFD:
         self.wind_speed = wind_speed
         self.wind_direction = wind_direction
         self.time_to_train = time_to_train
+        self.inflow = inflow_velocity(wind_speed, wind_direction)
 
         if terrain_features is None:
             self.terrain_features = np.zeros((self.N))
         else:
-
-            def terrain_downsample(height):
-                if height > np.average(self.terrain_features):
-                    return 1
-                else:
-                    return 0
-
-            downsampled_terrain_vectorize = np.vectorize(terrain_downsample)
-            bounded_terrain = downsampled_terrain_vectorize(self.terrain_features)
-
-            self.terrain_features = np.array(bounded_terrain, dtype=np.float32)
+            # Terrain above the average height is an obstacle for the wind
+            terrain = np.asarray(self.terrain_features)
+            self.terrain_features = (terrain > np.average(terrain)).astype(np.float32)
         # TODO Load terrain setup here
 
         self.fvect = Fluid(
@@ -151,20 +220,24 @@ class WindControllerCFD:
             self.diffusion,
             self.viscosity,
             self.terrain_features,
+            pressure_solver,
+            tolerance,
         )
 
     def iterate_wind_step(self) -> None:
-        for v in range(0, self.N[0]):
-            if self.wind_direction.lower() == "north":
-                self.fvect.addVelocity(v, 1, 0, self.wind_speed)
-            elif self.wind_direction.lower() == "east":
-                self.fvect.addVelocity(self.N[0] - 1, v, -1 * self.wind_speed, 0)
-            elif self.wind_direction.lower() == "south":
-                self.fvect.addVelocity(1, v, -1 * self.wind_speed, 0)
-            elif self.wind_direction.lower() == "west":
-                self.fvect.addVelocity(1, v, self.wind_speed, 0)
-            else:
-                log.error("Bad source direction input")
+        """
+        Add the inflow velocity along the upwind edges of the grid, and step the fluid.
+        """
+        velocity_x, velocity_y = self.inflow
+        # The inflow enters through the first interior cells of the upwind edges
+        edges: List[Tuple[Union[int, slice], Union[int, slice]]] = []
+        if velocity_x != 0:
+            edges.append((1 if velocity_x > 0 else -2, slice(None)))
+        if velocity_y != 0:
+            edges.append((slice(None), 1 if velocity_y > 0 else -2))
+        for edge in edges:
+            self.fvect.Vx[edge] += velocity_x
+            self.fvect.Vy[edge] += velocity_y
 
         self.fvect.step()
         return
@@ -0,0 +1,99 @@
+"""
+Library of precomputed CFD wind fields for inflow direction sectors. Training the CFD
+wind for every scenario is expensive, so the library trains one wind field for every
+`sector_size` degrees of inflow direction, and interpolates between the two nearest
+sectors (and scales by the inflow speed) to get the wind field for any direction.
+"""
+
+from typing import Callable, Dict, Tuple, Union
+
+import numpy as np
+
+from .wind_controller import direction_degrees
+
+# Loads (or trains) the (magnitude, direction) wind field for an inflow direction
+SectorLoader = Callable[[float], Tuple[np.ndarray, np.ndarray]]
+
+# The inflow speed that sector fields are trained with. The fields are scaled to the
+# requested inflow speed, so the same sectors are used for every speed.
+REFERENCE_WIND_SPEED = 10.0
+
+
+class CFDWindLibrary:
+    """
+    Precomputed CFD wind fields for inflow directions every `sector_size` degrees.
+    Sector fields are loaded on first use, or all at once with `build`.
+    """
+
+    def __init__(self, sector_size: float, wind_speed: float, load_sector: SectorLoader):
+        """
+        Arguments:
+            sector_size: The number of degrees between sectors. Must divide 360.
+            wind_speed: The inflow speed that the sector fields are trained with
+            load_sector: A function that returns the (magnitude, direction) wind
+                         field for an inflow direction in degrees clockwise from North
+        """
+        if sector_size <= 0:
+            raise ValueError(f"The sector size ({sector_size}) must be greater than 0")
+        n_sectors = 360 / sector_size
+        if not np.isclose(n_sectors, round(n_sectors)):
+            raise ValueError(f"The sector size ({sector_size}) must divide 360 degrees")
+        self.sector_size = sector_size
+        self.wind_speed = wind_speed
+        self.load_sector = load_sector
+        self.sectors = [i * sector_size for i in range(round(n_sectors))]
+        self._fields: Dict[float, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def build(self) -> None:
+        """
+        Load the wind fields of all sectors.
+        """
+        for sector in self.sectors:
+            self._sector_velocity(sector)
+
+    def _sector_velocity(self, sector: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the (east, north) velocity components of a sector field.
+        """
+        if sector not in self._fields:
+            magnitude, direction = self.load_sector(sector)
+            radians = np.radians(direction)
+            self._fields[sector] = (
+                magnitude * np.sin(radians),
+                magnitude * np.cos(radians),
+            )
+        return self._fields[sector]
+
+    def wind(
+        self, direction: Union[str, float], speed: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the wind field for an inflow direction and speed. The velocities of the two
+        nearest sectors are interpolated linearly by angle, and scaled by the ratio of
+        the inflow speed to the trained speed.
+
+        Arguments:
+            direction: The direction the inflow comes from, in degrees clockwise from
+                       North or as one of 'north', 'east', 'south' or 'west'
+            speed: The inflow speed
+
+        Returns:
+            The wind magnitudes and the wind directions (in degrees clockwise from
+            North)
+        """
+        position = (direction_degrees(direction) % 360) / self.sector_size
+        lower = int(np.floor(position)) % len(self.sectors)
+        upper = (lower + 1) % len(self.sectors)
+        weight = position - np.floor(position)
+
+        lower_east, lower_north = self._sector_velocity(self.sectors[lower])
+        if weight == 0:
+            east, north = lower_east, lower_north
+        else:
+            upper_east, upper_north = self._sector_velocity(self.sectors[upper])
+            east = (1 - weight) * lower_east + weight * upper_east
+            north = (1 - weight) * lower_north + weight * upper_north
+
+        magnitude = np.hypot(east, north) * (speed / self.wind_speed)
+        wind_direction = np.mod(np.degrees(np.arctan2(east, north)), 360)
+        return magnitude, wind_direction